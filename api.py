@@ -5,20 +5,40 @@ Provides REST API endpoints for executing Cubit code
 """
 
 import os
+import re
 import json
 import time
+import asyncio
+from contextlib import contextmanager
 from io import StringIO
-from typing import Optional, Any, Dict, List
-from contextlib import redirect_stdout
-from pathlib import Path
+from typing import Optional, Any, Dict, List, Tuple
 from datetime import datetime
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, ConfigDict
-from interpreter import Interpreter
-from pedagogical.api import PedagogicalAPI
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from lexer import Lexer
+from parser import Parser, dump_ast
+from interpreter import (
+    Interpreter, ProfilingInterpreter, executed_steps, is_deterministic, parse_program
+)
+from pedagogical.api import PedagogicalAPI, shared_components
+from pedagogical.concept_mapper import ConceptDependencyMapper
 from games_executor import parse_game_code
-from module_metrics import metrics_tracker
+from module_metrics import metrics_tracker, bucket_upper_bound, HISTOGRAM_BUCKETS
+from execution_pool import execution_pool
+from output_capture import (
+    capture_stdout, EventStream, StreamWriter, OutputStreamClosed
+)
+from single_flight import SingleFlight
+from debug_store import debug_token_store, token_page
+from response_cache import JSONPayload, cached_json_response, response_cache_stats
+from course_store import ConceptGraphSync, course_store
+from fast_json import FastJSONResponse, iter_json_object
+from compression import CompressionMiddleware, compression_stats
+from session_store import session_store
+from progress_store import progress_store
+from metrics_exporter import CONTENT_TYPE, MetricsRegistry, process_rss_bytes
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -45,12 +65,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (outputs, debug traces, shape lists) for slow networks
+app.add_middleware(CompressionMiddleware)
+
+# Coalesces concurrent identical executions (see /execute and /games/execute)
+execution_flights = SingleFlight()
+
+# Opt-in fast response path: encode execute/debug responses directly with
+# fast_json instead of pydantic + the default JSON encoder
+FAST_JSON_RESPONSES = os.environ.get("CUBIT_FAST_JSON", "").lower() in ("1", "true", "yes")
+
+# With the fast path, outputs at least this long are streamed, not copied
+STREAM_OUTPUT_MIN_CHARS = 256 * 1024
+
+
+# Learner session ids: opaque client-chosen tokens
+SESSION_ID_PATTERN = r"^[A-Za-z0-9_.:-]{1,128}$"
+
 
 class ExecuteRequest(BaseModel):
     """Request model for code execution"""
     code: str
     teaching_enabled: Optional[bool] = True
     verbosity: Optional[str] = 'normal'
+    session_id: Optional[str] = Field(None, pattern=SESSION_ID_PATTERN)
+
+
+class StreamExecuteRequest(ExecuteRequest):
+    """Request model for streaming code execution"""
+    debug: Optional[bool] = False
+
+
+# Upper bound on programs accepted by one /execute/batch request
+MAX_BATCH_ITEMS = 10000
+
+
+class BatchItem(BaseModel):
+    """One program in a batch execution request"""
+    id: Optional[str] = None
+    code: str
+    expected_output: Optional[str] = None
+
+
+class BatchExecuteRequest(BaseModel):
+    """Request model for batch code execution"""
+    items: List[BatchItem] = Field(..., max_length=MAX_BATCH_ITEMS)
 
 
 class GameExecuteRequest(BaseModel):
@@ -76,33 +135,42 @@ class ExecuteResponse(BaseModel):
     shapes: Optional[List[Dict[str, Any]]] = None  # For game visualization
 
 
+# Static API information served by GET /
+_ROOT_PAYLOAD = JSONPayload({
+    "message": "Welcome to Cubit Programming Language API",
+    "version": "1.0.0 - Teaching Edition",
+    "features": [
+        "Code execution",
+        "Adaptive teaching system",
+        "Skill-level inference",
+        "Learning progress tracking",
+        "Concept suggestions",
+        "Games and visualizations"
+    ],
+    "endpoints": {
+        "/": "API information (this page)",
+        "/health": "Health check endpoint",
+        "/execute": "Execute Cubit code (POST)",
+        "/execute/stream": "Execute Cubit code, streaming output as Server-Sent Events (POST)",
+        "/execute/batch": "Execute many programs, streaming NDJSON results (POST)",
+        "/api/execute/debug": "Execute code with step-by-step debugging (POST)",
+        "/api/modules/status": "Get system modules status (GET)",
+        "/metrics": "Prometheus metrics (GET)",
+        "/progress": "Get learning progress (GET)",
+        "/concepts": "Get concept suggestions (GET)",
+        "/games": "Get list of available games (GET)",
+        "/challenges": "Get coding challenges (GET)",
+        "/curriculum": "Get course curriculum (GET)",
+        "/games/execute": "Execute game code with visualization (POST)"
+    },
+    "documentation": "/docs"
+})
+
+
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Welcome endpoint with API information"""
-    return {
-        "message": "Welcome to Cubit Programming Language API",
-        "version": "1.0.0 - Teaching Edition",
-        "features": [
-            "Code execution",
-            "Adaptive teaching system",
-            "Skill-level inference",
-            "Learning progress tracking",
-            "Concept suggestions",
-            "Games and visualizations"
-        ],
-        "endpoints": {
-            "/": "API information (this page)",
-            "/health": "Health check endpoint",
-            "/execute": "Execute Cubit code (POST)",
-            "/api/execute/debug": "Execute code with step-by-step debugging (POST)",
-            "/api/modules/status": "Get system modules status (GET)",
-            "/progress": "Get learning progress (GET)",
-            "/concepts": "Get concept suggestions (GET)",
-            "/games": "Get list of available games (GET)",
-            "/games/execute": "Execute game code with visualization (POST)"
-        },
-        "documentation": "/docs"
-    }
+    return cached_json_response(request, _ROOT_PAYLOAD)
 
 
 @app.get("/health")
@@ -111,153 +179,306 @@ async def health():
     return {"status": "healthy"}
 
 
+# Static part of each module entry in /api/modules/status
+_MODULE_SKELETON = (
+    {"id": "lexer", "name": "Lexer", "type": "core", "status": "active", "version": "1.0.0"},
+    {"id": "parser", "name": "Parser", "type": "core", "status": "active", "version": "1.0.0"},
+    {"id": "interpreter", "name": "Interpreter", "type": "core", "status": "active", "version": "1.0.0"},
+    {"id": "ped-api", "name": "Pedagogical API", "type": "pedagogical", "status": "active", "version": "1.0.0"},
+    {"id": "context-analyzer", "name": "Context Analyzer", "type": "pedagogical", "status": "active", "version": "1.0.0"},
+    {"id": "skill-inference", "name": "Skill Inference Engine", "type": "pedagogical", "status": "active", "version": "1.0.0"},
+    {"id": "learning-engine", "name": "Adaptive Learning Engine", "type": "pedagogical", "status": "active", "version": "1.0.0"},
+    {"id": "concept-mapper", "name": "Concept Dependency Mapper", "type": "pedagogical", "status": "active", "version": "1.0.0"},
+    {"id": "insight-delivery", "name": "Insight Delivery", "type": "pedagogical", "status": "active", "version": "1.0.0"},
+    {"id": "games-executor", "name": "Games Executor", "type": "game", "status": "active", "version": "1.0.0"},
+    {"id": "fastapi", "name": "FastAPI Server", "type": "api", "status": "active", "version": "1.0.0"}
+)
+
+# System summary counts derived from the skeleton
+_MODULE_COUNTS = {
+    "total_modules": len(_MODULE_SKELETON),
+    "active_modules": sum(1 for m in _MODULE_SKELETON if m["status"] == "active"),
+    "error_modules": sum(1 for m in _MODULE_SKELETON if m["status"] == "error")
+}
+
+
 @app.get("/api/modules/status")
 async def get_modules_status():
     """
     Get real-time status information for all Cubit system modules
     
+    Only the live metrics are computed per request; module descriptions
+    and summary counts are built once at import.
+    
     Returns:
         Status information for all modules including metrics and system summary
     """
-    # Define all system modules
+    metrics_tracker.publish()
     modules = [
-        {
-            "id": "lexer",
-            "name": "Lexer",
-            "type": "core",
-            "status": "active",
-            "version": "1.0.0",
-            "metrics": metrics_tracker.get_metrics("lexer")
-        },
-        {
-            "id": "parser",
-            "name": "Parser",
-            "type": "core",
-            "status": "active",
-            "version": "1.0.0",
-            "metrics": metrics_tracker.get_metrics("parser")
-        },
-        {
-            "id": "interpreter",
-            "name": "Interpreter",
-            "type": "core",
-            "status": "active",
-            "version": "1.0.0",
-            "metrics": metrics_tracker.get_metrics("interpreter")
-        },
-        {
-            "id": "ped-api",
-            "name": "Pedagogical API",
-            "type": "pedagogical",
-            "status": "active",
-            "version": "1.0.0",
-            "metrics": metrics_tracker.get_metrics("ped-api")
-        },
-        {
-            "id": "context-analyzer",
-            "name": "Context Analyzer",
-            "type": "pedagogical",
-            "status": "active",
-            "version": "1.0.0",
-            "metrics": metrics_tracker.get_metrics("context-analyzer")
-        },
-        {
-            "id": "skill-inference",
-            "name": "Skill Inference Engine",
-            "type": "pedagogical",
-            "status": "active",
-            "version": "1.0.0",
-            "metrics": metrics_tracker.get_metrics("skill-inference")
-        },
-        {
-            "id": "learning-engine",
-            "name": "Adaptive Learning Engine",
-            "type": "pedagogical",
-            "status": "active",
-            "version": "1.0.0",
-            "metrics": metrics_tracker.get_metrics("learning-engine")
-        },
-        {
-            "id": "concept-mapper",
-            "name": "Concept Dependency Mapper",
-            "type": "pedagogical",
-            "status": "active",
-            "version": "1.0.0",
-            "metrics": metrics_tracker.get_metrics("concept-mapper")
-        },
-        {
-            "id": "insight-delivery",
-            "name": "Insight Delivery",
-            "type": "pedagogical",
-            "status": "active",
-            "version": "1.0.0",
-            "metrics": metrics_tracker.get_metrics("insight-delivery")
-        },
-        {
-            "id": "games-executor",
-            "name": "Games Executor",
-            "type": "game",
-            "status": "active",
-            "version": "1.0.0",
-            "metrics": metrics_tracker.get_metrics("games-executor")
-        },
-        {
-            "id": "fastapi",
-            "name": "FastAPI Server",
-            "type": "api",
-            "status": "active",
-            "version": "1.0.0",
-            "metrics": metrics_tracker.get_metrics("fastapi")
-        }
+        {**module, "metrics": metrics_tracker.get_metrics(module["id"], publish=False)}
+        for module in _MODULE_SKELETON
     ]
     
-    # Calculate system summary
-    total_modules = len(modules)
-    active_modules = sum(1 for m in modules if m["status"] == "active")
-    error_modules = sum(1 for m in modules if m["status"] == "error")
-    
     return {
         "modules": modules,
         "system": {
-            "total_modules": total_modules,
-            "active_modules": active_modules,
-            "error_modules": error_modules,
-            "uptime_seconds": int(metrics_tracker.get_uptime())
-        }
+            **_MODULE_COUNTS,
+            "uptime_seconds": int(metrics_tracker.get_uptime()),
+            "workers": metrics_tracker.get_worker_count()
+        },
+        "coalescing": execution_flights.get_stats(),
+        "sessions": session_store.get_stats(),
+        "progress_store": progress_store.get_stats() if progress_store is not None else None,
+        "compression": compression_stats.get_stats(),
+        "concept_graph": _concept_graph_stats()
     }
 
 
-@app.post("/execute", response_model=ExecuteResponse)
-async def execute_code(request: ExecuteRequest):
+# Histogram buckets exported to Prometheus: one per power of two microseconds
+_EXPORTED_BUCKETS = list(range(3, HISTOGRAM_BUCKETS, 4))
+
+
+def _module_latency_histograms():
+    """Cumulative latency buckets, sum and count per module for /metrics"""
+    for module in _MODULE_SKELETON:
+        counts = metrics_tracker.get_histogram(module["id"], publish=False)
+        cumulative = []
+        running = 0
+        next_bucket = 0
+        for index in _EXPORTED_BUCKETS:
+            running += sum(counts[next_bucket:index + 1])
+            next_bucket = index + 1
+            cumulative.append(running)
+        duration_ns = metrics_tracker.get_totals(module["id"], publish=False)[2]
+        yield cumulative, duration_ns / 1e9, sum(counts)
+
+
+def _build_metrics_registry() -> MetricsRegistry:
     """
-    Execute Cubit code and return the output with optional teaching insights
+    Register every metric exposed by /metrics
+    
+    Module metrics are totals across workers (see CUBIT_METRICS_FILE); the
+    pool, cache and interpreter metrics belong to the worker answering.
+    The module collectors read already published counters: /metrics
+    publishes this worker's thread shards once before rendering.
+    """
+    registry = MetricsRegistry()
+    module_ids = [module["id"] for module in _MODULE_SKELETON]
+    caches = ("coalescing", "etag")
+    
+    def cache_counts():
+        flights = execution_flights.get_stats()
+        conditional = response_cache_stats.get_stats()
+        return (
+            (flights["coalesced"], flights["executions"]),
+            (conditional["hits"], conditional["misses"])
+        )
+    
+    registry.add(
+        "cubit_module_requests_total", "counter", "Requests handled per module",
+        lambda: (metrics_tracker.get_totals(m, publish=False)[0] for m in module_ids), "module", module_ids
+    )
+    registry.add(
+        "cubit_module_errors_total", "counter", "Failed requests per module",
+        lambda: (metrics_tracker.get_totals(m, publish=False)[1] for m in module_ids), "module", module_ids
+    )
+    registry.add_histogram(
+        "cubit_module_request_duration_seconds", "Request latency per module",
+        "module", module_ids,
+        [(bucket_upper_bound(index) + 1) / 1e6 for index in _EXPORTED_BUCKETS],
+        _module_latency_histograms
+    )
+    registry.add(
+        "cubit_execution_pool_queue_depth", "gauge", "Executions waiting for a pool worker",
+        lambda: (execution_pool.get_stats()["queued"],)
+    )
+    registry.add(
+        "cubit_execution_pool_active", "gauge", "Executions currently running",
+        lambda: (execution_pool.get_stats()["active"],)
+    )
+    registry.add(
+        "cubit_execution_pool_completed_total", "counter", "Executions finished by the pool",
+        lambda: (execution_pool.get_stats()["completed"],)
+    )
+    registry.add(
+        "cubit_cache_hits_total", "counter",
+        "Coalesced executions and 304 Not Modified answers",
+        lambda: (hits for hits, _ in cache_counts()), "cache", caches
+    )
+    registry.add(
+        "cubit_cache_misses_total", "counter",
+        "Executions run and full cacheable responses sent",
+        lambda: (misses for _, misses in cache_counts()), "cache", caches
+    )
+    registry.add(
+        "cubit_cache_hit_ratio", "gauge", "Cache hits / (hits + misses)",
+        lambda: (hits / (hits + misses) if hits + misses else 0.0 for hits, misses in cache_counts()),
+        "cache", caches
+    )
+    registry.add(
+        "cubit_interpreter_steps_total", "counter", "Statements executed by the interpreter",
+        lambda: (executed_steps(),)
+    )
+    registry.add(
+        "cubit_compression_bytes_total", "counter", "Response bytes before and after compression",
+        lambda: (compression_stats.bytes_in, compression_stats.bytes_out), "stage", ("in", "out")
+    )
+    registry.add(
+        "process_resident_memory_bytes", "gauge", "Resident memory size in bytes",
+        lambda: (process_rss_bytes(),)
+    )
+    return registry
+
+
+_metrics_registry = _build_metrics_registry()
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Metrics in Prometheus text exposition format
+    
+    Returns:
+        text/plain response for Prometheus-style scrapers
+    """
+    metrics_tracker.publish()
+    return Response(content=_metrics_registry.render(), media_type=CONTENT_TYPE)
+
+
+def _respond(response: Any):
+    """
+    Return a response through the fast JSON path when it is enabled
+    
+    Execute responses are built with ExecuteResponse.model_construct from
+    already well-typed values, so the fast path can encode their fields
+    directly. Long program output is streamed in chunks.
     
     Args:
-        request: ExecuteRequest containing:
-            - code: The Cubit code to execute
-            - teaching_enabled: Whether to provide teaching insights (default: True)
-            - verbosity: Teaching detail level - minimal/normal/detailed (default: normal)
+        response: ExecuteResponse or plain JSON-compatible dict
         
+    Returns:
+        The response unchanged, or a FastJSONResponse / streamed equivalent
+    """
+    if not FAST_JSON_RESPONSES:
+        return response
+    
+    payload = dict(response)
+    output = payload.get("output")
+    if isinstance(output, str) and len(output) >= STREAM_OUTPUT_MIN_CHARS:
+        return StreamingResponse(iter_json_object(payload, "output"), media_type="application/json")
+    return FastJSONResponse(payload)
+
+
+def _resolve_session_id(body_session_id: Optional[str], header_session_id: Optional[str]) -> Optional[str]:
+    """
+    Pick the learner session id from the request body or the X-Session-Id header
+
+    Raises:
+        HTTPException: 400 if the header value is not a valid session id
+    """
+    if body_session_id:
+        return body_session_id
+    if header_session_id is None:
+        return None
+    if not re.match(SESSION_ID_PATTERN, header_session_id):
+        raise HTTPException(status_code=400, detail="Invalid X-Session-Id header")
+    return header_session_id
+
+
+@contextmanager
+def _pedagogy_for(request: ExecuteRequest, interpreter: Interpreter):
+    """
+    Provide the PedagogicalAPI that should observe a request's execution
+
+    Requests with a session_id use the learner's session, so teaching sees
+    their whole history; the session is locked for the duration. Other
+    requests get a fresh PedagogicalAPI.
+
+    Args:
+        request: Execute request (verbosity and session_id are used)
+        interpreter: Interpreter that will run the request's program
+
+    Yields:
+        PedagogicalAPI wrapping interpreter
+    """
+    verbosity = request.verbosity or 'normal'
+    if not request.session_id:
+        yield PedagogicalAPI(interpreter, default_verbosity=verbosity, structured_insights=True)
+        return
+    
+    session = session_store.get_or_create(request.session_id)
+    with session.lock:
+        ped_interpreter = session.pedagogy
+        ped_interpreter.wrapped_api = interpreter
+        ped_interpreter.set_verbosity(verbosity)
+        try:
+            yield ped_interpreter
+        finally:
+            # Don't keep the request's interpreter alive in the session
+            ped_interpreter.wrapped_api = None
+    session_store.mark_dirty(session)
+
+
+def _teaching_data(ped_interpreter: PedagogicalAPI) -> Dict[str, Any]:
+    """
+    Collect the teaching fields of an execute response
+
+    Args:
+        ped_interpreter: Pedagogical API that ran the program
+
+    Returns:
+        Dictionary with teaching_moment, skill_level, progress and suggestions
+    """
+    # Get the last teaching moment delivered
+    teaching_moment_data = {
+        "type": "skill_level_insight",
+        "level": ped_interpreter.get_skill_level(),
+        "message": f"You're currently at {ped_interpreter.get_skill_level()} level",
+        "timestamp": datetime.now().isoformat()
+    }
+    # Structured insight; clients render it, so no text is formatted here
+    if ped_interpreter.last_insight is not None:
+        teaching_moment_data["insight"] = ped_interpreter.last_insight.to_dict()
+    
+    return {
+        'teaching_moment': teaching_moment_data,
+        'skill_level': ped_interpreter.get_skill_level(),
+        'progress': ped_interpreter.get_learning_progress(),
+        'suggestions': ped_interpreter.suggest_next_concepts()[:5]
+    }
+
+
+def _execute_program(request: ExecuteRequest) -> ExecuteResponse:
+    """
+    Run a Cubit program synchronously; called on the execution pool
+
+    Args:
+        request: The execute request to run
+
     Returns:
         ExecuteResponse with output, result, error, and optional teaching data
     """
     # Create a new interpreter instance for each request to ensure clean state
     interpreter = Interpreter()
     
-    # Wrap with pedagogical API if teaching is enabled
-    if request.teaching_enabled:
-        ped_interpreter = PedagogicalAPI(
-            interpreter,
-            default_verbosity=request.verbosity or 'normal'
-        )
+    if not request.teaching_enabled:
+        return _run_program(request, interpreter, None)
     
-    # Capture stdout using context manager to avoid race conditions
+    # Wrap with pedagogical API (the learner's session one, if any)
+    with _pedagogy_for(request, interpreter) as ped_interpreter:
+        return _run_program(request, interpreter, ped_interpreter)
+
+
+def _run_program(request: ExecuteRequest, interpreter: Interpreter,
+                 ped_interpreter: Optional[PedagogicalAPI]) -> ExecuteResponse:
+    """Execute request.code, through ped_interpreter when teaching is enabled"""
+    # Capture stdout per thread so concurrent executions don't mix output
     output_buffer = StringIO()
     
     try:
         # Execute the code with stdout redirected
-        with redirect_stdout(output_buffer):
-            if request.teaching_enabled:
+        with capture_stdout(output_buffer):
+            if ped_interpreter is not None:
                 result = ped_interpreter.call('run', request.code)
             else:
                 result = interpreter.run(request.code)
@@ -267,26 +488,11 @@ async def execute_code(request: ExecuteRequest):
         
         # Get pedagogical data if teaching is enabled
         teaching_data = {}
-        teaching_moment_data = None
-        
-        if request.teaching_enabled:
-            # Get the last teaching moment delivered
-            teaching_moment_data = {
-                "type": "skill_level_insight",
-                "level": ped_interpreter.get_skill_level(),
-                "message": f"You're currently at {ped_interpreter.get_skill_level()} level",
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            teaching_data = {
-                'teaching_moment': teaching_moment_data,
-                'skill_level': ped_interpreter.get_skill_level(),
-                'progress': ped_interpreter.get_learning_progress(),
-                'suggestions': ped_interpreter.suggest_next_concepts()[:5]
-            }
+        if ped_interpreter is not None:
+            teaching_data = _teaching_data(ped_interpreter)
         
         # Return success response
-        return ExecuteResponse(
+        return ExecuteResponse.model_construct(
             output=output if output else None,
             result=result,
             error=None,
@@ -298,136 +504,469 @@ async def execute_code(request: ExecuteRequest):
         output = output_buffer.getvalue()
         
         # Return error response
-        return ExecuteResponse(
+        return ExecuteResponse.model_construct(
             output=output if output else None,
             result=None,
             error=str(e)
         )
 
 
-@app.post("/api/execute/debug")
-async def execute_code_debug(request: ExecuteRequest):
+@app.post("/execute", response_model=ExecuteResponse)
+async def execute_code(request: ExecuteRequest, x_session_id: Optional[str] = Header(None)):
     """
-    Execute Cubit code with step-by-step instrumentation for visualization
+    Execute Cubit code and return the output with optional teaching insights
+    
+    Concurrent identical requests for a deterministic program share a single
+    execution on the execution pool. Requests carrying a learner session id
+    (session_id field or X-Session-Id header) update that learner's history
+    and are never coalesced.
     
     Args:
         request: ExecuteRequest containing:
             - code: The Cubit code to execute
             - teaching_enabled: Whether to provide teaching insights (default: True)
             - verbosity: Teaching detail level - minimal/normal/detailed (default: normal)
+            - session_id: Optional learner session id
+        x_session_id: Learner session id from the X-Session-Id header
         
     Returns:
-        Execution steps showing processing through Lexer -> Parser -> Interpreter
+        ExecuteResponse with output, result, error, and optional teaching data
+    """
+    request.session_id = _resolve_session_id(request.session_id, x_session_id)
+    if (request.session_id and request.teaching_enabled) or not is_deterministic(request.code):
+        return _respond(await execution_pool.run(_execute_program, request))
+    
+    key = ("execute", request.code, bool(request.teaching_enabled), request.verbosity)
+    return _respond(await execution_flights.do(
+        key, lambda: execution_pool.run(_execute_program, request)
+    ))
+
+
+# Streaming limits: output events are merged up to this many characters,
+# at most this many per-statement debug events are sent per run, and a run
+# whose client reads nothing for this many seconds is stopped
+STREAM_CHUNK_CHARS = 16 * 1024
+STREAM_MAX_STEP_EVENTS = 10000
+STREAM_MAX_STALL_SECONDS = float(os.environ.get("CUBIT_STREAM_MAX_STALL", 30))
+
+
+def _execute_streaming(request: StreamExecuteRequest, stream: EventStream):
+    """
+    Run a Cubit program on the execution pool, pushing events as it goes
+
+    Sends "output" events for each printed line, "step" events for each
+    statement when request.debug is set, and a final "summary" event.
+    Returns quietly if the client disconnects or stops reading mid-run.
+
+    Args:
+        request: The streaming execute request to run
+        stream: Channel to the HTTP response
+    """
+    start = time.perf_counter()
+    interpreter = Interpreter()
+    writer = StreamWriter(stream)
+    step_count = 0
+    
+    if request.debug:
+        def trace(node):
+            nonlocal step_count
+            step_count += 1
+            if step_count <= STREAM_MAX_STEP_EVENTS:
+                stream.put("step", {"index": step_count, "node": type(node).__name__})
+        interpreter.trace_hook = trace
+    
+    try:
+        summary: Dict[str, Any] = {"result": None, "error": None}
+        try:
+            with capture_stdout(writer):
+                if request.teaching_enabled:
+                    with _pedagogy_for(request, interpreter) as ped_interpreter:
+                        summary["result"] = ped_interpreter.call('run', request.code)
+                        summary.update(_teaching_data(ped_interpreter))
+                else:
+                    summary["result"] = interpreter.run(request.code)
+        except OutputStreamClosed:
+            raise
+        except Exception as e:
+            summary["error"] = str(e)
+        
+        writer.flush()
+        summary["output_chars"] = writer.chars_written
+        summary["steps"] = step_count
+        summary["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        stream.put("summary", summary)
+    except OutputStreamClosed:
+        # Client went away; stop executing
+        return
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _stream_execution(request: StreamExecuteRequest):
+    """Relay events from the executing thread as Server-Sent Events"""
+    stream = EventStream(asyncio.get_running_loop(), max_stall=STREAM_MAX_STALL_SECONDS)
+    task = asyncio.ensure_future(execution_pool.run(_execute_streaming, request, stream))
+    pending = None
+    
+    try:
+        while True:
+            if pending is not None:
+                kind, payload = pending
+                pending = None
+            else:
+                try:
+                    kind, payload = await stream.get()
+                except OutputStreamClosed:
+                    # The run was stopped because the client stopped reading
+                    break
+            
+            if kind == "output":
+                # Merge output that is already waiting into one message
+                parts = [payload]
+                size = len(payload)
+                while size < STREAM_CHUNK_CHARS:
+                    try:
+                        event = stream.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if event[0] != "output":
+                        pending = event
+                        break
+                    parts.append(event[1])
+                    size += len(event[1])
+                yield _sse("output", {"text": "".join(parts)})
+            else:
+                yield _sse(kind, payload)
+                if kind == "summary":
+                    break
+    finally:
+        # The worker notices at its next event; it is not awaited so a
+        # program that stopped printing can't hold up the response
+        stream.close()
+        task.add_done_callback(lambda t: t.exception())
+
+
+@app.post("/execute/stream")
+async def execute_code_stream(request: StreamExecuteRequest, x_session_id: Optional[str] = Header(None)):
+    """
+    Execute Cubit code and stream its output as Server-Sent Events
+    
+    Events:
+        - output: {"text": ...} as soon as the program prints
+        - step: {"index": ..., "node": ...} per statement when debug is true
+        - summary: result, error, timing and optional teaching data (last)
+    
+    Args:
+        request: StreamExecuteRequest containing:
+            - code: The Cubit code to execute
+            - teaching_enabled: Whether to provide teaching insights (default: True)
+            - verbosity: Teaching detail level - minimal/normal/detailed (default: normal)
+            - debug: Whether to send per-statement step events (default: False)
+            - session_id: Optional learner session id
+        x_session_id: Learner session id from the X-Session-Id header
+    
+    Returns:
+        text/event-stream response
+    """
+    request.session_id = _resolve_session_id(request.session_id, x_session_id)
+    return StreamingResponse(
+        _stream_execution(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _parse_batch_program(code: str):
+    """Parse one distinct batch program; returns (syntax_tree, error)"""
+    try:
+        return parse_program(code), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _run_batch_item(index: int, item: BatchItem, syntax_tree, parse_error) -> Dict[str, Any]:
+    """
+    Run one batch item on the execution pool
+
+    Args:
+        index: Position of the item in the request
+        item: The program to run
+        syntax_tree: Shared AST for item.code, or None if parsing failed
+        parse_error: Parse error message, if any
+
+    Returns:
+        Per-item result record
+    """
+    start = time.perf_counter()
+    output_buffer = StringIO()
+    result = None
+    error = parse_error
+    
+    if syntax_tree is not None:
+        try:
+            with capture_stdout(output_buffer):
+                result = Interpreter().run(item.code, syntax_tree=syntax_tree)
+        except Exception as e:
+            error = str(e)
+    
+    output = output_buffer.getvalue()
+    record = {
+        "type": "result",
+        "index": index,
+        "id": item.id,
+        "output": output if output else None,
+        "result": result,
+        "error": error,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3)
+    }
+    if item.expected_output is not None:
+        record["passed"] = error is None and output.rstrip() == item.expected_output.rstrip()
+    return record
+
+
+async def _stream_batch(request: BatchExecuteRequest):
+    """Run batch items in parallel and yield NDJSON lines as they finish"""
+    start = time.perf_counter()
+    parse_tasks: Dict[str, asyncio.Future] = {}
+    max_in_flight = execution_pool.max_workers * 2
+    in_flight = set()
+    totals = {"total": 0, "passed": 0, "failed": 0, "errors": 0}
+    execution_ms = 0.0
+    
+    async def run_item(index: int, item: BatchItem):
+        # Each distinct program is lexed and parsed once per batch
+        parse_task = parse_tasks.get(item.code)
+        if parse_task is None:
+            parse_task = asyncio.ensure_future(
+                execution_pool.run(_parse_batch_program, item.code)
+            )
+            parse_tasks[item.code] = parse_task
+        syntax_tree, parse_error = await parse_task
+        return await execution_pool.run(
+            _run_batch_item, index, item, syntax_tree, parse_error
+        )
+    
+    def finish(task) -> str:
+        nonlocal execution_ms
+        record = task.result()
+        totals["total"] += 1
+        execution_ms += record["duration_ms"]
+        if record["error"] is not None:
+            totals["errors"] += 1
+        if "passed" in record:
+            totals["passed" if record["passed"] else "failed"] += 1
+        return json.dumps(record, default=str) + "\n"
+    
+    try:
+        for index, item in enumerate(request.items):
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield finish(task)
+            in_flight.add(asyncio.ensure_future(run_item(index, item)))
+        
+        while in_flight:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield finish(task)
+    finally:
+        for task in in_flight:
+            task.cancel()
+    
+    summary = dict(totals)
+    summary["unique_programs"] = len(parse_tasks)
+    summary["execution_ms"] = round(execution_ms, 2)
+    summary["total_duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    yield json.dumps({"type": "summary", **summary}) + "\n"
+
+
+@app.post("/execute/batch")
+async def execute_code_batch(request: BatchExecuteRequest):
     """
-    from lexer import Lexer
-    from parser import Parser
+    Execute many Cubit programs in one request, e.g. for autograding
+    
+    Items run in parallel on the execution pool and identical programs share
+    one parsed AST. Results are streamed as newline-delimited JSON in
+    completion order, one {"type": "result", ...} line per item (with
+    "passed" when expected_output was given), followed by a single
+    {"type": "summary", ...} line with aggregate counts and timing.
     
+    Args:
+        request: BatchExecuteRequest containing:
+            - items: List of {id?, code, expected_output?} (at most 10,000)
+    
+    Returns:
+        application/x-ndjson response
+    """
+    return StreamingResponse(_stream_batch(request), media_type="application/x-ndjson")
+
+
+# Size limits for /api/execute/debug payloads: tokens inline per page,
+# characters of echoed source / stdout, AST nodes included in the steps and
+# encoded characters of the variables and node timings
+DEBUG_TOKEN_PAGE_SIZE = 500
+DEBUG_MAX_TOKEN_PAGE_SIZE = 5000
+DEBUG_MAX_TEXT_CHARS = 64 * 1024
+DEBUG_MAX_AST_NODES = 5000
+DEBUG_MAX_MAPPING_CHARS = 64 * 1024
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to at most limit characters"""
+    return text if len(text) <= limit else text[:limit]
+
+
+def _cap_mapping(mapping: Dict[str, Any], limit: int) -> Tuple[Dict[str, Any], bool]:
+    """
+    Keep the entries of a mapping while their encoded size fits in limit
+
+    Returns:
+        (kept entries, whether any entry was left out)
+    """
+    kept = {}
+    size = 0
+    for key, value in mapping.items():
+        size += len(key) + len(json.dumps(value, default=str))
+        if size > limit:
+            return kept, True
+        kept[key] = value
+    return kept, False
+
+
+def _debug_step(step_id: str, module: str, duration_ns: int, input_desc: Any,
+                output: Dict[str, Any]) -> Dict[str, Any]:
+    """Build one completed step of a debug execution"""
+    return {
+        "id": step_id,
+        "module": module,
+        "timestamp": datetime.now().isoformat(),
+        "duration_ms": round(duration_ns / 1e6, 3),
+        "input": input_desc,
+        "output": output,
+        "status": "completed"
+    }
+
+
+# Step id and input description for each phase of the pipeline
+_DEBUG_PHASES = {
+    "lexer": ("lexer", None),
+    "parser": ("parser", "tokens from lexer"),
+    "interpreter": ("interpreter", "AST from parser"),
+}
+
+# Pre-registered metric recorders for the debug pipeline phases
+_PHASE_METRICS = {phase: metrics_tracker.handle(module) for phase, (module, _) in _DEBUG_PHASES.items()}
+
+
+def _execute_debug(request: ExecuteRequest) -> Dict[str, Any]:
+    """
+    Run the Lexer -> Parser -> Interpreter pipeline once, timing every phase
+
+    The tokens and AST built for the lexer and parser steps are handed to the
+    interpreter instead of being rebuilt from source.
+
+    Args:
+        request: The execute request to run
+
+    Returns:
+        Debug payload with steps, final_result and total_duration_ms
+    """
     steps = []
     final_result = {
         "output": None,
+        "output_truncated": False,
         "result": None,
         "error": None,
         "skill_level": "beginner",
         "progress": {},
         "suggestions": []
     }
-    total_start = time.time()
+    total_start = time.perf_counter_ns()
+    code_preview = _truncate(request.code, DEBUG_MAX_TEXT_CHARS)
+    phase = "lexer"
+    ast = None
+    interpreter = None
+    parser_step = None
     
     try:
         # Step 1: Lexer
-        lexer_start = time.time()
-        lexer = Lexer(request.code)
-        tokens = lexer.tokenize()
-        lexer_duration = (time.time() - lexer_start) * 1000
+        phase_start = time.perf_counter_ns()
+        tokens = Lexer(request.code).tokenize()
+        lexer_duration = time.perf_counter_ns() - phase_start
+        _PHASE_METRICS["lexer"].record(lexer_duration)
         
-        # Record metrics
-        metrics_tracker.record_request("lexer", lexer_duration, True)
-        
-        # Format tokens for display
-        token_strings = [f"{t.type}({t.value})" if t.value else t.type for t in tokens]
-        
-        steps.append({
-            "id": "lexer-001",
-            "module": "lexer",
-            "timestamp": datetime.now().isoformat(),
-            "duration_ms": round(lexer_duration, 2),
-            "input": request.code,
-            "output": {
-                "tokens": token_strings
-            },
-            "status": "completed"
-        })
+        # Only the first page is encoded inline; longer token lists are kept
+        # for the /api/execute/debug/{debug_id}/tokens endpoint
+        debug_id = None
+        if len(tokens) > DEBUG_TOKEN_PAGE_SIZE:
+            debug_id = debug_token_store.put(tokens)
+        steps.append(_debug_step("lexer-001", "lexer", lexer_duration, code_preview, {
+            "tokens": token_page(tokens, 0, DEBUG_TOKEN_PAGE_SIZE, debug_id)
+        }))
         
         # Step 2: Parser
-        parser_start = time.time()
-        parser = Parser(tokens)
-        ast = parser.parse()
-        parser_duration = (time.time() - parser_start) * 1000
-        
-        # Record metrics
-        metrics_tracker.record_request("parser", parser_duration, True)
+        phase = "parser"
+        phase_start = time.perf_counter_ns()
+        ast = Parser(tokens).parse()
+        parser_duration = time.perf_counter_ns() - phase_start
+        _PHASE_METRICS["parser"].record(parser_duration)
         
-        # Get AST summary
-        ast_summary = f"{type(ast).__name__}" if ast else "None"
-        
-        steps.append({
-            "id": "parser-001",
-            "module": "parser",
-            "timestamp": datetime.now().isoformat(),
-            "duration_ms": round(parser_duration, 2),
-            "input": "tokens from lexer",
-            "output": {
-                "ast_summary": ast_summary
-            },
-            "status": "completed"
+        # The AST dump is filled in once per-node timings are known
+        parser_step = _debug_step("parser-001", "parser", parser_duration, "tokens from lexer", {
+            "ast_summary": f"{type(ast).__name__} with {len(ast.statements)} statements"
         })
+        steps.append(parser_step)
         
-        # Step 3: Interpreter
-        interpreter_start = time.time()
-        interpreter = Interpreter()
+        # Step 3: Interpreter, reusing the AST built above
+        phase = "interpreter"
+        phase_start = time.perf_counter_ns()
+        interpreter = ProfilingInterpreter()
         
         # Wrap with pedagogical API if teaching is enabled
         if request.teaching_enabled:
             ped_interpreter = PedagogicalAPI(
                 interpreter,
-                default_verbosity=request.verbosity or 'normal'
+                default_verbosity=request.verbosity or 'normal',
+                structured_insights=True
             )
         
         # Capture stdout
         output_buffer = StringIO()
-        with redirect_stdout(output_buffer):
+        with capture_stdout(output_buffer):
             if request.teaching_enabled:
-                result = ped_interpreter.call('run', request.code)
+                result = ped_interpreter.call('run', request.code, syntax_tree=ast)
             else:
-                result = interpreter.run(request.code)
+                result = interpreter.run(request.code, syntax_tree=ast)
         
         output = output_buffer.getvalue()
-        interpreter_duration = (time.time() - interpreter_start) * 1000
-        
-        # Record metrics
-        metrics_tracker.record_request("interpreter", interpreter_duration, True)
+        interpreter_duration = time.perf_counter_ns() - phase_start
+        _PHASE_METRICS["interpreter"].record(interpreter_duration)
         
         # Get variables from interpreter
-        variables = {}
-        if hasattr(interpreter, 'symbol_table'):
-            variables = {k: v for k, v in interpreter.symbol_table.items() if not k.startswith('_')}
+        variables, variables_truncated = _cap_mapping(
+            {k: v for k, v in interpreter.variables.items() if not k.startswith('_')},
+            DEBUG_MAX_MAPPING_CHARS
+        )
+        node_timings, node_timings_truncated = _cap_mapping(interpreter.timings_by_type(), DEBUG_MAX_MAPPING_CHARS)
+        stdout = _truncate(output, DEBUG_MAX_TEXT_CHARS)
+        stdout_truncated = len(output) > DEBUG_MAX_TEXT_CHARS
         
-        steps.append({
-            "id": "interpreter-001",
-            "module": "interpreter",
-            "timestamp": datetime.now().isoformat(),
-            "duration_ms": round(interpreter_duration, 2),
-            "input": "AST from parser",
-            "output": {
-                "result": result,
-                "stdout": output,
-                "variables": variables
-            },
-            "status": "completed"
-        })
+        steps.append(_debug_step("interpreter-001", "interpreter", interpreter_duration, "AST from parser", {
+            "result": result,
+            "stdout": stdout,
+            "stdout_truncated": stdout_truncated,
+            "variables": variables,
+            "variables_truncated": variables_truncated,
+            "node_timings": node_timings,
+            "node_timings_truncated": node_timings_truncated
+        }))
         
         # Build final result
-        final_result["output"] = output
+        final_result["output"] = stdout
+        final_result["output_truncated"] = stdout_truncated
         final_result["result"] = result
         final_result["error"] = None
         
@@ -437,66 +976,124 @@ async def execute_code_debug(request: ExecuteRequest):
             final_result["suggestions"] = ped_interpreter.suggest_next_concepts()[:5]
         
     except Exception as e:
-        # Record error in the appropriate module
+        # Record the error against the phase that raised it
         error_msg = str(e)
-        if "lexer" in error_msg.lower() or len(steps) == 0:
-            metrics_tracker.record_request("lexer", 0, False)
-            steps.append({
-                "id": "lexer-error",
-                "module": "lexer",
-                "timestamp": datetime.now().isoformat(),
-                "duration_ms": 0,
-                "input": request.code,
-                "output": {},
-                "status": "error",
-                "error": error_msg
-            })
-        elif "parser" in error_msg.lower() or len(steps) == 1:
-            metrics_tracker.record_request("parser", 0, False)
-            steps.append({
-                "id": "parser-error",
-                "module": "parser",
-                "timestamp": datetime.now().isoformat(),
-                "duration_ms": 0,
-                "input": "tokens from lexer",
-                "output": {},
-                "status": "error",
-                "error": error_msg
-            })
-        else:
-            metrics_tracker.record_request("interpreter", 0, False)
-            steps.append({
-                "id": "interpreter-error",
-                "module": "interpreter",
-                "timestamp": datetime.now().isoformat(),
-                "duration_ms": 0,
-                "input": "AST from parser",
-                "output": {},
-                "status": "error",
-                "error": error_msg
-            })
+        module, input_desc = _DEBUG_PHASES[phase]
+        _PHASE_METRICS[phase].record(0, success=False)
+        steps.append({
+            "id": f"{module}-error",
+            "module": module,
+            "timestamp": datetime.now().isoformat(),
+            "duration_ms": 0,
+            "input": code_preview if input_desc is None else input_desc,
+            "output": {},
+            "status": "error",
+            "error": error_msg
+        })
         
         final_result["error"] = error_msg
     
-    total_duration = (time.time() - total_start) * 1000
+    if parser_step is not None:
+        # Annotate evaluated nodes with their calls and inclusive time
+        annotate = interpreter.node_profile if interpreter is not None else None
+        parser_step["output"]["ast"] = dump_ast(ast, annotate, max_nodes=DEBUG_MAX_AST_NODES)
+    
+    total_duration = time.perf_counter_ns() - total_start
     
     return {
         "steps": steps,
         "final_result": final_result,
-        "total_duration_ms": round(total_duration, 2)
+        "total_duration_ms": round(total_duration / 1e6, 3)
     }
 
 
+@app.post("/api/execute/debug")
+async def execute_code_debug(request: ExecuteRequest):
+    """
+    Execute Cubit code with step-by-step instrumentation for visualization
+    
+    Args:
+        request: ExecuteRequest containing:
+            - code: The Cubit code to execute
+            - teaching_enabled: Whether to provide teaching insights (default: True)
+            - verbosity: Teaching detail level - minimal/normal/detailed (default: normal)
+        
+    Returns:
+        Execution steps showing processing through Lexer -> Parser -> Interpreter,
+        including an AST dump with per-node evaluation counts and times
+    """
+    return _respond(await execution_pool.run(_execute_debug, request))
+
+
+@app.get("/api/execute/debug/{debug_id}/tokens")
+async def get_debug_tokens(debug_id: str, cursor: str = "0", limit: int = DEBUG_TOKEN_PAGE_SIZE):
+    """
+    Fetch further pages of a debug execution's tokens
+    
+    Args:
+        debug_id: The "debug_id" from the lexer step's token payload
+        cursor: The "next_cursor" of the previous page
+        limit: Page size (at most 5000)
+    
+    Returns:
+        Token page in the same compact encoding as the lexer step
+    """
+    tokens = debug_token_store.get(debug_id)
+    if tokens is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired debug_id")
+    
+    try:
+        start = int(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if start < 0 or not 1 <= limit <= DEBUG_MAX_TOKEN_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail="Invalid cursor or limit")
+    
+    return token_page(tokens, start, limit, debug_id)
+
+
 @app.get("/progress")
-async def get_progress():
+async def get_progress(session_id: Optional[str] = None, x_session_id: Optional[str] = Header(None)):
     """
     Get aggregated learning progress information
     
+    Args:
+        session_id: Learner session id (query parameter)
+        x_session_id: Learner session id from the X-Session-Id header
+    
     Returns:
         Progress metrics including total calls, method diversity, skill trajectory
     """
-    # NOTE: This will be session-based in future with user authentication
-    # For now, return example structure
+    if session_id is not None and not re.match(SESSION_ID_PATTERN, session_id):
+        raise HTTPException(status_code=400, detail="Invalid session_id")
+    session_id = _resolve_session_id(session_id, x_session_id)
+    
+    # The live session is current; the progress store's batched writer runs
+    # behind it, so the store only answers for evicted or unknown sessions.
+    # Sessions live in one worker's memory: under several workers this
+    # reports the history held by the worker serving the request, which
+    # can differ from the store's totals across all workers.
+    session = session_store.get(session_id) if session_id else None
+    if session is not None:
+        # Memoised summaries and running counts, read without the session
+        # lock (held while one of the learner's programs is running)
+        ped_interpreter = session.pedagogy
+        progress = ped_interpreter.get_learning_progress()
+        return {
+            "session_id": session_id,
+            "total_calls": progress["total_calls"],
+            "method_diversity": ped_interpreter.get_methods_used(),
+            "mastered_concepts": progress["mastered_concepts"],
+            "current_skill_level": ped_interpreter.get_skill_level(),
+            "skill_trajectory": progress["skill_trajectory"]
+        }
+    
+    if session_id and progress_store is not None:
+        stored = progress_store.get_progress(session_id)
+        if stored is not None:
+            return stored
+    
+    # No known session: describe how progress tracking works
     return {
         "total_calls": 0,
         "method_diversity": [],
@@ -507,18 +1104,16 @@ async def get_progress():
     }
 
 
-@app.get("/concepts")
-async def get_concepts():
+def _build_concepts_payload(mapper: ConceptDependencyMapper) -> JSONPayload:
     """
-    Get programming concept suggestions
+    Build the /concepts response from a concept mapper
     
+    Args:
+        mapper: Concept dependency mapper to describe
+        
     Returns:
-        List of programming concepts with dependencies
+        Pre-encoded payload with suggestion paths and prerequisite graph
     """
-    from pedagogical.concept_mapper import ConceptDependencyMapper
-    
-    mapper = ConceptDependencyMapper()
-    
     # Get some common concept paths
     concepts = {
         'beginner': mapper.suggest_next_concepts([]),
@@ -526,7 +1121,7 @@ async def get_concepts():
         'advanced': mapper.suggest_next_concepts(['variables', 'functions', 'loops', 'lists', 'conditionals']),
     }
     
-    return {
+    return JSONPayload({
         "concepts": concepts,
         "graph": {
             concept: {
@@ -535,62 +1130,140 @@ async def get_concepts():
             }
             for concept in ['variables', 'functions', 'loops', 'lists', 'classes', 'decorators']
         }
+    })
+
+
+# The concept graph shared by every PedagogicalAPI. It is loaded from
+# CUBIT_CONCEPTS_FILE (JSON or binary snapshot) if set, otherwise from the
+# "concepts" section of curriculum.json, reloaded when that file changes.
+_concept_mapper = shared_components().concept_mapper
+CONCEPTS_FILE = os.environ.get("CUBIT_CONCEPTS_FILE")
+if CONCEPTS_FILE:
+    _concept_mapper.load_file(CONCEPTS_FILE)
+    concept_graph_sync = None
+else:
+    concept_graph_sync = ConceptGraphSync(course_store, _concept_mapper)
+    concept_graph_sync.sync(wait=True)
+    # Any read of the shared graph (suggestions in /execute, /progress and
+    # sessions as well as /concepts) picks up curriculum.json edits
+    _concept_mapper.on_access = concept_graph_sync.sync
+
+# /concepts payload and the concept graph version it was built from
+_concepts_payload: Tuple[int, Optional[JSONPayload]] = (0, None)
+
+
+def _current_concepts_payload() -> JSONPayload:
+    """The /concepts payload, rebuilt only when the concept graph changes"""
+    global _concepts_payload
+    version, payload = _concepts_payload
+    if payload is None or version != _concept_mapper.version:
+        version = _concept_mapper.version
+        payload = _build_concepts_payload(_concept_mapper)
+        _concepts_payload = (version, payload)
+    return payload
+
+
+def _concept_graph_stats() -> Dict[str, Any]:
+    """Concept graph version and source for the status endpoint"""
+    if concept_graph_sync is not None:
+        return concept_graph_sync.get_stats()
+    return {
+        "source": CONCEPTS_FILE,
+        "version": _concept_mapper.version,
+        "concepts": len(_concept_mapper.index.order)
     }
 
 
-@app.get("/games")
-async def get_games():
+@app.get("/concepts")
+async def get_concepts(request: Request):
     """
-    Get the list of available games from games.json
+    Get programming concept suggestions
     
     Returns:
-        The contents of frontend/src/course/games.json
+        List of programming concepts with dependencies
     """
-    try:
-        # Try to find games.json in the frontend directory
-        games_path = Path(__file__).parent / 'frontend' / 'src' / 'course' / 'games.json'
-        
-        if not games_path.exists():
-            # Fallback: try relative to current directory
-            games_path = Path('frontend/src/course/games.json')
-        
-        if games_path.exists():
-            with open(games_path, 'r', encoding='utf-8') as f:
-                games_data = json.load(f)
-            return games_data
+    return cached_json_response(request, _current_concepts_payload())
+
+
+# Served by /games when games.json is missing
+_FALLBACK_GAMES = JSONPayload({
+    "games": [
+        {
+            "title": "Animated Art",
+            "description": "Create generative art with Cubit code",
+            "instructions": "Use draw_circle(), draw_square(), draw_triangle(), set_color(), animate()",
+            "starter": "set_color('blue')\ndraw_circle(50, 50, 20)",
+            "solution": "set_color('blue')\ndraw_circle(50, 50, 20)"
+        }
+    ]
+})
+
+
+def _course_response(request: Request, name: str, fallback: Optional[JSONPayload] = None):
+    """
+    Serve a course file from the course content store
+    
+    Args:
+        request: Incoming request (for conditional GET)
+        name: Course file name (games, challenges or curriculum)
+        fallback: Payload to serve if the file is missing
+    
+    Returns:
+        Cached JSON response, or an error payload if the file can't be loaded
+    """
+    payload = course_store.get(name)
+    if payload is None:
+        error = course_store.get_error(name)
+        if fallback is not None and error == f"{name}.json not found":
+            payload = fallback
         else:
-            # Return a minimal fallback response if file not found
             return {
-                "games": [
-                    {
-                        "title": "Animated Art",
-                        "description": "Create generative art with Cubit code",
-                        "instructions": "Use draw_circle(), draw_square(), draw_triangle(), set_color(), animate()",
-                        "starter": "set_color('blue')\ndraw_circle(50, 50, 20)",
-                        "solution": "set_color('blue')\ndraw_circle(50, 50, 20)"
-                    }
-                ]
+                "error": f"Failed to load {name}: {error}",
+                name: []
             }
-    except Exception as e:
-        return {
-            "error": f"Failed to load games: {str(e)}",
-            "games": []
-        }
+    return cached_json_response(request, payload)
 
 
-@app.post("/games/execute", response_model=ExecuteResponse)
-async def execute_game_code(request: GameExecuteRequest):
+@app.get("/games")
+async def get_games(request: Request):
     """
-    Execute game code and return structured visualization data
+    Get the list of available games from games.json
     
-    Args:
-        request: GameExecuteRequest containing:
-            - game: Name of the game (AnimatedArt, GraphingCalculator, etc.)
-            - code: The code to execute
-            - options: Optional game-specific options
-            - teaching_enabled: Whether to provide teaching insights
-            - verbosity: Teaching detail level
+    Returns:
+        The contents of frontend/src/course/games.json
+    """
+    return _course_response(request, "games", fallback=_FALLBACK_GAMES)
+
+
+@app.get("/challenges")
+async def get_challenges(request: Request):
+    """
+    Get the coding challenges from challenges.json
     
+    Returns:
+        The contents of frontend/src/course/challenges.json
+    """
+    return _course_response(request, "challenges")
+
+
+@app.get("/curriculum")
+async def get_curriculum(request: Request):
+    """
+    Get the course curriculum from curriculum.json
+    
+    Returns:
+        The contents of frontend/src/course/curriculum.json
+    """
+    return _course_response(request, "curriculum")
+
+
+def _execute_game(request: GameExecuteRequest) -> ExecuteResponse:
+    """
+    Parse game code synchronously; called on the execution pool
+
+    Args:
+        request: The game execute request to run
+
     Returns:
         ExecuteResponse with shapes/commands for visualization
     """
@@ -600,7 +1273,7 @@ async def execute_game_code(request: GameExecuteRequest):
         
         # If there was a parsing error, return it
         if parse_result.get("error"):
-            return ExecuteResponse(
+            return ExecuteResponse.model_construct(
                 output=None,
                 result=None,
                 error=parse_result["error"],
@@ -615,12 +1288,13 @@ async def execute_game_code(request: GameExecuteRequest):
                 interpreter = Interpreter()
                 ped_interpreter = PedagogicalAPI(
                     interpreter,
-                    default_verbosity=request.verbosity or 'normal'
+                    default_verbosity=request.verbosity or 'normal',
+                    structured_insights=True
                 )
                 
                 # Execute the code to get teaching insights
                 output_buffer = StringIO()
-                with redirect_stdout(output_buffer):
+                with capture_stdout(output_buffer):
                     ped_interpreter.call('run', request.code)
                 
                 teaching_data = {
@@ -633,7 +1307,7 @@ async def execute_game_code(request: GameExecuteRequest):
                 pass
         
         # Return successful response with shapes
-        return ExecuteResponse(
+        return ExecuteResponse.model_construct(
             output=parse_result.get("output"),
             result=None,
             error=None,
@@ -642,7 +1316,7 @@ async def execute_game_code(request: GameExecuteRequest):
         )
     
     except Exception as e:
-        return ExecuteResponse(
+        return ExecuteResponse.model_construct(
             output=None,
             result=None,
             error=f"Execution failed: {str(e)}",
@@ -650,6 +1324,41 @@ async def execute_game_code(request: GameExecuteRequest):
         )
 
 
+@app.post("/games/execute", response_model=ExecuteResponse)
+async def execute_game_code(request: GameExecuteRequest):
+    """
+    Execute game code and return structured visualization data
+    
+    Concurrent identical requests share a single execution on the
+    execution pool.
+    
+    Args:
+        request: GameExecuteRequest containing:
+            - game: Name of the game (AnimatedArt, GraphingCalculator, etc.)
+            - code: The code to execute
+            - options: Optional game-specific options
+            - teaching_enabled: Whether to provide teaching insights
+            - verbosity: Teaching detail level
+    
+    Returns:
+        ExecuteResponse with shapes/commands for visualization
+    """
+    if not is_deterministic(request.code):
+        return _respond(await execution_pool.run(_execute_game, request))
+    
+    key = (
+        "games/execute",
+        request.game,
+        request.code,
+        json.dumps(request.options, sort_keys=True, default=str),
+        bool(request.teaching_enabled),
+        request.verbosity
+    )
+    return _respond(await execution_flights.do(
+        key, lambda: execution_pool.run(_execute_game, request)
+    ))
+
+
 if __name__ == "__main__":
     import uvicorn
     import os
@@ -0,0 +1,53 @@
+"""
+Measure per-call history recording cost and memory at the history cap
+
+Usage: python benchmarks/bench_call_history.py
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pedagogical.api import PedagogicalAPI
+
+
+class Target:
+    def run(self, code):
+        return None
+
+    def parse(self, code):
+        return None
+
+
+def _fill(ped: PedagogicalAPI, calls: int):
+    for i in range(calls):
+        ped.call('run' if i % 3 else 'parse', 'let x = 1')
+
+
+def main():
+    max_history = 1000
+    ped = PedagogicalAPI(Target(), max_history=max_history, default_verbosity='minimal')
+    ped.insight_delivery.deliver = lambda moment, result: None
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    _fill(ped, max_history)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    history_bytes = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"history memory at cap ({max_history} calls) {history_bytes / 1024:8.1f} KiB")
+
+    # Every call now evicts the oldest record
+    repeat = 5000
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        ped._record_call('run', ('let x = 1',), {}, None, None)
+    per_call = (time.perf_counter_ns() - start) / repeat / 1000
+    print(f"_record_call at cap                    {per_call:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measure concept graph loading and queries on a synthetic 10k-concept curriculum
+
+Usage: python benchmarks/bench_concept_graph.py [concepts]
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pedagogical.concept_mapper import ConceptDependencyMapper, ConceptIndex, np
+
+
+def synthetic_concepts(count: int, seed: int = 1):
+    """Layered DAG: each concept requires up to three earlier concepts, mostly nearby ones"""
+    rng = random.Random(seed)
+    difficulties = ['beginner', 'intermediate', 'advanced', 'expert']
+    concepts = []
+    for i in range(count):
+        entry = {
+            "name": f"concept_{i}",
+            "difficulty": difficulties[min(3, i * 4 // count)],
+            "category": f"unit_{i // 100}",
+            "description": f"Synthetic concept {i}"
+        }
+        if i:
+            window = range(max(0, i - 200), i)
+            entry["prerequisites"] = [f"concept_{p}" for p in rng.sample(window, min(len(window), rng.randint(1, 3)))]
+        concepts.append(entry)
+    return concepts
+
+
+def _time_ms(func, repeat: int = 1) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter_ns() - start) / repeat / 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    concepts = synthetic_concepts(count)
+    mapper = ConceptDependencyMapper()
+
+    print(f"{count} concepts")
+    print(f"load + index from JSON definitions {_time_ms(lambda: mapper.load_concepts(concepts)):10.1f} ms")
+    snapshot = mapper.index.to_snapshot()
+    print(f"snapshot size                      {len(snapshot) / 1024:10.1f} KiB")
+    print(f"index from snapshot                {_time_ms(lambda: ConceptIndex.from_snapshot(snapshot)):10.1f} ms")
+
+    rng = random.Random(2)
+    mastered = [f"concept_{i}" for i in range(count // 2)]
+    targets = [f"concept_{rng.randrange(count)}" for _ in range(50)]
+    print(f"suggest_next_concepts (half known) {_time_ms(lambda: mapper.suggest_next_concepts(mastered), 20):10.3f} ms")
+    # Learners working through the first units, each with a few concepts from later ones
+    classroom = []
+    for _ in range(2000):
+        known = rng.randrange(min(count, 400))
+        extras = rng.sample(range(count), 5)
+        classroom.append([f"concept_{i}" for i in range(known)] + [f"concept_{i}" for i in extras])
+    few = mastered[:20]
+    print(f"suggest_next_concepts (20 known)   {_time_ms(lambda: mapper.suggest_next_concepts(few), 200):10.3f} ms")
+    print(f"suggest_next_concepts per learner (2000 learners) "
+          f"{_time_ms(lambda: [mapper.suggest_next_concepts(known) for known in classroom]):10.1f} ms")
+    print(f"suggest_next_concepts_batch (2000 learners, numpy={np is not None}) "
+          f"{_time_ms(lambda: mapper.suggest_next_concepts_batch(classroom)):10.1f} ms")
+    print(f"get_learning_path (random target)  "
+          f"{_time_ms(lambda: [mapper.get_learning_path(t) for t in targets]) / len(targets):10.3f} ms")
+    print(f"get_prerequisites (random target)  "
+          f"{_time_ms(lambda: [mapper.get_prerequisites(t) for t in targets]) / len(targets):10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Measure the per-call cost of calling-context capture
+
+Usage: python benchmarks/bench_context_capture.py
+"""
+
+import inspect
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from interpreter import Interpreter
+from pedagogical.api import PedagogicalAPI
+from pedagogical.context_analyzer import ContextAnalyzer
+
+
+def _per_call_us(func, repeat: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter_ns() - start) / repeat / 1000
+
+
+def _from_call(method):
+    # Mirrors PedagogicalAPI.call -> analyze(currentframe()) two frames deep
+    return method(inspect.currentframe())
+
+
+def _caller(method):
+    return _from_call(method)
+
+
+def main():
+    repeat = 20000
+    analyzer = ContextAnalyzer()
+    
+    print(f"eager analyze_now           {_per_call_us(lambda: _caller(analyzer.analyze_now), repeat):8.2f} us")
+    print(f"lazy analyze (capture only) {_per_call_us(lambda: _caller(analyzer.analyze), repeat):8.2f} us")
+    print(f"lazy analyze, all keys read {_per_call_us(lambda: dict(_caller(analyzer.analyze)), repeat):8.2f} us")
+    
+    ped = PedagogicalAPI(Interpreter(), default_verbosity='minimal')
+    ped.insight_delivery.deliver = lambda moment, result: None
+    print(f"PedagogicalAPI.call('run')  {_per_call_us(lambda: ped.call('run', 'let x = 1'), 2000):8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
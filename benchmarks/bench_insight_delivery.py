@@ -0,0 +1,41 @@
+"""
+Measure per-call teaching overhead: printed (and captured) vs structured insights
+
+Usage: python benchmarks/bench_insight_delivery.py
+"""
+
+import sys
+import time
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from output_capture import capture_stdout
+from pedagogical.api import PedagogicalAPI
+
+
+class Target:
+    def run(self, code):
+        return None
+
+
+def _per_call_us(structured: bool, verbosity: str, repeat: int = 2000) -> float:
+    ped = PedagogicalAPI(Target(), default_verbosity=verbosity, structured_insights=structured)
+    buffer = StringIO()
+    start = time.perf_counter_ns()
+    with capture_stdout(buffer):
+        for _ in range(repeat):
+            ped.call('run', 'print 1')
+    return (time.perf_counter_ns() - start) / repeat / 1000
+
+
+def main():
+    for verbosity in ('minimal', 'normal', 'detailed'):
+        printed = _per_call_us(False, verbosity)
+        structured = _per_call_us(True, verbosity)
+        print(f"{verbosity:<9} printed + captured {printed:8.2f} us   structured {structured:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
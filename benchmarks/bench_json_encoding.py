@@ -0,0 +1,50 @@
+"""
+Compare response encoding cost for /execute payloads
+
+Usage: python benchmarks/bench_json_encoding.py
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api import ExecuteResponse
+from fast_json import dumps, iter_json_object
+
+
+def _payload(output_chars: int) -> dict:
+    return {
+        "output": ("x = 42 \"ok\"\n" * (output_chars // 12 + 1))[:output_chars],
+        "result": 42,
+        "error": None,
+        "teaching_moment": None,
+        "skill_level": "beginner",
+        "progress": {"total_calls": 12, "methods_used": ["print", "let"]},
+        "suggestions": ["Try a while loop"],
+        "shapes": None
+    }
+
+
+def _time(label: str, func, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<28} {elapsed * 1e6:>10.1f} us")
+
+
+def main():
+    for name, size, repeat in (("small", 64, 20000), ("median", 4096, 5000), ("1 MB", 1 << 20, 50)):
+        payload = _payload(size)
+        print(f"{name} output ({size} chars)")
+        _time("pydantic validate + dump", lambda: ExecuteResponse(**payload).model_dump_json(), repeat)
+        _time("stdlib json.dumps", lambda: json.dumps(payload).encode(), repeat)
+        _time("fast_json.dumps", lambda: dumps(payload), repeat)
+        _time("fast_json.iter_json_object", lambda: b"".join(iter_json_object(payload, "output")), repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Measure the cost of recording one module request
+
+Usage: python benchmarks/bench_metrics_recording.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from module_metrics import ModuleMetrics
+
+
+def _per_call_ns(func, repeat: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter_ns() - start) / repeat
+
+
+def main():
+    repeat = 500_000
+    metrics = ModuleMetrics()
+    handle = metrics.handle("lexer")
+    
+    print(f"handle.record            {_per_call_ns(lambda: handle.record(12_345), repeat):8.0f} ns")
+    print(f"record_request (by id)   {_per_call_ns(lambda: metrics.record_request('lexer', 0.012, True), repeat):8.0f} ns")
+    
+    threads = 8
+    def work():
+        for _ in range(repeat // threads):
+            handle.record(12_345)
+    
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    start = time.perf_counter_ns()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter_ns() - start
+    print(f"{threads} threads, per record  {elapsed / repeat:8.0f} ns")
+    print(f"publish + read           {_per_call_ns(lambda: metrics.get_metrics('lexer'), 1000) / 1000:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Measure the cost of creating a PedagogicalAPI (done for every teaching request)
+
+Usage: python benchmarks/bench_pedagogy_construction.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pedagogical.api import PedagogicalAPI
+
+
+def _per_call_us(func, repeat: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter_ns() - start) / repeat / 1000
+
+
+def main():
+    repeat = 20000
+    private = _per_call_us(lambda: PedagogicalAPI(None, share_components=False), repeat)
+    shared = _per_call_us(lambda: PedagogicalAPI(None), repeat)
+    print(f"PedagogicalAPI() private components {private:8.2f} us")
+    print(f"PedagogicalAPI() shared components  {shared:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
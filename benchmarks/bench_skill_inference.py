@@ -0,0 +1,56 @@
+"""
+Measure skill inference for a large class: per-learner scoring vs one batch
+
+Usage: python benchmarks/bench_skill_inference.py [learners]
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pedagogical.skill_inference import SkillFeatures, SkillInferenceEngine, np
+
+
+def synthetic_features(count: int, seed: int = 1):
+    """Plausible feature rows for learners at every stage"""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        total = rng.randint(0, 1000)
+        unique = rng.randint(min(total, 1), min(total, 60))
+        max_count = rng.randint(-(-total // max(unique, 1)), total) if total else 0
+        rows.append(SkillFeatures(
+            total, unique, max_count,
+            rng.randint(0, min(18, max(total - 2, 0))),
+            rng.randint(0, min(9, max(total - 1, 0))),
+            rng.randint(0, min(30, total)),
+        ))
+    return rows
+
+
+def _time_ms(fn, repeat: int = 3):
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter_ns() - start) / repeat / 1e6, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    engine = SkillInferenceEngine()
+    rows = synthetic_features(count)
+
+    scalar_ms, expected = _time_ms(lambda: [engine.infer_from_statistics(row, {}) for row in rows])
+    batch_ms, levels = _time_ms(lambda: engine.infer_levels(rows))
+    assert levels == expected
+
+    print(f"{count} learners")
+    print(f"infer_from_statistics per learner  {scalar_ms:10.1f} ms")
+    print(f"infer_levels (numpy={np is not None})        {batch_ms:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Response compression for large API responses
+
+Negotiates gzip (or brotli, when the brotli package is installed) from the
+Accept-Encoding header and compresses responses above a size threshold at a
+cheap compression level. Streamed responses are compressed chunk by chunk with
+a flush after each chunk, so clients still receive results as they are produced.
+"""
+
+import os
+import time
+import zlib
+from typing import Dict, List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+# Responses smaller than this are sent uncompressed
+DEFAULT_MINIMUM_SIZE = int(os.environ.get("CUBIT_COMPRESSION_MIN_KB", 2)) * 1024
+
+# Server-Sent Events are already incremental and latency sensitive
+_SKIPPED_CONTENT_TYPES = ("text/event-stream",)
+
+
+class _GzipEncoder:
+    """Incremental gzip encoder"""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    """Incremental brotli encoder"""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality, mode=brotli.MODE_TEXT)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encodings() -> List[str]:
+    """Content codings this server can produce, in order of preference"""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header
+
+    Args:
+        accept_encoding: Header value, e.g. "gzip, br;q=0.8"
+        available: Supported codings in order of server preference
+
+    Returns:
+        The coding with the highest q-value (ties go to server preference),
+        or None if the client accepts none of them
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best = None
+    best_q = 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionStats:
+    """
+    Counters for bytes saved versus CPU time spent compressing
+    """
+
+    def __init__(self):
+        """Initialize all counters to zero"""
+        self.compressed = 0
+        self.skipped_small = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_ns = 0
+        self.by_encoding: Dict[str, int] = {}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_ns: int):
+        """Record one compressed response"""
+        self.compressed += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.cpu_ns += cpu_ns
+        self.by_encoding[encoding] = self.by_encoding.get(encoding, 0) + 1
+
+    def get_stats(self) -> Dict[str, object]:
+        """
+        Get compression statistics
+
+        Returns:
+            Dictionary with response counts, byte totals, ratio and CPU time
+        """
+        return {
+            "compressed_responses": self.compressed,
+            "skipped_below_threshold": self.skipped_small,
+            "by_encoding": dict(self.by_encoding),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else None,
+            "cpu_ms": round(self.cpu_ns / 1e6, 3)
+        }
+
+
+class _CompressingResponder:
+    """Wraps the ASGI send callable for one response"""
+
+    def __init__(self, send, encoding: Optional[str], middleware: "CompressionMiddleware"):
+        self.send = send
+        self.encoding = encoding
+        self.middleware = middleware
+        self.start_message = None
+        self.encoder = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_ns = 0
+
+    def _encode(self, body: bytes, final: bool) -> bytes:
+        start = time.thread_time_ns()
+        data = self.encoder.compress(body)
+        data += self.encoder.finish() if final else self.encoder.flush()
+        self.cpu_ns += time.thread_time_ns() - start
+        self.bytes_in += len(body)
+        self.bytes_out += len(data)
+        return data
+
+    def _eligible(self, headers: Headers) -> bool:
+        if self.encoding is None or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return not content_type.startswith(_SKIPPED_CONTENT_TYPES)
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk shows the size
+            self.start_message = message
+            headers = MutableHeaders(raw=message.setdefault("headers", []))
+            if not headers.get("content-type", "").startswith(_SKIPPED_CONTENT_TYPES):
+                headers.add_vary_header("Accept-Encoding")
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start_message["headers"])
+
+            if not self._eligible(headers) or (not more_body and len(body) < self.middleware.minimum_size):
+                if self._eligible(headers):
+                    self.middleware.stats.skipped_small += 1
+                await self.send(start_message)
+                await self.send(message)
+                return
+
+            self.encoder = self.middleware.create_encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # The compressed bytes differ from the identity representation
+                headers["ETag"] = "W/" + etag
+            if more_body:
+                del headers["Content-Length"]
+                await self.send(start_message)
+            else:
+                data = self._encode(body, final=True)
+                headers["Content-Length"] = str(len(data))
+                await self.send(start_message)
+                await self.send({"type": "http.response.body", "body": data})
+                self._finish()
+                return
+
+        if self.encoder is None:
+            await self.send(message)
+            return
+
+        data = self._encode(body, final=not more_body)
+        if data or not more_body:
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+        if not more_body:
+            self._finish()
+
+    def _finish(self):
+        self.middleware.stats.record(self.encoding, self.bytes_in, self.bytes_out, self.cpu_ns)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses larger than minimum_size
+    """
+
+    def __init__(self, app, minimum_size: int = DEFAULT_MINIMUM_SIZE,
+                 gzip_level: int = 1, brotli_quality: int = 4,
+                 stats: Optional[CompressionStats] = None):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Wrapped ASGI application
+            minimum_size: Smallest response body (bytes) that is compressed
+            gzip_level: zlib compression level (1 is fastest)
+            brotli_quality: Brotli quality (0-11, 4 is fast with good ratios)
+            stats: Counters to update (defaults to compression_stats)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.stats = stats if stats is not None else compression_stats
+        self.encodings = available_encodings()
+
+    def create_encoder(self, encoding: str):
+        """Create an incremental encoder for a negotiated coding"""
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate_encoding(accept_encoding, self.encodings) if accept_encoding else None
+        await self.app(scope, receive, _CompressingResponder(send, encoding, self))
+
+
+# Global compression statistics, reported in /api/modules/status
+compression_stats = CompressionStats()
@@ -0,0 +1,211 @@
+"""
+In-memory store of the course JSON files served by the API
+"""
+
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+from response_cache import JSONPayload
+from pedagogical.concept_mapper import ConceptDependencyMapper, ConceptGraphError
+
+
+# Course files served by the API, by name
+COURSE_FILES = ("games", "challenges", "curriculum")
+
+
+class _CourseEntry:
+    """One loaded course file"""
+
+    __slots__ = ("signature", "payload", "error")
+
+    def __init__(self, signature: Optional[Tuple[int, int]], payload: Optional[JSONPayload],
+                 error: Optional[str] = None):
+        self.signature = signature
+        self.payload = payload
+        self.error = error
+
+
+class CourseContentStore:
+    """
+    Loads course JSON files once and serves them as pre-serialised payloads.
+
+    File modification times are re-checked at most every check_interval
+    seconds. A changed file is parsed into a fresh entry that replaces the
+    old one in a single assignment, so readers never see a half-loaded file.
+    If the new contents fail to parse, the previous version keeps being served.
+    """
+
+    def __init__(self, directory: Path, names: Iterable[str] = COURSE_FILES,
+                 check_interval: float = 2.0):
+        """
+        Initialize the store and load all files
+
+        Args:
+            directory: Directory containing <name>.json files
+            names: Course file names (without .json)
+            check_interval: Minimum seconds between modification checks
+        """
+        self.directory = directory
+        self.names = tuple(names)
+        self.check_interval = check_interval
+        self._entries: Dict[str, _CourseEntry] = {}
+        self._next_check = 0.0
+        self._reload_lock = threading.Lock()
+        self.reloads = 0
+        self.refresh(force=True)
+
+    def _signature(self, path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load(self, name: str, signature: Optional[Tuple[int, int]]) -> _CourseEntry:
+        if signature is None:
+            return _CourseEntry(None, None, f"{name}.json not found")
+        try:
+            with open(self.directory / f"{name}.json", 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            previous = self._entries.get(name)
+            if previous is not None and previous.payload is not None:
+                # Keep serving the last good version (e.g. file mid-write)
+                return _CourseEntry(signature, previous.payload, str(e))
+            return _CourseEntry(signature, None, str(e))
+        return _CourseEntry(signature, JSONPayload(data))
+
+    def refresh(self, force: bool = False):
+        """
+        Reload any course file whose modification time or size changed
+
+        Args:
+            force: Check now even if check_interval has not elapsed
+        """
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return
+        # Only one request pays for the stat calls; others keep the current data
+        if not self._reload_lock.acquire(blocking=force):
+            return
+        try:
+            self._next_check = now + self.check_interval
+            for name in self.names:
+                signature = self._signature(self.directory / f"{name}.json")
+                current = self._entries.get(name)
+                if current is None or current.signature != signature:
+                    self._entries[name] = self._load(name, signature)
+                    if current is not None:
+                        self.reloads += 1
+        finally:
+            self._reload_lock.release()
+
+    def get(self, name: str) -> Optional[JSONPayload]:
+        """
+        Get the pre-serialised payload for a course file
+
+        Returns:
+            The payload, or None if the file is missing or has never parsed
+        """
+        self.refresh()
+        entry = self._entries.get(name)
+        return entry.payload if entry is not None else None
+
+    def get_error(self, name: str) -> Optional[str]:
+        """Get the last load error for a course file, if any"""
+        entry = self._entries.get(name)
+        return entry.error if entry is not None else None
+
+
+class ConceptGraphSync:
+    """
+    Keeps a concept mapper in step with the "concepts" section of a course file
+
+    sync() only compares the store's current payload with the one last
+    loaded. When it has changed, the new graph is built and validated on a
+    background thread and then swapped into the mapper, so requests keep
+    being answered from the previous graph meanwhile. Invalid definitions
+    are reported in get_stats() and the previous graph stays in place.
+    """
+
+    def __init__(self, store: CourseContentStore, mapper: ConceptDependencyMapper,
+                 name: str = "curriculum"):
+        """
+        Args:
+            store: Course content store to watch
+            mapper: Concept mapper to update
+            name: Course file holding the "concepts" list
+        """
+        self.store = store
+        self.mapper = mapper
+        self.name = name
+        self._source: Optional[JSONPayload] = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.loads = 0
+        self.error: Optional[str] = None
+
+    def sync(self, wait: bool = False):
+        """
+        Start loading the course file's concepts if they changed
+
+        Args:
+            wait: Block until the load has finished (used at startup)
+        """
+        payload = self.store.get(self.name)
+        if payload is None or payload is self._source:
+            return
+        with self._lock:
+            if payload is self._source:
+                return
+            self._source = payload
+        if wait:
+            self._load(payload)
+        else:
+            threading.Thread(target=self._load, args=(payload,), name="concept-graph-load", daemon=True).start()
+
+    def _load(self, payload: JSONPayload):
+        with self._load_lock:
+            if payload is not self._source:
+                # A newer version arrived while waiting; its own load applies it
+                return
+            data = payload.data
+            concepts = data.get("concepts") if isinstance(data, dict) else None
+            if concepts is None:
+                return
+            try:
+                self.mapper.load_concepts(concepts)
+            except ConceptGraphError as e:
+                self.error = str(e)
+                return
+            self.error = None
+            self.loads += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get concept graph statistics
+
+        Returns:
+            Dictionary with graph version, concept count, loads and last error
+        """
+        return {
+            "source": f"{self.name}.json",
+            "version": self.mapper.version,
+            "concepts": len(self.mapper.index.order),
+            "loads": self.loads,
+            "error": self.error
+        }
+
+
+def _course_directory() -> Path:
+    """Find frontend/src/course next to this file, falling back to the working directory"""
+    directory = Path(__file__).parent / 'frontend' / 'src' / 'course'
+    if not directory.exists():
+        directory = Path('frontend/src/course')
+    return directory
+
+
+# Global course content store, loaded at import (server startup)
+course_store = CourseContentStore(_course_directory())
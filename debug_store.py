@@ -0,0 +1,139 @@
+"""
+Paginated token payloads for /api/execute/debug
+
+Tokens are sent in a compact array encoding, one page at a time. Token lists
+longer than one page are kept in a small bounded store so clients can fetch
+the remaining pages by cursor.
+"""
+
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from lexer import Token, TokenType
+
+
+# Field order of each encoded token
+TOKEN_ENCODING = ["type_id", "line", "column", "value_index"]
+
+# Token type names indexed by type_id (TokenType values start at 1)
+TOKEN_TYPES = [None] + [t.name for t in TokenType]
+
+
+def encode_tokens(tokens: List[Token], start: int, limit: int) -> Dict[str, Any]:
+    """
+    Encode a page of tokens as [type_id, line, column, value_index] arrays
+
+    Token values are deduplicated into a per-page "values" table, and
+    value_index is -1 for tokens without a value.
+
+    Args:
+        tokens: Complete token list
+        start: Index of the first token in the page
+        limit: Maximum number of tokens in the page
+
+    Returns:
+        Dictionary with encoding, types, values, items and total
+    """
+    values: List[Any] = []
+    value_ids: Dict[Tuple[type, Any], int] = {}
+    items = []
+
+    for token in tokens[start:start + limit]:
+        if token.value is None:
+            value_index = -1
+        else:
+            # Key on type too so 1, 1.0 and True stay distinct
+            key = (type(token.value), token.value)
+            value_index = value_ids.get(key)
+            if value_index is None:
+                value_index = value_ids[key] = len(values)
+                values.append(token.value)
+        items.append([token.type.value, token.line, token.column, value_index])
+
+    return {
+        "encoding": TOKEN_ENCODING,
+        "types": TOKEN_TYPES,
+        "values": values,
+        "items": items,
+        "total": len(tokens)
+    }
+
+
+class DebugTokenStore:
+    """
+    Bounded LRU store of token lists awaiting page fetches, with expiry
+    """
+
+    def __init__(self, max_tokens: int = 2_000_000, ttl_seconds: float = 600.0):
+        """
+        Initialize the store
+
+        Args:
+            max_tokens: Total number of tokens kept across all entries
+            ttl_seconds: How long an entry stays fetchable
+        """
+        self.max_tokens = max_tokens
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, List[Token]]]" = OrderedDict()
+        self._token_count = 0
+        self._lock = threading.Lock()
+
+    def put(self, tokens: List[Token]) -> Optional[str]:
+        """
+        Keep a token list for later page fetches
+
+        Returns:
+            Debug id for fetching pages, or None if the list is too large to keep
+        """
+        if len(tokens) > self.max_tokens:
+            return None
+
+        debug_id = uuid.uuid4().hex
+        with self._lock:
+            self._entries[debug_id] = (time.monotonic() + self.ttl_seconds, tokens)
+            self._token_count += len(tokens)
+            while self._token_count > self.max_tokens:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._token_count -= len(evicted)
+        return debug_id
+
+    def get(self, debug_id: str) -> Optional[List[Token]]:
+        """Get a stored token list, or None if unknown or expired"""
+        with self._lock:
+            entry = self._entries.get(debug_id)
+            if entry is None:
+                return None
+            expires_at, tokens = entry
+            if expires_at < time.monotonic():
+                del self._entries[debug_id]
+                self._token_count -= len(tokens)
+                return None
+            self._entries.move_to_end(debug_id)
+            return tokens
+
+
+def token_page(tokens: List[Token], cursor: int, limit: int,
+               debug_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Build one page of the token payload, including the cursor for the next page
+
+    Args:
+        tokens: Complete token list
+        cursor: Index of the first token in the page
+        limit: Page size
+        debug_id: Id under which the tokens are stored, if they are
+
+    Returns:
+        Encoded page with debug_id and next_cursor added
+    """
+    page = encode_tokens(tokens, cursor, limit)
+    end = cursor + limit
+    page["debug_id"] = debug_id
+    page["next_cursor"] = str(end) if end < len(tokens) and debug_id is not None else None
+    return page
+
+
+# Global token store used by the debug endpoints
+debug_token_store = DebugTokenStore()
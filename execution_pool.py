@@ -0,0 +1,78 @@
+"""
+Execution pool for running Cubit programs off the event loop
+"""
+
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class ExecutionPool:
+    """
+    Bounded thread pool that runs interpreter work for the async API handlers
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        Initialize the execution pool
+
+        Args:
+            max_workers: Maximum number of programs executing at once
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="cubit-exec"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run func(*args) on the pool and await its result
+
+        Args:
+            func: Synchronous callable to execute
+            *args: Positional arguments for func
+
+        Returns:
+            Whatever func returns
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._queued += 1
+        return await loop.run_in_executor(self._executor, self._invoke, func, args)
+
+    def _invoke(self, func: Callable[..., Any], args: tuple) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted programs still waiting for a worker"""
+        return self._queued
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get a snapshot of pool utilisation"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "active": self._active,
+                "completed": self._completed
+            }
+
+
+# Global execution pool
+execution_pool = ExecutionPool(int(os.environ.get("CUBIT_EXECUTION_WORKERS", 4)))
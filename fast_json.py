@@ -0,0 +1,83 @@
+"""
+Fast JSON encoding for API responses
+Uses orjson when it is installed and falls back to the standard library
+"""
+
+import json
+import uuid
+from typing import Any, Dict, Iterator
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode values JSON doesn't know about as strings"""
+    return str(value)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialise obj to compact UTF-8 JSON
+
+    Args:
+        obj: JSON-compatible value
+
+    Returns:
+        Encoded bytes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which Cubit's pow() can produce
+            pass
+    return _stdlib_dumps(obj)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with fast_json.dumps, bypassing pydantic serialisation"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# Stands in for a large string field while the rest of the object is encoded
+_PLACEHOLDER = f"cubit-stream-{uuid.uuid4().hex}"
+
+
+def iter_json_object(data: Dict[str, Any], field: str, chunk_chars: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Encode a dict as JSON, emitting one large string field in chunks
+
+    The field's value is escaped chunk by chunk instead of being copied into
+    one big encoded document. The concatenated output is the same JSON that
+    dumps(data) produces.
+
+    Args:
+        data: Object to encode
+        field: Key of the string value to stream
+        chunk_chars: Characters of the string encoded per chunk
+
+    Yields:
+        Pieces of the encoded document
+    """
+    text = data[field]
+    encoded = dumps({**data, field: _PLACEHOLDER})
+    marker = dumps(_PLACEHOLDER)
+    prefix, suffix = encoded.split(marker, 1)
+
+    yield prefix + b'"'
+    for start in range(0, len(text), chunk_chars):
+        # Encode each slice as its own string literal and drop the quotes
+        yield dumps(text[start:start + chunk_chars])[1:-1]
+    yield b'"' + suffix
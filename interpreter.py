@@ -2,9 +2,12 @@
 Cubit Language Interpreter - Evaluates the Abstract Syntax Tree
 """
 
+import re
 import math
+import time
 import random
-from typing import Any, Dict, List, Callable
+import threading
+from typing import Any, Dict, List, Callable, Optional
 from parser import (
     ASTNode, NumberNode, StringNode, VariableNode, BinaryOpNode,
     AssignmentNode, PrintNode, BlockNode, IfNode, WhileNode, Parser,
@@ -12,11 +15,49 @@ from parser import (
 )
 
 
+# Built-ins whose results can differ between two runs of the same program
+NONDETERMINISTIC_BUILTINS = frozenset({'random', 'randint', 'choice', 'shuffle', 'input'})
+
+_NONDETERMINISTIC_CALL = re.compile(
+    r'\b(?:' + '|'.join(sorted(NONDETERMINISTIC_BUILTINS)) + r')\s*\('
+)
+
+
+# Statements executed by all interpreters in this process (see executed_steps)
+_steps_lock = threading.Lock()
+_steps_total = 0
+
+
+def executed_steps() -> int:
+    """Total number of statements executed by Interpreter.run in this process"""
+    return _steps_total
+
+
+def is_deterministic(source: str) -> bool:
+    """
+    Check whether a program always produces the same output
+
+    This is a conservative textual check: any call-like use of a
+    non-deterministic built-in (even inside a string) counts.
+
+    Args:
+        source: Cubit source code
+
+    Returns:
+        True if the program uses no non-deterministic built-ins
+    """
+    return _NONDETERMINISTIC_CALL.search(source) is None
+
+
 class Interpreter:
     def __init__(self):
         self.variables: Dict[str, Any] = {}
         self.output_produced = False
         self.builtin_functions = self._init_builtin_functions()
+        # Optional callback invoked with each statement before it runs
+        self.trace_hook: Optional[Callable[[ASTNode], None]] = None
+        # Number of statements executed by this interpreter
+        self.steps = 0
     
     def _init_builtin_functions(self) -> Dict[str, Callable]:
         """Initialize built-in functions for all modules"""
@@ -171,6 +212,9 @@ class Interpreter:
         elif isinstance(node, BlockNode):
             result = None
             for statement in node.statements:
+                self.steps += 1
+                if self.trace_hook is not None:
+                    self.trace_hook(statement)
                 result = self.evaluate(statement)
             return result
         
@@ -226,19 +270,109 @@ class Interpreter:
         else:
             raise Exception(f"Unknown node type: {type(node)}")
     
-    def run(self, source: str) -> Any:
-        from lexer import Lexer
+    def run(self, source: str, syntax_tree: Optional[ASTNode] = None) -> Any:
+        """
+        Run a Cubit program
         
+        Args:
+            source: Cubit source code
+            syntax_tree: Already parsed AST for source; skips lexing and parsing
+            
+        Returns:
+            Value of the last statement
+        """
         # Reset output flag
         self.output_produced = False
         
-        # Tokenize
-        lexer = Lexer(source)
-        tokens = lexer.tokenize()
+        if syntax_tree is None:
+            syntax_tree = parse_program(source)
+        
+        # Evaluate, adding the statements run to the process-wide count
+        global _steps_total
+        steps_before = self.steps
+        try:
+            return self.evaluate(syntax_tree)
+        finally:
+            with _steps_lock:
+                _steps_total += self.steps - steps_before
+
+
+class ProfilingInterpreter(Interpreter):
+    """
+    Interpreter that records how often each AST node is evaluated and for how long
+    
+    Times are inclusive of child nodes and measured with perf_counter_ns.
+    Statistics are keyed by node identity, so the profiled tree must stay
+    alive while they are read.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        # id(node) -> [node type name, evaluations, total nanoseconds]
+        self._node_stats: Dict[int, List[Any]] = {}
+    
+    def evaluate(self, node: ASTNode) -> Any:
+        start = time.perf_counter_ns()
+        try:
+            return super().evaluate(node)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            stats = self._node_stats.get(id(node))
+            if stats is None:
+                self._node_stats[id(node)] = [type(node).__name__, 1, elapsed]
+            else:
+                stats[1] += 1
+                stats[2] += elapsed
+    
+    def node_profile(self, node: ASTNode) -> Dict[str, Any]:
+        """
+        Get timing for a single node, for use with parser.dump_ast
+        
+        Returns:
+            {"calls": ..., "time_ms": ...}, or {} if the node never ran
+        """
+        stats = self._node_stats.get(id(node))
+        if stats is None:
+            return {}
+        return {"calls": stats[1], "time_ms": round(stats[2] / 1e6, 4)}
+    
+    def timings_by_type(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get evaluation counts and inclusive times aggregated per node type
         
-        # Parse
-        parser = Parser(tokens)
-        syntax_tree = parser.parse()
+        Returns:
+            Mapping of node type name to {"calls": ..., "time_ms": ...}
+        """
+        totals: Dict[str, List[int]] = {}
+        for type_name, calls, elapsed in self._node_stats.values():
+            entry = totals.setdefault(type_name, [0, 0])
+            entry[0] += calls
+            entry[1] += elapsed
+        return {
+            type_name: {"calls": calls, "time_ms": round(elapsed / 1e6, 4)}
+            for type_name, (calls, elapsed) in totals.items()
+        }
+
+
+def parse_program(source: str) -> ASTNode:
+    """
+    Tokenize and parse Cubit source code
+    
+    The resulting tree is never modified by the interpreter, so it can be
+    shared between runs of the same program.
+    
+    Args:
+        source: Cubit source code
         
-        # Evaluate
-        return self.evaluate(syntax_tree)
+    Returns:
+        Root BlockNode of the program
+    """
+    from lexer import Lexer
+    
+    # Tokenize
+    lexer = Lexer(source)
+    tokens = lexer.tokenize()
+    
+    # Parse
+    parser = Parser(tokens)
+    return parser.parse()
@@ -0,0 +1,166 @@
+"""
+Prometheus text exposition for the API's metrics
+
+Metric families are registered once, with their HELP/TYPE header and every
+series name (labels included) rendered ahead of time. A scrape only calls
+each family's collector and formats the numbers.
+"""
+
+import os
+import math
+from typing import Callable, Iterable, List, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# A collector yields values in the same order as the family's series
+Collector = Callable[[], Iterable[float]]
+
+
+def _labels(**labels: str) -> str:
+    """Render a label set, e.g. {module="lexer"}"""
+    if not labels:
+        return ""
+    rendered = []
+    for name, value in labels.items():
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        rendered.append(f'{name}="{value}"')
+    return "{" + ",".join(rendered) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class MetricFamily:
+    """
+    One metric name with pre-rendered series
+    """
+
+    __slots__ = ("name", "header", "series", "collect")
+
+    def __init__(self, name: str, kind: str, help_text: str, series: Sequence[str], collect: Collector):
+        """
+        Args:
+            name: Metric name
+            kind: counter, gauge or histogram
+            help_text: HELP line text
+            series: Series names, e.g. 'cubit_x_total{module="lexer"}'
+            collect: Returns one value per series, in order
+        """
+        self.name = name
+        self.header = f"# HELP {name} {help_text}\n# TYPE {name} {kind}\n"
+        self.series = [f"{s} " for s in series]
+        self.collect = collect
+
+    def render(self, out: List[str]):
+        """Append this family's lines to out"""
+        out.append(self.header)
+        for series, value in zip(self.series, self.collect()):
+            out.append(series)
+            out.append(_format_value(value))
+            out.append("\n")
+
+
+class MetricsRegistry:
+    """
+    Ordered collection of metric families rendered by /metrics
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self.families: List[MetricFamily] = []
+
+    def add(self, name: str, kind: str, help_text: str, collect: Collector,
+            label_name: str = None, label_values: Sequence[str] = ()) -> MetricFamily:
+        """
+        Register a counter or gauge
+
+        Args:
+            name: Metric name
+            kind: "counter" or "gauge"
+            help_text: Description
+            collect: Returns one value per label value (or a single value)
+            label_name: Label distinguishing the series, if any
+            label_values: Values of that label, in collector order
+
+        Returns:
+            The registered family
+        """
+        if label_name is None:
+            series = [name]
+        else:
+            series = [name + _labels(**{label_name: value}) for value in label_values]
+        family = MetricFamily(name, kind, help_text, series, collect)
+        self.families.append(family)
+        return family
+
+    def add_histogram(self, name: str, help_text: str, label_name: str, label_values: Sequence[str],
+                      bounds: Sequence[float], collect: Callable[[], Iterable[Tuple[List[int], float, int]]]):
+        """
+        Register a histogram
+
+        Args:
+            name: Metric name (without _bucket/_sum/_count)
+            help_text: Description
+            label_name: Label distinguishing the series
+            label_values: Values of that label, in collector order
+            bounds: Upper bounds of the cumulative buckets (without +Inf)
+            collect: Yields (cumulative bucket counts, sum, count) per label value
+
+        Returns:
+            The registered family
+        """
+        series = []
+        for value in label_values:
+            for bound in bounds:
+                series.append(name + "_bucket" + _labels(**{label_name: value, "le": repr(float(bound))}))
+            series.append(name + "_bucket" + _labels(**{label_name: value, "le": "+Inf"}))
+            series.append(name + "_sum" + _labels(**{label_name: value}))
+            series.append(name + "_count" + _labels(**{label_name: value}))
+
+        def flatten():
+            for buckets, total, count in collect():
+                yield from buckets
+                yield count
+                yield total
+                yield count
+
+        family = MetricFamily(name, "histogram", help_text, series, flatten)
+        self.families.append(family)
+        return family
+
+    def render(self) -> str:
+        """Render all families in text exposition format"""
+        out: List[str] = []
+        for family in self.families:
+            family.render(out)
+        return "".join(out)
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_rss_bytes() -> int:
+    """Resident set size of this process (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    return 0
@@ -1,61 +1,641 @@
 """
 Module metrics tracker for system monitoring
+
+Counters live in a fixed-layout int64 array. When CUBIT_METRICS_FILE is set
+the array is a memory-mapped file shared by all uvicorn workers: each worker
+process claims its own slot and only writes to that slot, and readers sum
+the slots of all workers.
+
+Latencies are recorded in log-scale histograms (four buckets per power of
+two microseconds, so percentiles are within ~19%). Besides the all-time
+histogram, each module keeps rings of histograms for fixed time periods,
+giving sliding 1 minute, 5 minute and 1 hour views in constant memory.
 """
 
+import os
+import math
+import atexit
+import mmap
 import time
-from typing import Dict, Any, Optional
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+# Layout limits of the shared counter array
+MAX_MODULES = 16
+MAX_WORKERS = 32
+
+# Per-module counters, in layout order
+REQUESTS, ERRORS, DURATION_NS, LAST_REQUEST_NS = range(4)
+COUNTER_FIELDS = 4
+
+# Latency histogram buckets: values below 4 us get their own bucket, then
+# four buckets per power of two up to 2**28 us (~4.5 min); slower requests
+# land in the last bucket
+HISTOGRAM_BUCKETS = 108
+
+# Sliding windows as (name, period seconds, periods kept)
+LATENCY_WINDOWS = (("1m", 10, 6), ("5m", 60, 5), ("1h", 300, 12))
+
+# Each histogram is [epoch, max_us, bucket counts...]; the first one is all-time
+_HISTOGRAM_WORDS = 2 + HISTOGRAM_BUCKETS
+_HISTOGRAMS = 1 + sum(periods for _, _, periods in LATENCY_WINDOWS)
+FIELDS = COUNTER_FIELDS + _HISTOGRAMS * _HISTOGRAM_WORDS
+
+_MAGIC = b"CUBITMT2"
+_HEADER = struct.Struct("<8sQQQ")
+_NAME_BYTES = 32
+
+
+def bucket_index(value_us: int) -> int:
+    """Histogram bucket for a latency in microseconds"""
+    if value_us < 4:
+        return max(value_us, 0)
+    exponent = value_us.bit_length() - 1
+    index = (exponent - 1) * 4 + (value_us >> (exponent - 2)) - 4
+    return min(index, HISTOGRAM_BUCKETS - 1)
+
+
+def bucket_upper_bound(index: int) -> int:
+    """Largest latency in microseconds that falls into a bucket"""
+    if index < 4:
+        return index
+    exponent = index // 4 + 1
+    return ((4 + index % 4 + 1) << (exponent - 2)) - 1
+
+
+def histogram_summary(counts: List[int], max_us: int,
+                      quantiles=(0.5, 0.9, 0.99)) -> Dict[str, Any]:
+    """
+    Summarise histogram bucket counts
+
+    Args:
+        counts: Count per bucket
+        max_us: Largest recorded value (caps the top percentile estimates)
+        quantiles: Quantiles to report
+
+    Returns:
+        Dictionary with count, p50/p90/p99 and max in milliseconds
+    """
+    total = sum(counts)
+    summary: Dict[str, Any] = {"count": total}
+    targets = [(q, max(1, math.ceil(q * total))) for q in quantiles]
+    seen = 0
+    index = 0
+    for q, target in targets:
+        key = f"p{round(q * 100):d}"
+        if total == 0:
+            summary[key] = None
+            continue
+        while seen + counts[index] < target:
+            seen += counts[index]
+            index += 1
+        summary[key] = round(min(bucket_upper_bound(index), max_us) / 1000, 3)
+    summary["max"] = round(max_us / 1000, 3) if total else None
+    return summary
+
+
+class SharedCounters:
+    """
+    Fixed-layout int64 counters, optionally shared between processes
+
+    Layout: a header, a table of module names, then one slot per worker
+    process holding its pid followed by MAX_MODULES x FIELDS counters.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_workers: int = MAX_WORKERS,
+                 max_modules: int = MAX_MODULES, fields: int = FIELDS):
+        """
+        Map the counter array
+
+        Args:
+            path: File to share between processes; None for private memory
+            max_workers: Number of worker slots in a shared file
+            max_modules: Number of module ids that can be registered
+            fields: Counters per module
+        """
+        self.path = path
+        self.max_workers = max_workers if path else 1
+        self.max_modules = max_modules
+        self.fields = fields
+        self.slot_words = 1 + max_modules * fields
+        self._names_offset = _HEADER.size
+        self._words_offset = self._names_offset + max_modules * _NAME_BYTES
+        size = self._words_offset + self.max_workers * self.slot_words * 8
+
+        self._fd = None
+        self._thread_lock = threading.Lock()
+        if path:
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            with self._locked():
+                header = os.pread(self._fd, _HEADER.size, 0)
+                expected = _HEADER.pack(_MAGIC, self.max_workers, max_modules, fields)
+                if header != expected or os.fstat(self._fd).st_size != size:
+                    # New file, or one written with another layout: start over
+                    os.ftruncate(self._fd, 0)
+                    os.ftruncate(self._fd, size)
+                    os.pwrite(self._fd, expected, 0)
+            self._mmap = mmap.mmap(self._fd, size)
+        else:
+            self._mmap = mmap.mmap(-1, size)
+
+        self.words = memoryview(self._mmap)[self._words_offset:].cast("q")
+        self._names: Dict[str, int] = {}
+        self._pid = 0
+        self._base = 0
+        self._claim_slot()
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive access for slot claims and name registration"""
+        with self._thread_lock:
+            if self._fd is not None and fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                yield
+
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True
+        return True
+
+    def _claim_slot(self):
+        """
+        Claim a worker slot for this process
+
+        A slot left by a dead worker is taken over with its counters intact,
+        so totals survive worker restarts. If every slot is taken, the last
+        one is shared and increments from its processes may race.
+        """
+        pid = os.getpid()
+        with self._locked():
+            chosen = self.max_workers - 1
+            for slot in range(self.max_workers):
+                owner = self.words[slot * self.slot_words]
+                if owner == pid or owner == 0 or not self._alive(owner):
+                    chosen = slot
+                    break
+            self._base = chosen * self.slot_words
+            self.words[self._base] = pid
+            self._pid = pid
+
+    def slot_base(self) -> int:
+        """Word offset of this process's slot, reclaiming one after a fork"""
+        if self._pid != os.getpid():
+            self._claim_slot()
+        return self._base
+
+    def _read_name(self, index: int) -> str:
+        offset = self._names_offset + index * _NAME_BYTES
+        return bytes(self._mmap[offset:offset + _NAME_BYTES]).rstrip(b"\0").decode("utf-8")
+
+    def find(self, name: str) -> Optional[int]:
+        """
+        Look up a registered module name
+
+        Returns:
+            The module's index, or None if no process has registered it
+        """
+        index = self._names.get(name)
+        if index is not None:
+            return index
+        for candidate in range(self.max_modules):
+            registered = self._read_name(candidate)
+            if not registered:
+                return None
+            if registered == name:
+                self._names[name] = candidate
+                return candidate
+        return None
+
+    def register(self, name: str) -> int:
+        """
+        Get the index for a module name, registering it if needed
+
+        Raises:
+            ValueError: If the name is too long or the module table is full
+        """
+        index = self.find(name)
+        if index is not None:
+            return index
+        encoded = name.encode("utf-8")
+        if len(encoded) > _NAME_BYTES:
+            raise ValueError(f"Module id too long: {name!r}")
+        with self._locked():
+            for candidate in range(self.max_modules):
+                registered = self._read_name(candidate)
+                if registered == name:
+                    break
+                if not registered:
+                    offset = self._names_offset + candidate * _NAME_BYTES
+                    self._mmap[offset:offset + _NAME_BYTES] = encoded.ljust(_NAME_BYTES, b"\0")
+                    break
+            else:
+                raise ValueError("Too many modules registered")
+        self._names[name] = candidate
+        return candidate
+
+    def offset(self, index: int, field: int) -> int:
+        """Word offset of a counter within a slot"""
+        return 1 + index * self.fields + field
+
+    def owned_slots(self) -> List[int]:
+        """Word offsets of all slots that have been claimed by a worker"""
+        return [
+            slot for slot in range(0, self.max_workers * self.slot_words, self.slot_words)
+            if self.words[slot]
+        ]
+
+    def total(self, index: int, field: int) -> int:
+        """Sum of a counter over all worker slots"""
+        offset = self.offset(index, field)
+        words = self.words
+        return sum(
+            words[slot + offset]
+            for slot in range(0, self.max_workers * self.slot_words, self.slot_words)
+            if words[slot]
+        )
+
+    def maximum(self, index: int, field: int) -> int:
+        """Largest value of a counter over all worker slots"""
+        offset = self.offset(index, field)
+        words = self.words
+        return max(
+            (words[slot + offset]
+             for slot in range(0, self.max_workers * self.slot_words, self.slot_words)
+             if words[slot]),
+            default=0
+        )
+
+    def live_workers(self) -> int:
+        """Number of slots owned by running processes"""
+        return sum(
+            1 for slot in range(0, self.max_workers * self.slot_words, self.slot_words)
+            if self.words[slot] and self._alive(self.words[slot])
+        )
+
+
+_EMPTY_HISTOGRAM = memoryview(bytes(_HISTOGRAM_WORDS * 8)).cast("q")
+
+
+# Per-thread shard layout for one module: counters, then all-time bucket counts
+_SHARD_REQUESTS, _SHARD_ERRORS, _SHARD_DURATION_NS, _SHARD_LAST_PERF_NS, _SHARD_MAX_US = range(5)
+_SHARD_BUCKETS = 5
+_SHARD_FIELDS = _SHARD_BUCKETS + HISTOGRAM_BUCKETS
+_LAST_BUCKET = _SHARD_BUCKETS + HISTOGRAM_BUCKETS - 1
+
+_perf_counter_ns = time.perf_counter_ns
+
+
+class _Shard:
+    """Counters written by a single thread, plus what has been published of them"""
+
+    __slots__ = ("thread", "modules", "published")
+
+    def __init__(self, thread: threading.Thread, max_modules: int):
+        self.thread = thread
+        self.modules = [[0] * _SHARD_FIELDS for _ in range(max_modules)]
+        self.published = [[0] * _SHARD_FIELDS for _ in range(max_modules)]
+
+
+class ModuleHandle:
+    """
+    Pre-registered recorder for one module
+
+    record() only touches the calling thread's own shard, so it takes no
+    locks and does no string formatting.
+    """
+
+    __slots__ = ("module_id", "index", "_local", "_metrics")
+
+    def __init__(self, metrics: "ModuleMetrics", module_id: str, index: int):
+        self.module_id = module_id
+        self.index = index
+        self._local = metrics._local
+        self._metrics = metrics
+
+    def record(self, duration_ns: int, success: bool = True):
+        """
+        Record one request
+
+        Args:
+            duration_ns: Request duration in nanoseconds (perf_counter_ns based)
+            success: Whether the request succeeded
+        """
+        try:
+            counters = self._local.modules[self.index]
+        except AttributeError:
+            counters = self._metrics._new_shard()[self.index]
+        # The bucket goes in before the request count, which is what makes
+        # publish() pick the shard up, so a snapshot never sees a request
+        # without its bucket
+        duration_us = duration_ns // 1000
+        if duration_us > counters[_SHARD_MAX_US]:
+            counters[_SHARD_MAX_US] = duration_us
+        if duration_us < 4:
+            counters[_SHARD_BUCKETS + duration_us] += 1
+        else:
+            # Same bucketing as bucket_index, inlined
+            exponent = duration_us.bit_length() - 1
+            bucket = _SHARD_BUCKETS + (exponent - 1) * 4 + (duration_us >> (exponent - 2)) - 4
+            counters[bucket if bucket < _LAST_BUCKET else _LAST_BUCKET] += 1
+
+        counters[_SHARD_DURATION_NS] += duration_ns
+        counters[_SHARD_LAST_PERF_NS] = _perf_counter_ns()
+        if not success:
+            counters[_SHARD_ERRORS] += 1
+        counters[_SHARD_REQUESTS] += 1
+
 
 class ModuleMetrics:
-    """Track metrics for system modules"""
-    
-    def __init__(self):
-        self.metrics: Dict[str, Dict[str, Any]] = {}
+    """
+    Track metrics for system modules
+
+    Requests are recorded into per-thread shards through ModuleHandle objects.
+    Shards are merged into the counter array (shared between workers when a
+    file is used) whenever metrics are read, and every publish_interval
+    seconds in the background so other workers and the sliding windows stay
+    current.
+    """
+
+    def __init__(self, shared_path: Optional[str] = None, publish_interval: float = 1.0):
+        """
+        Initialize the tracker
+
+        Args:
+            shared_path: File shared by all worker processes; None keeps
+                metrics private to this process
+            publish_interval: Seconds between background merges of thread shards
+        """
+        self.counters = SharedCounters(shared_path)
         self.start_time = time.time()
-    
+        self.publish_interval = publish_interval
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._handles: Dict[str, ModuleHandle] = {}
+        self._publisher: Optional[threading.Thread] = None
+        # Background publishes that raised; the publisher keeps running
+        self.publish_errors = 0
+        # Converts perf_counter_ns readings to wall-clock time at read time
+        self._wall_offset_ns = time.time_ns() - time.perf_counter_ns()
+        # Don't lose the last interval's requests when a worker exits
+        atexit.register(self.publish)
+
+    def handle(self, module_id: str) -> ModuleHandle:
+        """
+        Get the recorder for a module, registering the module if needed
+
+        Args:
+            module_id: Module identifier, e.g. "lexer"
+
+        Returns:
+            Handle whose record() method records requests for the module
+        """
+        handle = self._handles.get(module_id)
+        if handle is None:
+            handle = ModuleHandle(self, module_id, self.counters.register(module_id))
+            self._handles[module_id] = handle
+        return handle
+
     def record_request(self, module_id: str, duration_ms: float, success: bool):
         """Record a module request"""
-        if module_id not in self.metrics:
-            self.metrics[module_id] = {
-                "total_requests": 0,
-                "total_duration_ms": 0.0,
-                "errors": 0,
-                "last_request_time": None
-            }
+        self.handle(module_id).record(int(duration_ms * 1e6), success)
+
+    def _new_shard(self) -> List[List[int]]:
+        """Create the calling thread's shard"""
+        shard = _Shard(threading.current_thread(), self.counters.max_modules)
+        with self._lock:
+            self._shards.append(shard)
+            if self._publisher is None:
+                self._publisher = threading.Thread(
+                    target=self._publish_loop, name="metrics-publisher", daemon=True
+                )
+                self._publisher.start()
+        self._local.modules = shard.modules
+        return shard.modules
+
+    def _publish_loop(self):
+        while True:
+            time.sleep(self.publish_interval)
+            try:
+                self.publish()
+            except Exception:
+                self.publish_errors += 1
+
+    def publish(self):
+        """
+        Merge what threads recorded since the last publish into the counter array
+
+        Bucket counts added since the previous publish go into the current
+        period of each sliding window.
+        """
+        now_ns = time.time_ns()
+        with self._lock:
+            words = self.counters.words
+            slot = self.counters.slot_base()
+            live_shards = []
+            for shard in self._shards:
+                for index in range(self.counters.max_modules):
+                    current = shard.modules[index]
+                    published = shard.published[index]
+                    if current[_SHARD_REQUESTS] == published[_SHARD_REQUESTS]:
+                        continue
+                    # One list copy, so a concurrent record() lands in the next publish
+                    snapshot = current[:]
+                    self._apply(words, slot + self.counters.offset(index, 0), snapshot, published, now_ns)
+                    shard.published[index] = snapshot
+                if shard.thread.is_alive():
+                    live_shards.append(shard)
+            # A finished thread's shard is fully published above and can go
+            self._shards = live_shards
+
+    def _apply(self, words, base: int, snapshot: List[int], published: List[int], now_ns: int):
+        """Add one module's shard delta to this worker's slot; call with _lock held"""
+        words[base + REQUESTS] += snapshot[_SHARD_REQUESTS] - published[_SHARD_REQUESTS]
+        words[base + ERRORS] += snapshot[_SHARD_ERRORS] - published[_SHARD_ERRORS]
+        words[base + DURATION_NS] += snapshot[_SHARD_DURATION_NS] - published[_SHARD_DURATION_NS]
+        last_ns = snapshot[_SHARD_LAST_PERF_NS] + self._wall_offset_ns
+        if last_ns > words[base + LAST_REQUEST_NS]:
+            words[base + LAST_REQUEST_NS] = last_ns
+
+        deltas = [
+            (bucket, snapshot[_SHARD_BUCKETS + bucket] - published[_SHARD_BUCKETS + bucket])
+            for bucket in range(HISTOGRAM_BUCKETS)
+            if snapshot[_SHARD_BUCKETS + bucket] != published[_SHARD_BUCKETS + bucket]
+        ]
+        if not deltas:
+            # Request counted without a bucket (record() is lock-free); keep
+            # the histograms and their max as they are
+            return
+        # Largest value in this delta, as precisely as the histogram knows it
+        delta_max = min(bucket_upper_bound(deltas[-1][0]), snapshot[_SHARD_MAX_US])
+
+        for histogram, epoch in self._current_histograms(base, now_ns):
+            if words[histogram] != epoch:
+                # Entry holds an old period: reuse it for this one
+                words[histogram:histogram + _HISTOGRAM_WORDS] = _EMPTY_HISTOGRAM
+                words[histogram] = epoch
+            if delta_max > words[histogram + 1]:
+                words[histogram + 1] = delta_max
+            for bucket, count in deltas:
+                words[histogram + 2 + bucket] += count
+
+    @staticmethod
+    def _current_histograms(base: int, now_ns: int):
+        """(word offset, epoch) of the all-time histogram and each window's current entry"""
+        histogram = base + COUNTER_FIELDS
+        yield histogram, 0
+        histogram += _HISTOGRAM_WORDS
+        for _, period, periods in LATENCY_WINDOWS:
+            epoch = now_ns // (period * 1_000_000_000)
+            yield histogram + (epoch % periods) * _HISTOGRAM_WORDS, epoch
+            histogram += periods * _HISTOGRAM_WORDS
+
+    def get_totals(self, module_id: str, publish: bool = True) -> Tuple[int, int, int]:
+        """
+        Get raw counters for a module, summed over all workers
         
-        self.metrics[module_id]["total_requests"] += 1
-        self.metrics[module_id]["total_duration_ms"] += duration_ms
-        self.metrics[module_id]["last_request_time"] = datetime.now().isoformat()
+        Args:
+            module_id: Module identifier
+            publish: Merge this process's thread shards first; readers that
+                query many modules publish once up front and pass False
         
-        if not success:
-            self.metrics[module_id]["errors"] += 1
+        Returns:
+            (requests, errors, total duration in nanoseconds)
+        """
+        if publish:
+            self.publish()
+        index = self.counters.find(module_id)
+        if index is None:
+            return 0, 0, 0
+        return (
+            self.counters.total(index, REQUESTS),
+            self.counters.total(index, ERRORS),
+            self.counters.total(index, DURATION_NS)
+        )
+    
+    def get_histogram(self, module_id: str, publish: bool = True) -> List[int]:
+        """
+        Get the all-time latency bucket counts for a module, over all workers
+        
+        Args:
+            module_id: Module identifier
+            publish: Merge thread shards first (see get_totals)
+        
+        Returns:
+            Count per bucket (see bucket_upper_bound for the bucket limits)
+        """
+        if publish:
+            self.publish()
+        counts = [0] * HISTOGRAM_BUCKETS
+        index = self.counters.find(module_id)
+        if index is None:
+            return counts
+        words = self.counters.words
+        for slot in self.counters.owned_slots():
+            start = slot + self.counters.offset(index, COUNTER_FIELDS) + 2
+            for i, count in enumerate(words[start:start + HISTOGRAM_BUCKETS].tolist()):
+                if count:
+                    counts[i] += count
+        return counts
     
-    def get_metrics(self, module_id: str) -> Dict[str, Any]:
-        """Get metrics for a specific module"""
-        if module_id not in self.metrics:
+    def get_latency(self, module_id: str, publish: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Get latency percentiles for a module, over all workers
+        
+        Args:
+            module_id: Module identifier
+            publish: Merge thread shards first (see get_totals)
+        
+        Returns:
+            Summaries (count, p50, p90, p99, max in ms) keyed by window:
+            "1m", "5m", "1h" and "all"
+        """
+        if publish:
+            self.publish()
+        index = self.counters.find(module_id)
+        names = [name for name, _, _ in LATENCY_WINDOWS] + ["all"]
+        if index is None:
+            return {name: histogram_summary([0] * HISTOGRAM_BUCKETS, 0) for name in names}
+        
+        now_ns = time.time_ns()
+        words = self.counters.words
+        merged = {name: ([0] * HISTOGRAM_BUCKETS, [0]) for name in names}
+        
+        def add(name: str, histogram: int):
+            counts, max_us = merged[name]
+            buckets = words[histogram + 2:histogram + 2 + HISTOGRAM_BUCKETS].tolist()
+            for i, count in enumerate(buckets):
+                if count:
+                    counts[i] += count
+            max_us[0] = max(max_us[0], words[histogram + 1])
+        
+        for slot in self.counters.owned_slots():
+            histogram = slot + self.counters.offset(index, COUNTER_FIELDS)
+            add("all", histogram)
+            histogram += _HISTOGRAM_WORDS
+            for name, period, periods in LATENCY_WINDOWS:
+                current = now_ns // (period * 1_000_000_000)
+                for entry in range(periods):
+                    if 0 <= current - words[histogram] < periods:
+                        add(name, histogram)
+                    histogram += _HISTOGRAM_WORDS
+        
+        return {name: histogram_summary(counts, max_us[0]) for name, (counts, max_us) in merged.items()}
+
+    def get_metrics(self, module_id: str, publish: bool = True) -> Dict[str, Any]:
+        """Get metrics for a specific module, summed over all workers (see get_totals for publish)"""
+        if publish:
+            self.publish()
+        index = self.counters.find(module_id)
+        total_requests = self.counters.total(index, REQUESTS) if index is not None else 0
+        if total_requests == 0:
             return {
                 "total_requests": 0,
                 "avg_response_time_ms": 0.0,
                 "error_rate": 0.0,
-                "last_request_time": None
+                "last_request_time": None,
+                "latency_ms": self.get_latency(module_id, publish=False)
             }
-        
-        m = self.metrics[module_id]
-        avg_time = m["total_duration_ms"] / m["total_requests"] if m["total_requests"] > 0 else 0
-        error_rate = m["errors"] / m["total_requests"] if m["total_requests"] > 0 else 0
-        
+
+        avg_time = self.counters.total(index, DURATION_NS) / 1e6 / total_requests
+        error_rate = self.counters.total(index, ERRORS) / total_requests
+        last_request_ns = self.counters.maximum(index, LAST_REQUEST_NS)
+
         return {
-            "total_requests": m["total_requests"],
+            "total_requests": total_requests,
             "avg_response_time_ms": round(avg_time, 2),
             "error_rate": round(error_rate, 4),
-            "last_request_time": m["last_request_time"]
+            "last_request_time": datetime.fromtimestamp(last_request_ns / 1e9).isoformat(),
+            "latency_ms": self.get_latency(module_id, publish=False)
         }
-    
+
+    def get_worker_count(self) -> int:
+        """Get the number of worker processes reporting metrics"""
+        return self.counters.live_workers()
+
     def get_uptime(self) -> float:
         """Get system uptime in seconds"""
         return time.time() - self.start_time
 
 
-# Global metrics tracker
-metrics_tracker = ModuleMetrics()
+# Global metrics tracker, shared across workers when CUBIT_METRICS_FILE is set
+metrics_tracker = ModuleMetrics(os.environ.get("CUBIT_METRICS_FILE") or None)
@@ -0,0 +1,182 @@
+"""
+Thread-aware stdout capture for Cubit program execution
+Routes print() output to a per-thread buffer so programs can run concurrently,
+and streams it to async consumers while a program is still running
+"""
+
+import sys
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, TextIO, Tuple
+
+
+class _ThreadLocalStdout:
+    """
+    Stand-in for sys.stdout that sends writes to the current thread's target.
+
+    Threads without an active capture write to the stream that was installed
+    as sys.stdout before this proxy took over.
+    """
+
+    def __init__(self, fallback: TextIO):
+        self._fallback = fallback
+        self._local = threading.local()
+
+    def _target(self) -> TextIO:
+        return getattr(self._local, 'target', None) or self._fallback
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self._target(), name)
+
+
+_install_lock = threading.Lock()
+
+
+def _installed_proxy() -> _ThreadLocalStdout:
+    """Install the routing proxy as sys.stdout if something replaced it"""
+    stdout = sys.stdout
+    if isinstance(stdout, _ThreadLocalStdout):
+        return stdout
+    with _install_lock:
+        if not isinstance(sys.stdout, _ThreadLocalStdout):
+            sys.stdout = _ThreadLocalStdout(sys.stdout)
+        return sys.stdout
+
+
+@contextmanager
+def capture_stdout(target: TextIO) -> Iterator[TextIO]:
+    """
+    Redirect print() output of the current thread to target
+
+    Unlike contextlib.redirect_stdout this does not swap sys.stdout for the
+    whole process, so concurrent executions keep their output separate.
+
+    Args:
+        target: Writable text stream receiving the output
+    """
+    proxy = _installed_proxy()
+    previous = getattr(proxy._local, 'target', None)
+    proxy._local.target = target
+    try:
+        yield target
+    finally:
+        proxy._local.target = previous
+
+
+class OutputStreamClosed(Exception):
+    """
+    Raised in the executing thread once the stream consumer has gone away,
+    and in the consumer once a stalled stream has been given up
+    """
+
+
+# Queued in place of an event when the producer gives up on a stalled consumer
+_STALLED = object()
+
+
+class EventStream:
+    """
+    Bounded channel carrying events from an execution thread to an async consumer.
+
+    put() blocks the producing thread while max_pending events are waiting,
+    so a slow client throttles the interpreter instead of growing a buffer.
+    A consumer that takes no event for max_stall seconds is given up on, so
+    a client that stays connected but stops reading can't hold the thread.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int = 64,
+                 max_stall: Optional[float] = None):
+        """
+        Initialize the stream
+
+        Args:
+            loop: Event loop the consumer runs on
+            max_pending: Maximum number of events buffered for the consumer
+            max_stall: Seconds put() waits for a free slot before closing
+                the stream (None waits as long as the stream is open)
+        """
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._slots = threading.Semaphore(max_pending)
+        self._closed = threading.Event()
+        self._max_stall = max_stall
+
+    def put(self, kind: str, payload: Any):
+        """Send an event from the producing thread, waiting for a free slot"""
+        deadline = None if self._max_stall is None else time.monotonic() + self._max_stall
+        while not self._slots.acquire(timeout=0.1):
+            if self._closed.is_set():
+                raise OutputStreamClosed()
+            if deadline is not None and time.monotonic() >= deadline:
+                self._give_up()
+                raise OutputStreamClosed()
+        if self._closed.is_set():
+            self._slots.release()
+            raise OutputStreamClosed()
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, (kind, payload))
+        except RuntimeError:
+            # Event loop already closed
+            raise OutputStreamClosed()
+
+    def _give_up(self):
+        """Close the stream from the producer and wake the consumer"""
+        self._closed.set()
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, _STALLED)
+        except RuntimeError:
+            pass
+
+    async def get(self) -> Tuple[str, Any]:
+        """Receive the next event (raises OutputStreamClosed once given up)"""
+        event = await self._queue.get()
+        if event is _STALLED:
+            raise OutputStreamClosed()
+        self._slots.release()
+        return event
+
+    def get_nowait(self) -> Tuple[str, Any]:
+        """Receive the next event if one is ready (raises asyncio.QueueEmpty)"""
+        event = self._queue.get_nowait()
+        if event is _STALLED:
+            # Nothing follows it; leave it for get() to report
+            self._queue.put_nowait(event)
+            raise asyncio.QueueEmpty()
+        self._slots.release()
+        return event
+
+    def close(self):
+        """Stop the producer at its next put()"""
+        self._closed.set()
+
+
+class StreamWriter:
+    """
+    Text stream that forwards each completed line of output to an EventStream
+    """
+
+    def __init__(self, stream: EventStream):
+        self._stream = stream
+        self._pending: List[str] = []
+        self.chars_written = 0
+
+    def write(self, text: str) -> int:
+        self.chars_written += len(text)
+        self._pending.append(text)
+        if '\n' in text:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self._pending:
+            text = ''.join(self._pending)
+            self._pending = []
+            self._stream.put('output', text)
@@ -2,8 +2,8 @@
 Cubit Language Parser - Builds an Abstract Syntax Tree from tokens
 """
 
-from typing import List, Optional
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, fields
 from lexer import Token, TokenType
 
 
@@ -81,6 +81,48 @@ class IndexNode(ASTNode):
     index: ASTNode
 
 
+def dump_ast(node: Any, annotate: Optional[Callable[[ASTNode], Dict[str, Any]]] = None,
+             max_nodes: Optional[int] = None) -> Any:
+    """
+    Convert an AST into plain JSON-compatible data
+    
+    Args:
+        node: AST node (or list of nodes / literal field value) to convert
+        annotate: Optional callback returning extra fields for each node
+        max_nodes: Stop expanding after this many nodes. A later node held in
+            a field is emitted as {"type": ..., "truncated": True}; the rest
+            of a list of nodes is replaced by one {"truncated": True,
+            "omitted": n} marker
+        
+    Returns:
+        Nested dicts of the form {"type": "PrintNode", "expression": {...}}
+    """
+    remaining = [max_nodes if max_nodes is not None else -1]
+    
+    def convert(value: Any) -> Any:
+        if isinstance(value, ASTNode):
+            if remaining[0] == 0:
+                return {"type": type(value).__name__, "truncated": True}
+            remaining[0] -= 1
+            data = {"type": type(value).__name__}
+            for field in fields(value):
+                data[field.name] = convert(getattr(value, field.name))
+            if annotate is not None:
+                data.update(annotate(value))
+            return data
+        if isinstance(value, list):
+            items = []
+            for position, item in enumerate(value):
+                if remaining[0] == 0 and isinstance(item, ASTNode):
+                    items.append({"truncated": True, "omitted": len(value) - position})
+                    break
+                items.append(convert(item))
+            return items
+        return value
+    
+    return convert(node)
+
+
 class Parser:
     def __init__(self, tokens: List[Token]):
         self.tokens = tokens
@@ -6,18 +6,20 @@ Transforms Cubit into a teaching-focused programming environment
 __version__ = "0.1.0"
 __author__ = "RITA 3 Team"
 
-from .api import PedagogicalAPI
+from .api import PedagogicalAPI, shared_components
 from .learning_engine import AdaptiveLearningEngine
 from .concept_mapper import ConceptDependencyMapper
 from .skill_inference import SkillInferenceEngine
 from .context_analyzer import ContextAnalyzer
-from .insight_delivery import InsightDelivery
+from .insight_delivery import Insight, InsightDelivery
 
 __all__ = [
     'PedagogicalAPI',
+    'shared_components',
     'AdaptiveLearningEngine',
     'ConceptDependencyMapper',
     'SkillInferenceEngine',
     'ContextAnalyzer',
     'InsightDelivery',
+    'Insight',
 ]
@@ -2,13 +2,47 @@
 Main Pedagogical API - Orchestrates all components
 """
 
+import time
 import inspect
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
 from .learning_engine import AdaptiveLearningEngine
 from .concept_mapper import ConceptDependencyMapper
-from .skill_inference import SkillInferenceEngine
-from .context_analyzer import ContextAnalyzer
-from .insight_delivery import InsightDelivery
+from .skill_inference import SkillInferenceEngine, SkillStatistics
+from .context_analyzer import ContextAnalyzer, LazyContext
+from .insight_delivery import Insight, InsightDelivery
+from .call_history import CallHistory, CallRecord
+
+
+_MISSING = object()
+
+
+class SharedComponents(NamedTuple):
+    """Components holding no per-learner state, safe to share between instances"""
+    learning_engine: AdaptiveLearningEngine
+    concept_mapper: ConceptDependencyMapper
+    skill_inference: SkillInferenceEngine
+    context_analyzer: ContextAnalyzer
+
+
+@lru_cache(maxsize=None)
+def shared_components() -> SharedComponents:
+    """
+    Get the process-wide pedagogical components
+    
+    The concept graph, concept library, strategy and indicator tables are
+    built on first use and then reused by every PedagogicalAPI, so creating
+    one per request does not rebuild them. Treat them as read-only.
+    
+    Returns:
+        The shared components
+    """
+    return SharedComponents(
+        learning_engine=AdaptiveLearningEngine(),
+        concept_mapper=ConceptDependencyMapper(),
+        skill_inference=SkillInferenceEngine(),
+        context_analyzer=ContextAnalyzer()
+    )
 
 
 class PedagogicalAPI:
@@ -16,7 +50,8 @@ class PedagogicalAPI:
     Main API that wraps existing APIs and adds pedagogical features
     """
     
-    def __init__(self, wrapped_api: Any, max_history: int = 1000, default_verbosity: str = 'normal'):
+    def __init__(self, wrapped_api: Any, max_history: int = 1000, default_verbosity: str = 'normal',
+                 share_components: bool = True, structured_insights: bool = False):
         """
         Initialize the Pedagogical API
         
@@ -24,20 +59,39 @@ class PedagogicalAPI:
             wrapped_api: The API to wrap with pedagogical features
             max_history: Maximum number of calls to keep in history
             default_verbosity: Default verbosity level
+            share_components: Use the process-wide stateless components
+                (see shared_components()); pass False to get private copies,
+                e.g. to customise or instrument them
+            structured_insights: Keep insights as Insight objects (see
+                last_insight) instead of printing them after every call
         """
         self.wrapped_api = wrapped_api
         self.max_history = max_history
         
-        # Initialize all components
-        self.learning_engine = AdaptiveLearningEngine()
-        self.concept_mapper = ConceptDependencyMapper()
-        self.skill_inference = SkillInferenceEngine()
-        self.context_analyzer = ContextAnalyzer()
-        self.insight_delivery = InsightDelivery(verbosity=default_verbosity)
+        # Initialize all components; only insight delivery (verbosity) and the
+        # history below are per-learner
+        components = shared_components() if share_components else SharedComponents(
+            AdaptiveLearningEngine(), ConceptDependencyMapper(), SkillInferenceEngine(), ContextAnalyzer()
+        )
+        self.learning_engine, self.concept_mapper, self.skill_inference, self.context_analyzer = components
+        self.insight_delivery = InsightDelivery(verbosity=default_verbosity, echo=not structured_insights)
+        self.last_insight: Optional[Insight] = None
         
-        # Call history for tracking learning progress
-        self._call_history: List[Dict[str, Any]] = []
+        # Call history for tracking learning progress (a ring buffer of max_history records)
+        self._call_history = CallHistory(max_history)
         self._user_profile: Dict[str, Any] = {}
+        
+        # Running statistics over the history, so skill inference never rescans it
+        self._skill_stats = SkillStatistics(max_history)
+        
+        # Derived summaries (skill level, progress, ...) memoised until the
+        # history changes; _history_version is bumped on every change
+        self._history_version = 0
+        self._memo: Dict[str, Any] = {}
+        self._memo_version = 0
+        
+        # Optional callback receiving each new call record (e.g. for persistence)
+        self.on_record: Optional[Callable[[CallRecord], None]] = None
     
     def call(self, method_name: str, *args, **kwargs) -> Any:
         """
@@ -51,32 +105,37 @@ class PedagogicalAPI:
         Returns:
             Result from the wrapped API method
         """
-        # 1. Get calling context
+        # 1. Get calling context (analysed lazily, only if something reads it)
         context = self.context_analyzer.analyze(inspect.currentframe())
         
-        # 2. Execute the actual method
-        if not hasattr(self.wrapped_api, method_name):
-            raise AttributeError(f"Wrapped API has no method '{method_name}'")
-        
-        method = getattr(self.wrapped_api, method_name)
-        result = method(*args, **kwargs)
-        
-        # 3. Record the call in history
-        self._record_call(method_name, args, kwargs, result, context)
-        
-        # 4. Infer user skill level
-        skill_level = self._infer_skill_level()
-        
-        # 5. Identify teaching opportunity
-        teaching_moment = self.learning_engine.identify_teaching_opportunity(
-            method=method_name,
-            context=context,
-            user_skill_level=skill_level,
-            call_history=self._call_history
-        )
-        
-        # 6. Deliver the teaching moment
-        self.insight_delivery.deliver(teaching_moment, result)
+        try:
+            # 2. Execute the actual method
+            if not hasattr(self.wrapped_api, method_name):
+                raise AttributeError(f"Wrapped API has no method '{method_name}'")
+            
+            method = getattr(self.wrapped_api, method_name)
+            result = method(*args, **kwargs)
+            
+            # 3. Record the call in history
+            self._record_call(method_name, args, kwargs, result, context)
+            
+            # 4. Infer user skill level
+            skill_level = self._infer_skill_level()
+            
+            # 5. Identify teaching opportunity
+            teaching_moment = self.learning_engine.identify_teaching_opportunity(
+                method=method_name,
+                context=context,
+                user_skill_level=skill_level,
+                call_history=self._call_history
+            )
+            
+            # 6. Deliver the teaching moment
+            self.last_insight = self.insight_delivery.deliver(teaching_moment, result)
+        finally:
+            # Don't keep the caller's frame alive from the history
+            if isinstance(context, LazyContext):
+                context.release()
         
         # 7. Return the result
         return result
@@ -90,32 +149,46 @@ class PedagogicalAPI:
         context: Dict[str, Any]
     ):
         """Record a method call in history"""
-        call_record = {
-            'method': method,
-            'args_count': len(args),
-            'kwargs_count': len(kwargs),
-            'result_type': type(result).__name__,
-            'context': context,
-            'timestamp': self._get_timestamp()
-        }
-        
-        self._call_history.append(call_record)
-        
-        # Limit history size
-        if len(self._call_history) > self.max_history:
-            self._call_history = self._call_history[-self.max_history:]
-    
-    def _get_timestamp(self) -> str:
-        """Get current timestamp"""
-        from datetime import datetime
-        return datetime.now().isoformat()
+        call_record = CallRecord(
+            method,
+            len(args),
+            len(kwargs),
+            type(result).__name__,
+            context,
+            time.time()
+        )
+        
+        # At max_history the oldest record is overwritten and handed back
+        evicted = self._call_history.append(call_record)
+        self._skill_stats.record(call_record.method)
+        if evicted is not None:
+            self._skill_stats.forget(evicted.method)
+        self._history_version += 1
+        
+        if self.on_record is not None:
+            self.on_record(call_record)
+    
+    @property
+    def history_version(self) -> int:
+        """Counter bumped whenever the call history changes"""
+        return self._history_version
+    
+    def _memoised(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Value of compute(), cached until the history next changes"""
+        if self._memo_version != self._history_version:
+            self._memo = {}
+            self._memo_version = self._history_version
+        value = self._memo.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._memo[key] = compute()
+        return value
     
     def _infer_skill_level(self) -> str:
         """Infer the current skill level of the user"""
-        return self.skill_inference.infer_level(
-            self._call_history,
+        return self._memoised('skill_level', lambda: self.skill_inference.infer_from_statistics(
+            self._skill_stats,
             self._user_profile
-        )
+        ))
     
     def get_learning_progress(self) -> Dict[str, Any]:
         """
@@ -124,7 +197,9 @@ class PedagogicalAPI:
         Returns:
             Dictionary containing progress information
         """
-        return self.learning_engine.get_progress(self._call_history)
+        progress = self._memoised('progress', lambda: self.learning_engine.get_progress(self._call_history))
+        # Copy the nested lists too; they are the memoised objects themselves
+        return {key: list(value) if isinstance(value, list) else value for key, value in progress.items()}
     
     def set_verbosity(self, level: str):
         """
@@ -142,7 +217,10 @@ class PedagogicalAPI:
         Returns:
             List of skill snapshots
         """
-        return self.skill_inference.get_skill_progression(self._call_history)
+        trajectory = self._memoised(
+            'trajectory', lambda: self.skill_inference.get_skill_progression(self._call_history)
+        )
+        return [dict(snapshot) for snapshot in trajectory]
     
     def get_concept_path(self, target_concept: str) -> List[Dict[str, Any]]:
         """
@@ -168,11 +246,24 @@ class PedagogicalAPI:
         """
         if mastered is None:
             # Infer from call history
-            progress = self.get_learning_progress()
-            mastered = progress.get('mastered_concepts', [])
+            # The concept graph can be reloaded, so its version is part of the key
+            key = f'suggestions:{self.concept_mapper.version}'
+            suggestions = self._memoised(key, lambda: self.concept_mapper.suggest_next_concepts(
+                self.get_learning_progress().get('mastered_concepts', [])
+            ))
+            return list(suggestions)
         
         return self.concept_mapper.suggest_next_concepts(mastered)
     
+    def get_methods_used(self) -> List[str]:
+        """
+        Get the distinct methods in the call history
+        
+        Returns:
+            Sorted method names, from the running per-method counts
+        """
+        return sorted(self._skill_stats.method_counts)
+    
     def get_skill_level(self) -> str:
         """
         Get the current inferred skill level
@@ -197,16 +288,18 @@ class PedagogicalAPI:
     
     def reset_history(self):
         """Reset the call history"""
-        self._call_history = []
+        self._call_history.clear()
+        self._skill_stats = SkillStatistics(self.max_history)
+        self._history_version += 1
     
     def export_history(self) -> List[Dict[str, Any]]:
         """
         Export call history
         
         Returns:
-            Complete call history
+            Complete call history, as dicts
         """
-        return self._call_history.copy()
+        return self._call_history.to_list()
     
     def import_history(self, history: List[Dict[str, Any]]):
         """
@@ -215,7 +308,11 @@ class PedagogicalAPI:
         Args:
             history: Call history to import
         """
-        self._call_history = history[-self.max_history:]
+        self._call_history = CallHistory.from_records(history, self.max_history)
+        self._skill_stats = SkillStatistics.from_methods(
+            (call.method for call in self._call_history), self.max_history
+        )
+        self._history_version += 1
     
     def __getattr__(self, name: str) -> Any:
         """
@@ -0,0 +1,184 @@
+"""
+Fixed-capacity call history for the Pedagogical API
+"""
+
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+
+class CallRecord:
+    """
+    One recorded method call
+
+    Records are slotted and keep the calling context by reference (a released
+    LazyContext holds only a code object and line number), so a learner's
+    history stays small. Method names are interned, since the same few names
+    repeat throughout a history. The timestamp is stored as a number and only
+    formatted when read. Records can also be read like the dicts they replace:
+    record['method'], record.get('context').
+    """
+
+    __slots__ = ('method', 'args_count', 'kwargs_count', 'result_type', 'context', '_timestamp')
+
+    FIELDS = ('method', 'args_count', 'kwargs_count', 'result_type', 'context', 'timestamp')
+
+    def __init__(self, method: str, args_count: int = 0, kwargs_count: int = 0,
+                 result_type: str = '', context: Any = None,
+                 timestamp: Union[float, str, None] = None):
+        """
+        Args:
+            method: Name of the called method
+            args_count: Number of positional arguments
+            kwargs_count: Number of keyword arguments
+            result_type: Type name of the returned value
+            context: Calling context (LazyContext, dict, or None when elided)
+            timestamp: POSIX time or ISO 8601 string of the call
+        """
+        self.method = sys.intern(method)
+        self.args_count = args_count
+        self.kwargs_count = kwargs_count
+        self.result_type = sys.intern(result_type)
+        self.context = context
+        self._timestamp = timestamp
+
+    @property
+    def timestamp(self) -> Optional[str]:
+        """ISO 8601 timestamp of the call"""
+        value = self._timestamp
+        if isinstance(value, float):
+            value = self._timestamp = datetime.fromtimestamp(value).isoformat()
+        return value
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CallRecord':
+        """Build a record from its dict form (as produced by to_dict)"""
+        return cls(
+            data.get('method', 'unknown'),
+            data.get('args_count', 0),
+            data.get('kwargs_count', 0),
+            data.get('result_type', ''),
+            data.get('context'),
+            data.get('timestamp')
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict form of the record"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style read of a field"""
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def keys(self):
+        """Field names, for dict-style use"""
+        return self.FIELDS
+
+    def __repr__(self) -> str:
+        return f"CallRecord({self.method!r}, timestamp={self.timestamp!r})"
+
+
+class CallHistory:
+    """
+    Ring buffer of the most recent call records
+
+    Appending is O(1) at any size: the buffer grows until it holds capacity
+    records, after which the oldest record is overwritten in place (and handed
+    back to the caller) instead of the whole history being copied.
+    """
+
+    __slots__ = ('capacity', '_records', '_start', '_size')
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Args:
+            capacity: Maximum number of records kept
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._records: List[CallRecord] = []
+        self._start = 0
+        self._size = 0
+
+    @classmethod
+    def from_records(cls, records: Iterable[Union[CallRecord, Dict[str, Any]]],
+                     capacity: int = 1000) -> 'CallHistory':
+        """
+        Build a history from records or their dict forms, keeping the newest
+
+        Args:
+            records: Records, oldest first
+            capacity: Maximum number of records kept
+        """
+        history = cls(capacity)
+        for record in list(records)[-capacity:]:
+            if not isinstance(record, CallRecord):
+                record = CallRecord.from_dict(record)
+            history.append(record)
+        return history
+
+    def append(self, record: CallRecord) -> Optional[CallRecord]:
+        """
+        Add a record as the newest entry
+
+        Args:
+            record: Record to add
+
+        Returns:
+            The record evicted to make room, or None if there was space
+        """
+        if self._size < self.capacity:
+            # Not full yet, so _start is still 0
+            self._records.append(record)
+            self._size += 1
+            return None
+        evicted = self._records[self._start]
+        self._records[self._start] = record
+        self._start = (self._start + 1) % self.capacity
+        return evicted
+
+    def clear(self):
+        """Remove all records"""
+        self._records = []
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[CallRecord]:
+        records, start, capacity = self._records, self._start, self.capacity
+        for i in range(self._size):
+            yield records[(start + i) % capacity]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[CallRecord, List[CallRecord]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("call history index out of range")
+        return self._records[(self._start + index) % self.capacity]
+
+    def records(self) -> List[CallRecord]:
+        """
+        Copy of the records, oldest first
+
+        The buffer is copied in one slice, so this is safe to call while
+        another thread appends (it may just miss the newest record).
+        """
+        start, size = self._start, self._size
+        records = self._records[:]
+        if size < self.capacity:
+            return records[:size]
+        return records[start:] + records[:start]
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Records as dicts, oldest first"""
+        return [record.to_dict() for record in self.records()]
@@ -2,25 +2,481 @@
 Concept Dependency Mapper for understanding relationships between concepts
 """
 
-from typing import Dict, List, Set, Optional, Tuple
+import os
+import json
+import zlib
+import heapq
+import threading
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Set, Optional, Tuple
 from collections import defaultdict
+from itertools import chain, repeat
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+DIFFICULTY_ORDER = {'beginner': 0, 'intermediate': 1, 'advanced': 2, 'expert': 3}
+
+# Metadata fields copied from concept definitions
+METADATA_FIELDS = ('difficulty', 'category', 'description')
+
+# Compact binary snapshot: magic followed by zlib-compressed JSON
+SNAPSHOT_MAGIC = b"CUBITCG1"
+
+# Batches of at least this many learners use NumPy (when installed)
+NUMPY_BATCH_MIN = 64
+
+# Upper bound on the boolean cells one NumPy block works on
+_NUMPY_BLOCK_CELLS = 8_000_000
+
+
+class ConceptGraphError(ValueError):
+    """Raised when concept definitions are invalid or the graph has a cycle"""
+
+
+def parse_concepts(entries: Iterable[Dict[str, Any]]) -> Tuple[Dict[str, List[str]], Dict[str, Dict]]:
+    """
+    Turn concept definitions into a prerequisite graph and metadata
+    
+    Each definition looks like {"name": "classes", "prerequisites": ["functions"],
+    "difficulty": "intermediate", "category": "oop", "description": "..."};
+    only name is required.
+    
+    Args:
+        entries: Concept definitions, e.g. the "concepts" list of curriculum.json
+        
+    Returns:
+        (graph, metadata), where graph only has concepts with prerequisites
+        
+    Raises:
+        ConceptGraphError: On malformed or duplicate definitions, or
+            prerequisites naming undefined concepts
+    """
+    graph: Dict[str, List[str]] = {}
+    metadata: Dict[str, Dict] = {}
+    names: Set[str] = set()
+    for entry in entries:
+        name = entry.get('name') if isinstance(entry, dict) else None
+        if not isinstance(name, str) or not name:
+            raise ConceptGraphError(f"Concept definition without a name: {entry!r}")
+        if name in names:
+            raise ConceptGraphError(f"Concept '{name}' is defined twice")
+        names.add(name)
+        prerequisites = entry.get('prerequisites', [])
+        if not isinstance(prerequisites, list) or not all(isinstance(p, str) for p in prerequisites):
+            raise ConceptGraphError(f"Prerequisites of '{name}' must be a list of names")
+        if prerequisites:
+            graph[name] = prerequisites
+        fields = {field: entry[field] for field in METADATA_FIELDS if field in entry}
+        if fields:
+            metadata[name] = fields
+    
+    for name, prerequisites in graph.items():
+        for prereq in prerequisites:
+            if prereq not in names:
+                raise ConceptGraphError(f"Concept '{name}' requires undefined concept '{prereq}'")
+    return graph, metadata
+
+
+class ConceptIndex:
+    """
+    Immutable concept graph with precomputed lookup indexes
+    
+    Built once from a prerequisite graph and concept metadata:
+    
+    - order: every concept in topological (learning) order, found with Kahn's
+      algorithm; among concepts that are ready at the same time, easier ones
+      come first. Each concept's id is its position in this order.
+    - dependents: reverse adjacency (concept -> concepts that require it)
+    - closures: bitset of all transitive prerequisites per concept (bit i is
+      the concept with id i), so "all prerequisites in learning order" is a
+      walk over set bits
+    - siblings: concepts grouped by their exact prerequisite set
+    - candidates: concepts that can be suggested (those in the graph), in
+      graph order, with their positions for the dependents-driven search
+    """
+    
+    __slots__ = ('graph', 'metadata', 'order', 'ids', 'dependents', 'closures', 'siblings',
+                 'candidates', '_positions', '_unconditional', '_arrays')
+    
+    def __init__(self, graph: Dict[str, Iterable[str]], metadata: Dict[str, Dict],
+                 order: Optional[List[str]] = None):
+        """
+        Args:
+            graph: Concept -> prerequisite concepts
+            metadata: Concept -> metadata (difficulty, category, description)
+            order: A known learning order (e.g. from a snapshot); it is
+                checked rather than recomputed
+            
+        Raises:
+            ConceptGraphError: If the prerequisites form a cycle, or order
+                is not a valid topological order of the graph
+        """
+        self.graph: Dict[str, FrozenSet[str]] = {
+            concept: frozenset(prereqs) for concept, prereqs in graph.items()
+        }
+        self.metadata = metadata
+        if order is None:
+            self.order = self._topological_order()
+            self.ids = {concept: i for i, concept in enumerate(self.order)}
+        else:
+            self.order = list(order)
+            self.ids = {concept: i for i, concept in enumerate(self.order)}
+            self._check_order()
+        
+        dependents: Dict[str, Set[str]] = {concept: set() for concept in self.order}
+        for concept, prereqs in self.graph.items():
+            for prereq in prereqs:
+                dependents[prereq].add(concept)
+        self.dependents = {concept: frozenset(deps) for concept, deps in dependents.items()}
+        
+        # Prerequisites precede their dependents in self.order
+        ids = self.ids
+        closures: Dict[str, int] = {}
+        for concept in self.order:
+            mask = 0
+            for prereq in self.graph.get(concept, ()):
+                mask |= closures[prereq] | (1 << ids[prereq])
+            closures[concept] = mask
+        self.closures = closures
+        
+        groups: Dict[FrozenSet[str], List[str]] = defaultdict(list)
+        for concept, prereqs in self.graph.items():
+            groups[prereqs].append(concept)
+        self.siblings = {prereqs: tuple(concepts) for prereqs, concepts in groups.items()}
+        
+        self.candidates: Tuple[str, ...] = tuple(self.graph)
+        self._positions = {concept: i for i, concept in enumerate(self.candidates)}
+        # Candidates suggested even when nothing is mastered
+        self._unconditional = tuple(concept for concept in self.candidates if not self.graph[concept])
+        self._arrays = None
+    
+    def _difficulty_rank(self, concept: str) -> int:
+        return DIFFICULTY_ORDER.get(self.metadata.get(concept, {}).get('difficulty', 'intermediate'), 1)
+    
+    def _topological_order(self) -> List[str]:
+        """Kahn's algorithm over every concept named in the graph or metadata"""
+        concepts = set(self.metadata)
+        concepts.update(self.graph)
+        for prereqs in self.graph.values():
+            concepts.update(prereqs)
+        
+        remaining = {concept: len(self.graph.get(concept, ())) for concept in concepts}
+        unlocks: Dict[str, List[str]] = defaultdict(list)
+        for concept, prereqs in self.graph.items():
+            for prereq in prereqs:
+                unlocks[prereq].append(concept)
+        
+        ready = [(self._difficulty_rank(c), c) for c, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, concept = heapq.heappop(ready)
+            order.append(concept)
+            for dependent in unlocks.get(concept, ()):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    heapq.heappush(ready, (self._difficulty_rank(dependent), dependent))
+        
+        if len(order) != len(concepts):
+            cyclic = sorted(c for c, count in remaining.items() if count > 0)
+            raise ConceptGraphError(f"Concept graph has a cycle through: {', '.join(cyclic[:10])}")
+        return order
+    
+    def _check_order(self):
+        """Verify a supplied order lists every concept once, prerequisites first"""
+        ids = self.ids
+        if len(ids) != len(self.order):
+            raise ConceptGraphError("Concept order lists a concept twice")
+        for concept, prereqs in self.graph.items():
+            position = ids.get(concept)
+            if position is None:
+                raise ConceptGraphError(f"Concept order is missing '{concept}'")
+            for prereq in prereqs:
+                if ids.get(prereq, position) >= position:
+                    raise ConceptGraphError(f"Concept order puts '{concept}' before its prerequisite '{prereq}'")
+        for concept in self.metadata:
+            if concept not in ids:
+                raise ConceptGraphError(f"Concept order is missing '{concept}'")
+    
+    def to_snapshot(self) -> bytes:
+        """
+        Encode the graph as a compact binary snapshot
+        
+        Concepts are stored in learning order and prerequisites as positions
+        in that order, so loading skips the topological sort.
+        
+        Returns:
+            Snapshot bytes (see SNAPSHOT_MAGIC)
+        """
+        ids = self.ids
+        document = {
+            'concepts': self.order,
+            'prerequisites': [sorted(ids[p] for p in self.graph[c]) if c in self.graph else None
+                              for c in self.order],
+            'metadata': [self.metadata.get(c) for c in self.order]
+        }
+        body = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return SNAPSHOT_MAGIC + zlib.compress(body, 6)
+    
+    @classmethod
+    def from_snapshot(cls, data: bytes) -> 'ConceptIndex':
+        """
+        Decode a snapshot written by to_snapshot
+        
+        Raises:
+            ConceptGraphError: If the data is not a valid snapshot
+        """
+        if not data.startswith(SNAPSHOT_MAGIC):
+            raise ConceptGraphError("Not a concept graph snapshot")
+        try:
+            document = json.loads(zlib.decompress(data[len(SNAPSHOT_MAGIC):]))
+            order = document['concepts']
+            graph = {
+                order[i]: [order[p] for p in prereqs]
+                for i, prereqs in enumerate(document['prerequisites']) if prereqs is not None
+            }
+            metadata = {order[i]: meta for i, meta in enumerate(document['metadata']) if meta is not None}
+        except (zlib.error, ValueError, KeyError, IndexError, TypeError) as e:
+            raise ConceptGraphError(f"Corrupt concept graph snapshot: {e}") from e
+        return cls(graph, metadata, order=order)
+    
+    def suggestions_for(self, mastered: Set[str]) -> List[str]:
+        """
+        Concepts not yet mastered whose prerequisites all are
+        
+        A suggestion needs at least one mastered prerequisite (or none at
+        all), so when few concepts are mastered only their dependents are
+        checked instead of every candidate.
+        
+        Args:
+            mastered: Names of mastered concepts
+            
+        Returns:
+            Suggested concepts, in graph order
+        """
+        graph = self.graph
+        if len(mastered) * 4 >= len(self.candidates):
+            return [concept for concept, prereqs in graph.items()
+                    if concept not in mastered and prereqs <= mastered]
+        
+        dependents = self.dependents
+        reachable = set().union(*[dependents[c] for c in mastered if c in dependents])
+        reachable.update(self._unconditional)
+        found = [concept for concept in reachable if concept not in mastered and graph[concept] <= mastered]
+        found.sort(key=self._positions.__getitem__)
+        return found
+    
+    def suggestion_arrays(self):
+        """
+        NumPy form of the candidates, built on first use
+        
+        Returns:
+            (candidate names, candidate ids, prerequisite id matrix); rows of
+            the matrix are padded with len(order), a column that the batch
+            code marks as always mastered
+        """
+        if self._arrays is None:
+            ids = self.ids
+            padding = len(self.order)
+            width = max((len(self.graph[name]) for name in self.candidates), default=0)
+            matrix = np.full((len(self.candidates), max(width, 1)), padding, dtype=np.int64)
+            for row, name in enumerate(self.candidates):
+                prereq_ids = [ids[p] for p in self.graph[name]]
+                matrix[row, :len(prereq_ids)] = prereq_ids
+            names = list(self.candidates)
+            candidate_ids = np.array([ids[name] for name in names], dtype=np.int64)
+            self._arrays = (names, candidate_ids, matrix)
+        return self._arrays
+    
+    def concepts_in(self, mask: int) -> List[str]:
+        """
+        Concepts whose bits are set in mask, in learning order
+        
+        Args:
+            mask: Bitset over concept ids
+            
+        Returns:
+            List of concept names
+        """
+        order = self.order
+        bits = bin(mask)[:1:-1]
+        found = []
+        i = bits.find('1')
+        while i >= 0:
+            found.append(order[i])
+            i = bits.find('1', i + 1)
+        return found
+
+
+def _suggest_with_numpy(index: ConceptIndex, learners: List[Tuple[str, ...]]) -> List[List[str]]:
+    """
+    Batch suggestions as boolean array operations
+    
+    Each block of learners becomes a (learners x concepts) "known" bitmap; a
+    candidate is suggested where all its prerequisite columns are set and its
+    own column is not.
+    """
+    names, candidate_ids, prereq_matrix = index.suggestion_arrays()
+    ids = index.ids
+    concept_count = len(index.order)
+    block = max(1, _NUMPY_BLOCK_CELLS // (len(names) + concept_count))
+    results = []
+    for start in range(0, len(learners), block):
+        chunk = learners[start:start + block]
+        known = np.zeros((len(chunk), concept_count + 1), dtype=bool)
+        known[:, concept_count] = True
+        # Unknown names map to the padding column, which is set anyway
+        rows = np.repeat(np.arange(len(chunk)), [len(mastered) for mastered in chunk])
+        columns = chain.from_iterable(map(ids.get, mastered, repeat(concept_count)) for mastered in chunk)
+        known[rows, np.fromiter(columns, dtype=np.int64, count=len(rows))] = True
+        
+        ready = ~known[:, candidate_ids]
+        for column in prereq_matrix.T:
+            ready &= known[:, column]
+        for row in ready:
+            results.append([names[i] for i in np.flatnonzero(row)])
+    return results
 
 
 class ConceptDependencyMapper:
     """
     Maps and analyzes dependencies between programming concepts
+    
+    The graph lives in an immutable ConceptIndex. Loading new concepts builds
+    a complete new index first and then swaps it in with a single assignment,
+    so queries running meanwhile keep using the previous one and never wait.
+    
+    When on_access is set it runs whenever the graph or its version is read,
+    which lets a source of concept definitions (e.g. ConceptGraphSync)
+    notice changes from whichever code path uses the mapper.
     """
     
-    def __init__(self):
-        self.concept_graph = self._build_concept_graph()
-        self.concept_metadata = self._initialize_metadata()
+    def __init__(self, concepts: Optional[List[Dict[str, Any]]] = None):
+        """
+        Initialize the mapper
+        
+        Args:
+            concepts: Concept definitions (see parse_concepts); defaults to
+                the built-in graph
+        """
+        if concepts is None:
+            self._index = ConceptIndex(self._build_concept_graph(), self._initialize_metadata())
+        else:
+            self._index = ConceptIndex(*parse_concepts(concepts))
+        self._version = 1
+        self._swap_lock = threading.Lock()
+        # Cheap check run before reads, e.g. starting a reload of changed definitions
+        self.on_access: Optional[Callable[[], None]] = None
+    
+    @property
+    def index(self) -> ConceptIndex:
+        """Current precomputed concept index"""
+        if self.on_access is not None:
+            self.on_access()
+        return self._index
+    
+    @property
+    def version(self) -> int:
+        """Graph version, bumped by every swap_index"""
+        if self.on_access is not None:
+            self.on_access()
+        return self._version
+    
+    def swap_index(self, index: ConceptIndex) -> int:
+        """
+        Replace the concept graph with a prebuilt index
+        
+        Args:
+            index: New index
+            
+        Returns:
+            The new graph version
+        """
+        with self._swap_lock:
+            self._index = index
+            self._version += 1
+            return self._version
+    
+    def load_concepts(self, concepts: List[Dict[str, Any]]) -> int:
+        """
+        Replace the concept graph from concept definitions
+        
+        The new index is built and validated before the swap; if the
+        definitions are invalid the current graph stays in place.
+        
+        Args:
+            concepts: Concept definitions (see parse_concepts)
+            
+        Returns:
+            The new graph version
+            
+        Raises:
+            ConceptGraphError: If the definitions are invalid or cyclic
+        """
+        return self.swap_index(ConceptIndex(*parse_concepts(concepts)))
+    
+    def load_file(self, path: str) -> int:
+        """
+        Replace the concept graph from a file
+        
+        Args:
+            path: A snapshot written by save_snapshot, a JSON list of concept
+                definitions, or a JSON object with a "concepts" list (such as
+                curriculum.json)
+            
+        Returns:
+            The new graph version
+            
+        Raises:
+            ConceptGraphError: If the file contents are invalid
+            OSError: If the file can't be read
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data.startswith(SNAPSHOT_MAGIC):
+            return self.swap_index(ConceptIndex.from_snapshot(data))
+        try:
+            document = json.loads(data)
+        except ValueError as e:
+            raise ConceptGraphError(f"Invalid concept file {path}: {e}") from e
+        if isinstance(document, dict):
+            document = document.get('concepts')
+        if not isinstance(document, list):
+            raise ConceptGraphError(f"{path} has no concept definitions")
+        return self.load_concepts(document)
+    
+    def save_snapshot(self, path: str):
+        """
+        Write the current graph as a binary snapshot (atomically)
+        
+        Args:
+            path: Destination file
+        """
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(self.index.to_snapshot())
+        os.replace(temporary, path)
+    
+    @property
+    def concept_graph(self) -> Dict[str, FrozenSet[str]]:
+        """Concept -> prerequisite concepts"""
+        return self.index.graph
     
-    def _build_concept_graph(self) -> Dict[str, Set[str]]:
+    @property
+    def concept_metadata(self) -> Dict[str, Dict]:
+        """Concept -> metadata"""
+        return self.index.metadata
+    
+    def _build_concept_graph(self) -> Dict[str, FrozenSet[str]]:
         """
         Build a directed graph of concept dependencies
         
         Returns:
-            Graph where keys are concepts and values are prerequisite concepts
+            Graph where keys are concepts and values are (immutable) sets of
+            prerequisite concepts
         """
         graph = defaultdict(set)
         
@@ -36,7 +492,7 @@ class ConceptDependencyMapper:
         graph['list_comprehensions'].add('loops')
         graph['dictionary_comprehensions'].add('list_comprehensions')
         
-        return dict(graph)
+        return {concept: frozenset(prereqs) for concept, prereqs in graph.items()}
     
     def _initialize_metadata(self) -> Dict[str, Dict]:
         """
@@ -88,46 +544,8 @@ class ConceptDependencyMapper:
         Returns:
             List of prerequisite concepts in learning order
         """
-        prerequisites = set()
-        self._collect_prerequisites(concept, prerequisites)
-        return self._topological_sort(prerequisites)
-    
-    def _collect_prerequisites(self, concept: str, collected: Set[str]):
-        """
-        Recursively collect all prerequisites
-        
-        Args:
-            concept: Current concept
-            collected: Set of collected prerequisites
-        """
-        if concept not in self.concept_graph:
-            return
-        
-        for prereq in self.concept_graph[concept]:
-            if prereq not in collected:
-                collected.add(prereq)
-                self._collect_prerequisites(prereq, collected)
-    
-    def _topological_sort(self, concepts: Set[str]) -> List[str]:
-        """
-        Sort concepts in learning order using topological sort
-        
-        Args:
-            concepts: Set of concepts to sort
-            
-        Returns:
-            Ordered list of concepts
-        """
-        # Simplified implementation - in reality would do proper topological sort
-        difficulty_order = {'beginner': 0, 'intermediate': 1, 'advanced': 2, 'expert': 3}
-        
-        return sorted(
-            concepts,
-            key=lambda c: difficulty_order.get(
-                self.concept_metadata.get(c, {}).get('difficulty', 'intermediate'),
-                1
-            )
-        )
+        index = self.index
+        return index.concepts_in(index.closures.get(concept, 0))
     
     def get_learning_path(self, target_concept: str) -> List[Dict[str, any]]:
         """
@@ -139,29 +557,30 @@ class ConceptDependencyMapper:
         Returns:
             Ordered list of concepts with metadata
         """
-        prerequisites = self.get_prerequisites(target_concept)
+        index = self.index
+        prerequisites = index.concepts_in(index.closures.get(target_concept, 0))
         path = []
         
         for i, concept in enumerate(prerequisites, 1):
-            metadata = self.concept_metadata.get(concept, {})
+            metadata = index.metadata.get(concept, {})
             path.append({
                 'step': i,
                 'concept': concept,
                 'description': metadata.get('description', ''),
                 'difficulty': metadata.get('difficulty', 'intermediate'),
                 'metadata': metadata,
-                'next_concepts': list(self._get_dependent_concepts(concept))
+                'next_concepts': list(index.dependents.get(concept, ()))
             })
         
         # Add target concept
-        metadata = self.concept_metadata.get(target_concept, {})
+        metadata = index.metadata.get(target_concept, {})
         path.append({
             'step': len(path) + 1,
             'concept': target_concept,
             'description': metadata.get('description', ''),
             'difficulty': metadata.get('difficulty', 'intermediate'),
             'metadata': metadata,
-            'next_concepts': list(self._get_dependent_concepts(target_concept))
+            'next_concepts': list(index.dependents.get(target_concept, ()))
         })
         
         return path
@@ -176,11 +595,7 @@ class ConceptDependencyMapper:
         Returns:
             Set of dependent concepts
         """
-        dependents = set()
-        for c, prereqs in self.concept_graph.items():
-            if concept in prereqs:
-                dependents.add(c)
-        return dependents
+        return self._index.dependents.get(concept, frozenset())
     
     def find_related_concepts(self, concept: str, max_distance: int = 2) -> List[str]:
         """
@@ -193,19 +608,19 @@ class ConceptDependencyMapper:
         Returns:
             List of related concepts
         """
+        index = self.index
         related = set()
         
         # Add prerequisites
-        related.update(self.concept_graph.get(concept, set()))
+        related.update(index.graph.get(concept, ()))
         
         # Add dependents
-        related.update(self._get_dependent_concepts(concept))
+        related.update(index.dependents.get(concept, ()))
         
         # Add siblings (concepts with same prerequisites)
-        if concept in self.concept_graph:
-            for c, prereqs in self.concept_graph.items():
-                if prereqs == self.concept_graph[concept] and c != concept:
-                    related.add(c)
+        if concept in index.graph:
+            related.update(index.siblings[index.graph[concept]])
+            related.discard(concept)
         
         return list(related)
     
@@ -219,16 +634,37 @@ class ConceptDependencyMapper:
         Returns:
             Suggested next concepts
         """
-        mastered_set = set(mastered_concepts)
-        suggestions = []
+        return self.index.suggestions_for(set(mastered_concepts))
+    
+    def suggest_next_concepts_batch(self, mastered_by_learner: List[Iterable[str]]) -> List[List[str]]:
+        """
+        Suggest next concepts for many learners at once (e.g. a classroom)
+        
+        Learners with identical mastered lists share one computation. Large
+        batches are evaluated with NumPy when it is installed: mastered sets
+        become rows of a boolean concept bitmap and every candidate is checked
+        for every learner in one pass. Otherwise each distinct mastered set is
+        handled as in suggest_next_concepts.
+        
+        Args:
+            mastered_by_learner: Mastered concepts of each learner
+            
+        Returns:
+            Suggestions per learner, in the same order (each as from
+            suggest_next_concepts)
+        """
+        index = self.index
+        # Tuples hash far cheaper than sets and the NumPy path reads them directly
+        learners = [tuple(mastered) for mastered in mastered_by_learner]
+        distinct = list(dict.fromkeys(learners))
         
-        for concept, prereqs in self.concept_graph.items():
-            if concept not in mastered_set:
-                # Check if all prerequisites are mastered
-                if prereqs.issubset(mastered_set):
-                    suggestions.append(concept)
+        if np is not None and len(distinct) >= NUMPY_BATCH_MIN and index.candidates:
+            results = _suggest_with_numpy(index, distinct)
+        else:
+            results = [index.suggestions_for(set(mastered)) for mastered in distinct]
         
-        return suggestions
+        by_learner = dict(zip(distinct, results))
+        return [list(by_learner[mastered]) for mastered in learners]
     
     def get_concept_difficulty(self, concept: str) -> str:
         """
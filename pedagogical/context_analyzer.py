@@ -3,7 +3,9 @@ Context Analyzer for understanding the calling context
 """
 
 import inspect
-from typing import Dict, Any, Optional, List
+import linecache
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, Optional, List
 from types import FrameType as _FrameType
 
 # Some Python versions (older runners) don't expose inspect.FrameType.
@@ -13,14 +15,95 @@ FrameType = getattr(inspect, "FrameType", _FrameType)
 from pathlib import Path
 
 
+_MISSING = object()
+
+
+class LazyContext(Mapping):
+    """
+    Calling context that is only analysed when it is read
+    
+    Capturing it stores the caller's frame, code object and line number.
+    Each context key is computed on first access and cached. Call release()
+    once the call is over so the frame (and its locals) can be freed; keys
+    that need the frame and were not read before then take their "unknown"
+    values.
+    """
+    
+    __slots__ = ('_analyzer', '_frame', 'code', 'line_number', '_values')
+    
+    KEYS = ('file', 'function', 'line_number', 'local_variables', 'call_chain', 'module', 'code_snippet')
+    
+    def __init__(self, analyzer: 'ContextAnalyzer', frame: 'FrameType'):
+        self._analyzer = analyzer
+        self._frame = frame
+        self.code = frame.f_code
+        self.line_number = frame.f_lineno
+        self._values: Dict[str, Any] = {}
+    
+    def _compute(self, key: str) -> Any:
+        frame = self._frame
+        analyzer = self._analyzer
+        if key == 'file':
+            return analyzer._file_name(self.code.co_filename)
+        if key == 'function':
+            return self.code.co_name
+        if key == 'line_number':
+            return self.line_number
+        if key == 'code_snippet':
+            return analyzer._snippet(self.code.co_filename, self.line_number)
+        if key == 'local_variables':
+            return analyzer._get_local_variables(frame) if frame is not None else {}
+        if key == 'call_chain':
+            return analyzer._get_call_chain(frame) if frame is not None else []
+        if key == 'module':
+            return analyzer._get_module_info(frame) if frame is not None else 'unknown'
+        raise KeyError(key)
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._values[key] = self._compute(key)
+        return value
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+    
+    def __len__(self) -> int:
+        return len(self.KEYS)
+    
+    def release(self):
+        """Drop the reference to the captured frame"""
+        self._frame = None
+    
+    def __repr__(self) -> str:
+        return f"LazyContext({self.code.co_filename}:{self.line_number} in {self.code.co_name})"
+
+
 class ContextAnalyzer:
     """
     Analyzes the context in which methods are called to provide better insights
     """
     
-    def analyze(self, frame: Optional['FrameType']) -> Dict[str, Any]:
+    def analyze(self, frame: Optional['FrameType']) -> Mapping:
         """
-        Analyze the calling context
+        Capture the calling context, deferring the analysis until it is read
+        
+        Args:
+            frame: The calling frame from inspect.currentframe()
+            
+        Returns:
+            LazyContext with the same keys as analyze_now()
+        """
+        if frame is None:
+            return self._empty_context()
+        
+        # Go up two frames to get the actual caller (skip internal frames)
+        caller_frame = frame.f_back.f_back if frame.f_back and frame.f_back.f_back else frame
+        return LazyContext(self, caller_frame)
+    
+    def analyze_now(self, frame: Optional['FrameType']) -> Dict[str, Any]:
+        """
+        Analyze the calling context immediately
         
         Args:
             frame: The calling frame from inspect.currentframe()
@@ -59,7 +142,14 @@ class ContextAnalyzer:
     def _get_file_info(self, frame: 'FrameType') -> str:
         """Get the file path from the frame"""
         try:
-            file_path = frame.f_code.co_filename
+            return self._file_name(frame.f_code.co_filename)
+        except:
+            return 'unknown'
+    
+    @staticmethod
+    def _file_name(file_path: str) -> str:
+        """File name part of a code object's filename"""
+        try:
             return str(Path(file_path).name)
         except:
             return 'unknown'
@@ -134,11 +224,19 @@ class ContextAnalyzer:
             Code snippet as a string
         """
         try:
-            filename = frame.f_code.co_filename
-            line_number = frame.f_lineno
-            
-            with open(filename, 'r') as f:
-                lines = f.readlines()
+            return self._snippet(frame.f_code.co_filename, frame.f_lineno, context_lines)
+        except:
+            return ''
+    
+    def _snippet(self, filename: str, line_number: int, context_lines: int = 3) -> str:
+        """
+        Build the code snippet for a file and line
+        
+        Source lines come from linecache, which keeps each file in memory
+        after its first read instead of reopening it on every call.
+        """
+        try:
+            lines = linecache.getlines(filename)
             
             start = max(0, line_number - context_lines - 1)
             end = min(len(lines), line_number + context_lines)
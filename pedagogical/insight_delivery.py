@@ -2,107 +2,206 @@
 Insight Delivery system for presenting teaching moments to users
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
 import textwrap
 
 
+# A section of an insight: (key in the teaching moment, display title,
+# paragraph text or list of items)
+Section = Tuple[str, str, Union[str, List[Any]]]
+
+LEVEL_ICONS = {
+    'beginner': '🌱',
+    'intermediate': '🌿',
+    'advanced': '🌳',
+    'expert': '🏆'
+}
+
+
+class Insight:
+    """
+    A teaching moment selected for one verbosity level
+    
+    The sections to show are kept as data; the text form (headers, wrapped
+    paragraphs, bullets) is only built when render() is called, then cached.
+    Consumers that return the structured form (to_dict) never pay for it.
+    """
+    
+    __slots__ = ('level', 'focus', 'verbosity', 'sections', '_text')
+    
+    def __init__(self, level: str, focus: str, verbosity: str, sections: List[Section]):
+        self.level = level
+        self.focus = focus
+        self.verbosity = verbosity
+        self.sections = sections
+        self._text: Optional[str] = None
+    
+    def render(self) -> str:
+        """
+        Text form of the insight, as printed in the REPL
+        
+        Returns:
+            Rendered text, ending with a newline
+        """
+        if self._text is None:
+            lines = self._minimal_lines() if self.verbosity == 'minimal' else self._full_lines()
+            self._text = "\n".join(lines) + "\n"
+        return self._text
+    
+    def __str__(self) -> str:
+        return self.render()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Structured form of the insight (JSON-friendly)
+        
+        Returns:
+            Dictionary with level, focus, verbosity and the sections; each
+            section has a key, a title and either text or items
+        """
+        return {
+            'level': self.level,
+            'focus': self.focus,
+            'verbosity': self.verbosity,
+            'sections': [
+                {'key': key, 'title': title, 'text': content} if isinstance(content, str)
+                else {'key': key, 'title': title, 'items': list(content)}
+                for key, title, content in self.sections
+            ]
+        }
+    
+    def _focus_title(self) -> str:
+        return self.focus.replace('_', ' ').title()
+    
+    def _minimal_lines(self) -> List[str]:
+        """Just the key insight: a one-line header and a brief explanation"""
+        lines = [f"\n💡 [{self.level.upper()}] {self._focus_title()}"]
+        for _, _, content in self.sections:
+            lines.append(f"   {content[:100]}...")
+        return lines
+    
+    def _full_lines(self) -> List[str]:
+        """Header followed by wrapped paragraphs and bulleted lists"""
+        icon = LEVEL_ICONS.get(self.level, '💡')
+        lines = [f"\n{'=' * 60}", f"{icon} LEARNING MOMENT [{self.level.upper()}]"]
+        if self.verbosity == 'detailed':
+            lines.append(f"Focus: {self._focus_title()}")
+        lines.append('=' * 60)
+        
+        for _, title, content in self.sections:
+            lines.append(f"\n{title}:")
+            if isinstance(content, str):
+                lines.append(_wrap_text(content))
+            else:
+                lines.extend(f"  • {item}" for item in content)
+        
+        lines.append('')  # Empty line at end
+        return lines
+
+
+def _wrap_text(text: str, width: int = 58) -> str:
+    """Wrap text to specified width"""
+    return textwrap.fill(text, width=width, initial_indent='  ', subsequent_indent='  ')
+
+
 class InsightDelivery:
     """
     Delivers educational insights in an appropriate format and verbosity
     """
     
-    def __init__(self, verbosity: str = 'normal'):
+    def __init__(self, verbosity: str = 'normal', echo: bool = True):
         """
         Initialize insight delivery
         
         Args:
             verbosity: 'minimal', 'normal', or 'detailed'
+            echo: Print each insight as it is delivered (the REPL); pass
+                False to only return Insight objects, leaving rendering to
+                the consumer
         """
         self.verbosity = verbosity
+        self.echo = echo
         self.delivery_methods = {
-            'minimal': self._minimal_delivery,
-            'normal': self._normal_delivery,
-            'detailed': self._detailed_delivery
+            'minimal': self._minimal_sections,
+            'normal': self._normal_sections,
+            'detailed': self._detailed_sections
         }
     
-    def deliver(self, teaching_moment: Dict[str, Any], result: Any):
+    def deliver(self, teaching_moment: Dict[str, Any], result: Any) -> Insight:
         """
         Deliver a teaching moment to the user
         
         Args:
             teaching_moment: Dictionary containing teaching content
             result: The result of the method call
+            
+        Returns:
+            The Insight, printed first when echo is enabled
         """
-        delivery_method = self.delivery_methods.get(
-            self.verbosity,
-            self._normal_delivery
+        verbosity = self.verbosity if self.verbosity in self.delivery_methods else 'normal'
+        insight = Insight(
+            teaching_moment.get('level', 'intermediate'),
+            teaching_moment.get('focus', 'general'),
+            verbosity,
+            self.delivery_methods[verbosity](teaching_moment)
         )
-        
-        delivery_method(teaching_moment, result)
+        if self.echo:
+            print(insight.render(), end='')
+        return insight
     
-    def _minimal_delivery(self, teaching_moment: Dict[str, Any], result: Any):
+    def _minimal_sections(self, teaching_moment: Dict[str, Any]) -> List[Section]:
         """Minimal delivery - just key insights"""
-        level = teaching_moment.get('level', 'intermediate')
-        focus = teaching_moment.get('focus', 'general')
-        
-        print(f"\n💡 [{level.upper()}] {focus.replace('_', ' ').title()}")
-        
         # Show only the most important insight
         if 'explanation' in teaching_moment:
-            brief = teaching_moment['explanation'][:100] + "..."
-            print(f"   {brief}")
+            return [('explanation', 'Explanation', teaching_moment['explanation'])]
+        return []
     
-    def _normal_delivery(self, teaching_moment: Dict[str, Any], result: Any):
+    def _normal_sections(self, teaching_moment: Dict[str, Any]) -> List[Section]:
         """Normal delivery - balanced insights"""
-        self._print_header(teaching_moment)
+        sections = []
+        
+        def add_text(key: str, title: str):
+            if key in teaching_moment:
+                sections.append((key, title, teaching_moment[key]))
+        
+        def add_list(key: str, title: str):
+            if teaching_moment.get(key):
+                sections.append((key, title, teaching_moment[key]))
         
         # Main explanation
-        if 'explanation' in teaching_moment:
-            self._print_section("Explanation", teaching_moment['explanation'])
+        add_text('explanation', "Explanation")
         
         # Key concepts based on level
         level = teaching_moment.get('level', 'intermediate')
         
         if level == 'beginner':
-            if 'why_it_exists' in teaching_moment:
-                self._print_section("Why This Matters", teaching_moment['why_it_exists'])
-            if 'simple_analogy' in teaching_moment:
-                self._print_section("Think of It Like", teaching_moment['simple_analogy'])
+            add_text('why_it_exists', "Why This Matters")
+            add_text('simple_analogy', "Think of It Like")
         
         elif level == 'intermediate':
-            if 'common_patterns' in teaching_moment:
-                self._print_list("Common Patterns", teaching_moment['common_patterns'])
-            if 'when_to_use' in teaching_moment:
-                self._print_section("When to Use", teaching_moment['when_to_use'])
+            add_list('common_patterns', "Common Patterns")
+            add_text('when_to_use', "When to Use")
         
         elif level == 'advanced':
-            if 'performance_tips' in teaching_moment:
-                self._print_list("Performance Tips", teaching_moment['performance_tips'])
-            if 'theory' in teaching_moment:
-                self._print_section("Theory", teaching_moment['theory'])
+            add_list('performance_tips', "Performance Tips")
+            add_text('theory', "Theory")
         
         # Common elements
-        if 'pitfalls' in teaching_moment and teaching_moment['pitfalls']:
-            self._print_list("⚠️  Common Pitfalls", teaching_moment['pitfalls'])
-        
-        print()  # Empty line at end
+        add_list('pitfalls', "⚠️  Common Pitfalls")
+        return sections
     
-    def _detailed_delivery(self, teaching_moment: Dict[str, Any], result: Any):
+    def _detailed_sections(self, teaching_moment: Dict[str, Any]) -> List[Section]:
         """Detailed delivery - comprehensive insights"""
-        self._print_header(teaching_moment, detailed=True)
-        
         # Include everything
-        sections = [
+        text_sections = [
             ('explanation', 'Explanation'),
             ('why_it_exists', 'Why This Exists'),
             ('simple_analogy', 'Analogy'),
             ('when_to_use', 'When to Use'),
             ('theory', 'Underlying Theory')
         ]
-        
-        for key, title in sections:
-            if key in teaching_moment:
-                self._print_section(title, teaching_moment[key])
+        sections = [(key, title, teaching_moment[key]) for key, title in text_sections
+                    if key in teaching_moment]
         
         # Lists
         list_sections = [
@@ -116,58 +215,18 @@ class InsightDelivery:
             ('edge_cases', '🔍 Edge Cases'),
             ('related_concepts', '🔗 Related Concepts')
         ]
-        
-        for key, title in list_sections:
-            if key in teaching_moment and teaching_moment[key]:
-                self._print_list(title, teaching_moment[key])
+        sections.extend((key, title, teaching_moment[key]) for key, title in list_sections
+                        if teaching_moment.get(key))
         
         # Special sections
         if 'implementation_details' in teaching_moment:
-            self._print_section("🔧 Implementation Details", teaching_moment['implementation_details'])
-        
-        if 'research_references' in teaching_moment:
-            self._print_list("📖 Research References", teaching_moment['research_references'])
-        
-        print()  # Empty line at end
-    
-    def _print_header(self, teaching_moment: Dict[str, Any], detailed: bool = False):
-        """Print the header for a teaching moment"""
-        level = teaching_moment.get('level', 'intermediate')
-        focus = teaching_moment.get('focus', 'general')
-        
-        icons = {
-            'beginner': '🌱',
-            'intermediate': '🌿',
-            'advanced': '🌳',
-            'expert': '🏆'
-        }
+            sections.append(('implementation_details', "🔧 Implementation Details",
+                             teaching_moment['implementation_details']))
         
-        icon = icons.get(level, '💡')
-        
-        print(f"\n{'=' * 60}")
-        print(f"{icon} LEARNING MOMENT [{level.upper()}]")
-        if detailed:
-            print(f"Focus: {focus.replace('_', ' ').title()}")
-        print('=' * 60)
-    
-    def _print_section(self, title: str, content: str):
-        """Print a section with title and content"""
-        print(f"\n{title}:")
-        print(self._wrap_text(content))
-    
-    def _print_list(self, title: str, items: list):
-        """Print a list of items"""
-        if not items:
-            return
-        
-        print(f"\n{title}:")
-        for item in items:
-            print(f"  • {item}")
-    
-    def _wrap_text(self, text: str, width: int = 58) -> str:
-        """Wrap text to specified width"""
-        wrapped = textwrap.fill(text, width=width, initial_indent='  ', subsequent_indent='  ')
-        return wrapped
+        if teaching_moment.get('research_references'):
+            sections.append(('research_references', "📖 Research References",
+                             teaching_moment['research_references']))
+        return sections
     
     def set_verbosity(self, level: str):
         """
@@ -2,8 +2,203 @@
 Skill Inference Engine for determining user skill level
 """
 
-from typing import Dict, List, Any
-from collections import Counter
+from typing import Dict, List, Any, Iterable, NamedTuple, Sequence
+from collections import deque
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+# Recent-call windows examined by the pattern detectors
+BASIC_PATTERN_WINDOW = 10
+COMPLEX_PATTERN_WINDOW = 20
+EXPERT_PATTERN_WINDOW = 30
+
+ADVANCED_METHOD_MARKERS = ('optimize', 'cache', 'async', 'parallel', 'batch')
+
+# Batches of at least this many learners are scored with NumPy (when installed)
+NUMPY_BATCH_MIN = 64
+
+
+@lru_cache(maxsize=1024)
+def _is_advanced_method(method: str) -> bool:
+    """Whether a method name suggests expert-level usage"""
+    lowered = method.lower()
+    return any(marker in lowered for marker in ADVANCED_METHOD_MARKERS)
+
+
+class _RollingCount:
+    """Number of true flags among the last `size` pushed"""
+
+    __slots__ = ("size", "flags", "count")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.flags: deque = deque()
+        self.count = 0
+
+    def push(self, flag: bool):
+        if self.size <= 0:
+            return
+        if len(self.flags) == self.size:
+            self.count -= self.flags.popleft()
+        self.flags.append(flag)
+        self.count += flag
+
+
+class SkillFeatures(NamedTuple):
+    """
+    The per-learner numbers skill inference depends on
+
+    Rows of the feature matrix taken by SkillInferenceEngine.infer_levels.
+    The repetition, diversity and exploration ratios are derived from these
+    counts exactly as the scalar indicators derive them, so both paths agree.
+    """
+    total: int
+    unique_methods: int
+    max_count: int
+    distinct_trigrams: int
+    recent_changes: int
+    recent_advanced: int
+
+
+class SkillStatistics:
+    """
+    Running statistics over a call history, updated in O(1) per call
+
+    Tracks what the skill indicators need - call count, per-method counts,
+    the most common method's frequency and the recent-call pattern windows -
+    so inference does not rescan the history.
+    """
+
+    __slots__ = ("capacity", "total", "method_counts", "_count_frequency", "max_count",
+                 "_last", "_changes", "_trigrams", "_trigram_counts", "_trigram_window",
+                 "_advanced")
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Args:
+            capacity: Maximum history length the statistics describe; the
+                pattern windows never reach further back than this
+        """
+        self.capacity = capacity
+        self.total = 0
+        self.method_counts: Dict[str, int] = {}
+        # How many methods have been called exactly k times, for max_count upkeep
+        self._count_frequency: Dict[int, int] = {}
+        self.max_count = 0
+
+        self._last: List[str] = []
+        self._changes = _RollingCount(min(BASIC_PATTERN_WINDOW, capacity) - 1)
+        self._trigram_window = max(min(COMPLEX_PATTERN_WINDOW, capacity) - 2, 0)
+        self._trigrams: deque = deque()
+        self._trigram_counts: Dict[tuple, int] = {}
+        self._advanced = _RollingCount(min(EXPERT_PATTERN_WINDOW, capacity))
+
+    @classmethod
+    def from_methods(cls, methods: Iterable[str], capacity: int = None) -> "SkillStatistics":
+        """
+        Build statistics for an existing sequence of method names
+
+        Args:
+            methods: Method names, oldest first
+            capacity: History cap (defaults to the sequence length)
+        """
+        methods = list(methods)
+        stats = cls(capacity if capacity is not None else max(len(methods), 1))
+        for method in methods[-stats.capacity:]:
+            stats.record(method)
+        return stats
+
+    @property
+    def unique_methods(self) -> int:
+        """Number of distinct methods in the history"""
+        return len(self.method_counts)
+
+    @property
+    def distinct_trigrams(self) -> int:
+        """Distinct three-call sequences within the complex-pattern window"""
+        return len(self._trigram_counts)
+
+    @property
+    def recent_changes(self) -> int:
+        """Adjacent method changes within the basic-pattern window"""
+        return self._changes.count
+
+    @property
+    def recent_advanced(self) -> int:
+        """Advanced-looking calls within the expert-pattern window"""
+        return self._advanced.count
+
+    def features(self) -> SkillFeatures:
+        """Snapshot of the numbers skill inference reads"""
+        return SkillFeatures(self.total, self.unique_methods, self.max_count,
+                             self.distinct_trigrams, self.recent_changes, self.recent_advanced)
+
+    def record(self, method: str):
+        """
+        Account for a call appended to the history
+
+        Args:
+            method: Name of the called method
+        """
+        self.total += 1
+        count = self.method_counts.get(method, 0) + 1
+        self.method_counts[method] = count
+        frequency = self._count_frequency
+        if count > 1:
+            frequency[count - 1] -= 1
+        frequency[count] = frequency.get(count, 0) + 1
+        if count > self.max_count:
+            self.max_count = count
+
+        last = self._last
+        if last:
+            self._changes.push(method != last[-1])
+        if len(last) == 2 and self._trigram_window:
+            trigram = (last[0], last[1], method)
+            if len(self._trigrams) == self._trigram_window:
+                dropped = self._trigrams.popleft()
+                remaining = self._trigram_counts[dropped] - 1
+                if remaining:
+                    self._trigram_counts[dropped] = remaining
+                else:
+                    del self._trigram_counts[dropped]
+            self._trigrams.append(trigram)
+            self._trigram_counts[trigram] = self._trigram_counts.get(trigram, 0) + 1
+        last.append(method)
+        if len(last) > 2:
+            del last[0]
+        self._advanced.push(_is_advanced_method(method))
+
+    def forget(self, method: str):
+        """
+        Account for the oldest call dropping out of a capped history
+
+        Only the totals change: the pattern windows cover the newest calls
+        and are bounded by capacity, so they never contain the dropped call.
+
+        Args:
+            method: Name of the evicted call's method
+        """
+        count = self.method_counts.get(method)
+        if not count:
+            return
+        self.total -= 1
+        frequency = self._count_frequency
+        frequency[count] -= 1
+        if count > 1:
+            self.method_counts[method] = count - 1
+            frequency[count - 1] = frequency.get(count - 1, 0) + 1
+        else:
+            del self.method_counts[method]
+        if count == self.max_count and not frequency[count]:
+            self.max_count = count - 1
+        if not frequency[count]:
+            del frequency[count]
 
 
 class SkillInferenceEngine:
@@ -37,65 +232,132 @@ class SkillInferenceEngine:
         if not call_history:
             return 'beginner'
         
+        stats = SkillStatistics.from_methods(call['method'] for call in call_history)
+        return self.infer_from_statistics(stats, user_profile)
+    
+    def infer_from_statistics(
+        self,
+        stats: SkillStatistics,
+        user_profile: Dict[str, Any]
+    ) -> str:
+        """
+        Infer the skill level from running statistics in constant time
+        
+        Args:
+            stats: Statistics maintained alongside the call history (or a
+                SkillFeatures snapshot of them)
+            user_profile: User profile information
+            
+        Returns:
+            Skill level: 'beginner', 'intermediate', 'advanced', or 'expert'
+        """
+        if not stats.total:
+            return 'beginner'
+        
         # Calculate scores for each skill level
         scores = {}
         for level, indicator_func in self.skill_indicators.items():
-            scores[level] = indicator_func(call_history, user_profile)
+            scores[level] = indicator_func(stats, user_profile)
         
         # Return level with highest score
         return max(scores, key=scores.get)
     
+    def infer_levels(self, features: Sequence[Sequence[int]]) -> List[str]:
+        """
+        Infer skill levels for many learners at once (e.g. a classroom)
+        
+        Each row holds one learner's SkillFeatures (see
+        SkillStatistics.features). With NumPy installed, large batches are
+        scored with array operations over the whole feature matrix; the
+        result is the same as infer_from_statistics for every row.
+        
+        Args:
+            features: Feature rows, one per learner
+            
+        Returns:
+            Skill level per learner, in the same order
+        """
+        if np is not None and len(features) >= NUMPY_BATCH_MIN:
+            return self._infer_levels_with_numpy(features)
+        return [self.infer_from_statistics(SkillFeatures(*row), {}) for row in features]
+    
+    def _infer_levels_with_numpy(self, features: Sequence[Sequence[int]]) -> List[str]:
+        """Score all four levels for every row of the feature matrix"""
+        matrix = np.asarray(features, dtype=np.float64).reshape(len(features), len(SkillFeatures._fields))
+        total, unique_methods, max_count, distinct_trigrams, recent_changes, recent_advanced = matrix.T
+        
+        basic_patterns = (total >= 3) & (recent_changes > 0)
+        complex_patterns = (total >= 5) & (distinct_trigrams >= 3)
+        expert_patterns = (total >= 10) & (recent_advanced > 0)
+        exploration_ratio = unique_methods / np.maximum(total, 1)
+        optimal_usage = (total >= 10) & (exploration_ratio >= 0.4) & (exploration_ratio <= 0.8)
+        
+        # Columns follow skill_indicators, so argmax breaks ties like max()
+        scores = np.empty((len(matrix), 4))
+        scores[:, 0] = (2.0 * (total < 10) + 1.5 * (unique_methods < 5)
+                        + 1.0 * (max_count > total * 0.5) + 1.0 * ~complex_patterns)
+        scores[:, 1] = (2.0 * ((total >= 10) & (total < 50))
+                        + 1.5 * ((unique_methods >= 5) & (unique_methods < 15))
+                        + 1.0 * basic_patterns
+                        + 1.0 * ((exploration_ratio >= 0.3) & (exploration_ratio <= 0.7)))
+        scores[:, 2] = (2.0 * (total >= 50) + 1.5 * (unique_methods >= 15)
+                        + 1.5 * complex_patterns + 1.0 * (max_count < total * 0.3))
+        scores[:, 3] = (2.0 * (total >= 100) + 2.0 * (unique_methods >= 25)
+                        + 2.0 * expert_patterns + 1.0 * optimal_usage)
+        
+        best = np.where(total > 0, scores.argmax(axis=1), 0)
+        levels = list(self.skill_indicators)
+        return [levels[i] for i in best.tolist()]
+    
     def _beginner_indicators(
         self,
-        call_history: List[Dict[str, Any]],
+        stats: SkillStatistics,
         user_profile: Dict[str, Any]
     ) -> float:
         """Calculate score for beginner level"""
         score = 0.0
         
         # Few total calls
-        if len(call_history) < 10:
+        if stats.total < 10:
             score += 2.0
         
         # Limited variety of methods
-        unique_methods = len(set(call['method'] for call in call_history))
-        if unique_methods < 5:
+        if stats.unique_methods < 5:
             score += 1.5
         
         # Repeated use of same methods (learning)
-        method_counts = Counter(call['method'] for call in call_history)
-        if method_counts.most_common(1)[0][1] > len(call_history) * 0.5:
+        if stats.max_count > stats.total * 0.5:
             score += 1.0
         
         # No complex patterns
-        if not self._detect_complex_patterns(call_history):
+        if not self._detect_complex_patterns(stats):
             score += 1.0
         
         return score
     
     def _intermediate_indicators(
         self,
-        call_history: List[Dict[str, Any]],
+        stats: SkillStatistics,
         user_profile: Dict[str, Any]
     ) -> float:
         """Calculate score for intermediate level"""
         score = 0.0
         
         # Moderate number of calls
-        if 10 <= len(call_history) < 50:
+        if 10 <= stats.total < 50:
             score += 2.0
         
         # Good variety of methods
-        unique_methods = len(set(call['method'] for call in call_history))
+        unique_methods = stats.unique_methods
         if 5 <= unique_methods < 15:
             score += 1.5
         
         # Some pattern recognition
-        if self._detect_basic_patterns(call_history):
+        if self._detect_basic_patterns(stats):
             score += 1.0
         
         # Balanced exploration and repetition
-        exploration_ratio = unique_methods / max(len(call_history), 1)
+        exploration_ratio = unique_methods / max(stats.total, 1)
         if 0.3 <= exploration_ratio <= 0.7:
             score += 1.0
         
@@ -103,119 +365,87 @@ class SkillInferenceEngine:
     
     def _advanced_indicators(
         self,
-        call_history: List[Dict[str, Any]],
+        stats: SkillStatistics,
         user_profile: Dict[str, Any]
     ) -> float:
         """Calculate score for advanced level"""
         score = 0.0
         
         # Substantial call history
-        if len(call_history) >= 50:
+        if stats.total >= 50:
             score += 2.0
         
         # Wide variety of methods
-        unique_methods = len(set(call['method'] for call in call_history))
-        if unique_methods >= 15:
+        if stats.unique_methods >= 15:
             score += 1.5
         
         # Complex patterns detected
-        if self._detect_complex_patterns(call_history):
+        if self._detect_complex_patterns(stats):
             score += 1.5
         
         # Efficient method usage (less repetition)
-        method_counts = Counter(call['method'] for call in call_history)
-        max_repetition = method_counts.most_common(1)[0][1]
-        if max_repetition < len(call_history) * 0.3:
+        if stats.max_count < stats.total * 0.3:
             score += 1.0
         
         return score
     
     def _expert_indicators(
         self,
-        call_history: List[Dict[str, Any]],
+        stats: SkillStatistics,
         user_profile: Dict[str, Any]
     ) -> float:
         """Calculate score for expert level"""
         score = 0.0
         
         # Extensive history
-        if len(call_history) >= 100:
+        if stats.total >= 100:
             score += 2.0
         
         # Very wide variety
-        unique_methods = len(set(call['method'] for call in call_history))
-        if unique_methods >= 25:
+        if stats.unique_methods >= 25:
             score += 2.0
         
         # Advanced patterns
-        if self._detect_expert_patterns(call_history):
+        if self._detect_expert_patterns(stats):
             score += 2.0
         
         # Optimal usage (minimal waste)
-        if self._is_optimal_usage(call_history):
+        if self._is_optimal_usage(stats):
             score += 1.0
         
         return score
     
-    def _detect_basic_patterns(self, call_history: List[Dict[str, Any]]) -> bool:
+    def _detect_basic_patterns(self, stats: SkillStatistics) -> bool:
         """Detect basic usage patterns"""
-        if len(call_history) < 3:
+        if stats.total < 3:
             return False
         
-        # Check for sequential method usage
-        methods = [call['method'] for call in call_history[-10:]]
-        
-        # Look for A -> B pattern
-        for i in range(len(methods) - 1):
-            if methods[i] != methods[i + 1]:
-                return True
-        
-        return False
+        # Look for A -> B pattern among the last 10 calls
+        return stats.recent_changes > 0
     
-    def _detect_complex_patterns(self, call_history: List[Dict[str, Any]]) -> bool:
+    def _detect_complex_patterns(self, stats: SkillStatistics) -> bool:
         """Detect complex usage patterns"""
-        if len(call_history) < 5:
+        if stats.total < 5:
             return False
         
-        methods = [call['method'] for call in call_history[-20:]]
-        
-        # Check for method chaining patterns (A -> B -> C)
-        unique_sequences = set()
-        for i in range(len(methods) - 2):
-            sequence = tuple(methods[i:i+3])
-            unique_sequences.add(sequence)
-        
-        # Complex patterns have multiple unique sequences
-        return len(unique_sequences) >= 3
+        # Complex patterns have multiple unique A -> B -> C chains in the last 20 calls
+        return stats.distinct_trigrams >= 3
     
-    def _detect_expert_patterns(self, call_history: List[Dict[str, Any]]) -> bool:
+    def _detect_expert_patterns(self, stats: SkillStatistics) -> bool:
         """Detect expert-level usage patterns"""
-        if len(call_history) < 10:
+        if stats.total < 10:
             return False
         
-        # Check for optimization patterns, error handling, edge cases
-        methods = [call['method'] for call in call_history[-30:]]
-        
-        # Look for advanced method combinations
-        advanced_methods = ['optimize', 'cache', 'async', 'parallel', 'batch']
-        expert_usage = any(
-            any(adv in method.lower() for adv in advanced_methods)
-            for method in methods
-        )
-        
-        return expert_usage
+        # Optimization, caching, async or batching among the last 30 calls
+        return stats.recent_advanced > 0
     
-    def _is_optimal_usage(self, call_history: List[Dict[str, Any]]) -> bool:
+    def _is_optimal_usage(self, stats: SkillStatistics) -> bool:
         """Check if usage patterns are optimal"""
-        if len(call_history) < 10:
+        if stats.total < 10:
             return False
         
-        # Calculate efficiency metrics
-        unique_methods = len(set(call['method'] for call in call_history))
-        total_calls = len(call_history)
-        
         # Optimal usage has good variety without excessive repetition
-        efficiency_ratio = unique_methods / total_calls
+        efficiency_ratio = stats.unique_methods / stats.total
         return 0.4 <= efficiency_ratio <= 0.8
     
     def get_skill_progression(self, call_history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -0,0 +1,330 @@
+"""
+Durable learner progress in SQLite
+
+Call records are queued by request threads and appended by one background
+writer in batched transactions, so recording never waits on the disk. The
+database runs in WAL mode, so readers (and other uvicorn workers) are not
+blocked by the writer. Per-learner summaries and method counts are kept in
+tables keyed by session id, making a progress lookup a single indexed read.
+"""
+
+import os
+import json
+import queue
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS call_records (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    method TEXT NOT NULL,
+    args_count INTEGER NOT NULL,
+    kwargs_count INTEGER NOT NULL,
+    result_type TEXT NOT NULL,
+    context TEXT,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS call_records_session ON call_records (session_id, id);
+
+CREATE TABLE IF NOT EXISTS learner_summary (
+    session_id TEXT PRIMARY KEY,
+    total_calls INTEGER NOT NULL DEFAULT 0,
+    skill_level TEXT,
+    mastered_concepts TEXT,
+    skill_trajectory TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS method_counts (
+    session_id TEXT NOT NULL,
+    method TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    PRIMARY KEY (session_id, method)
+) WITHOUT ROWID;
+"""
+
+
+# Only the call site of a context is stored. By the time a record is written
+# its LazyContext has been released, so the other keys are placeholders, and
+# reading code_snippet would go to the source file from the writer thread.
+_STORED_CONTEXT_KEYS = ('file', 'function', 'line_number')
+
+
+def _plain(context: Any) -> Any:
+    """Call site of a (possibly lazy) context mapping as a plain dict for JSON"""
+    if not context:
+        return None
+    return {key: context[key] for key in _STORED_CONTEXT_KEYS if key in context}
+
+
+def _json_or_none(value: Any) -> Optional[str]:
+    return json.dumps(value, default=str) if value else None
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, timeout=5.0)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA busy_timeout=5000")
+    return connection
+
+
+class ProgressStore:
+    """
+    SQLite-backed learner progress with a background batched writer
+
+    Also serves as the session store's persister: save() receives session
+    snapshots (written behind) and load() rebuilds a session's history.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, max_pending: int = 100_000,
+                 keep_records: int = 1000):
+        """
+        Open (or create) the database and start the writer thread
+
+        Args:
+            path: SQLite database file
+            batch_size: Maximum queued writes applied per transaction
+            max_pending: Queued writes beyond this are dropped instead of blocking
+            keep_records: Call records kept per learner (older ones are pruned)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.keep_records = keep_records
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._local = threading.local()
+        self.records_written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.write_errors = 0
+
+        with _connect(path) as connection:
+            connection.executescript(_SCHEMA)
+        connection.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="progress-writer", daemon=True)
+        self._writer.start()
+
+    def _enqueue(self, item: tuple):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def record(self, session_id: str, call_record: Dict[str, Any]):
+        """
+        Queue a call record for writing; never blocks
+
+        Args:
+            session_id: Learner session the call belongs to
+            call_record: Record built by PedagogicalAPI._record_call
+        """
+        self._enqueue(("record", session_id, call_record))
+
+    def save(self, session_id: str, snapshot: Dict[str, Any]):
+        """
+        Queue a learner summary update (session persister interface)
+
+        Args:
+            session_id: Learner session id
+            snapshot: Session snapshot; only its "summary" part is stored,
+                since call records are appended as they happen
+        """
+        summary = snapshot.get("summary")
+        if summary:
+            self._enqueue(("summary", session_id, summary))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every write queued so far is committed
+
+        Returns:
+            True if the writer caught up within timeout
+        """
+        done = threading.Event()
+        try:
+            self._queue.put(("flush", done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _write_loop(self):
+        connection = _connect(self.path)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(connection, batch)
+            except sqlite3.Error:
+                # Progress is best effort; keep serving requests
+                self.write_errors += 1
+                connection.rollback()
+            for item in batch:
+                if item[0] == "flush":
+                    item[1].set()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: List[tuple]):
+        rows = []
+        method_counts: Counter = Counter()
+        call_counts: Counter = Counter()
+        summaries: Dict[str, Dict[str, Any]] = {}
+
+        for item in batch:
+            if item[0] == "record":
+                _, session_id, record = item
+                rows.append((
+                    session_id,
+                    record.get("method", "unknown"),
+                    record.get("args_count", 0),
+                    record.get("kwargs_count", 0),
+                    record.get("result_type", ""),
+                    _json_or_none(_plain(record.get("context"))),
+                    record.get("timestamp") or datetime.now().isoformat()
+                ))
+                method_counts[(session_id, record.get("method", "unknown"))] += 1
+                call_counts[session_id] += 1
+            elif item[0] == "summary":
+                summaries[item[1]] = item[2]
+
+        if not rows and not summaries:
+            return
+
+        now = datetime.now().isoformat()
+        with connection:
+            connection.executemany(
+                "INSERT INTO call_records (session_id, method, args_count, kwargs_count,"
+                " result_type, context, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            connection.executemany(
+                "INSERT INTO method_counts (session_id, method, calls) VALUES (?, ?, ?)"
+                " ON CONFLICT (session_id, method) DO UPDATE SET calls = calls + excluded.calls",
+                [(session_id, method, count) for (session_id, method), count in method_counts.items()]
+            )
+            connection.executemany(
+                "INSERT INTO learner_summary (session_id, total_calls, updated_at) VALUES (?, ?, ?)"
+                " ON CONFLICT (session_id) DO UPDATE SET"
+                " total_calls = total_calls + excluded.total_calls, updated_at = excluded.updated_at",
+                [(session_id, count, now) for session_id, count in call_counts.items()]
+            )
+            connection.executemany(
+                "INSERT INTO learner_summary (session_id, skill_level, mastered_concepts,"
+                " skill_trajectory, updated_at) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (session_id) DO UPDATE SET skill_level = excluded.skill_level,"
+                " mastered_concepts = excluded.mastered_concepts,"
+                " skill_trajectory = excluded.skill_trajectory, updated_at = excluded.updated_at",
+                [
+                    (session_id, summary.get("skill_level"),
+                     json.dumps(summary.get("mastered_concepts", [])),
+                     json.dumps(summary.get("skill_trajectory", [])), now)
+                    for session_id, summary in summaries.items()
+                ]
+            )
+            # Keep only the newest keep_records calls for learners written to
+            connection.executemany(
+                "DELETE FROM call_records WHERE session_id = ? AND id <= ("
+                " SELECT id FROM call_records WHERE session_id = ?"
+                " ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                [(session_id, session_id, self.keep_records) for session_id in call_counts]
+            )
+
+        self.records_written += len(rows)
+        self.batches += 1
+
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread read connection"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = _connect(self.path)
+        return connection
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild a learner's recent call history (session persister interface)
+
+        Returns:
+            Snapshot with "history" and "profile", or None for unknown learners
+        """
+        rows = self._reader().execute(
+            "SELECT method, args_count, kwargs_count, result_type, context, timestamp"
+            " FROM call_records WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+            (session_id, self.keep_records)
+        ).fetchall()
+        if not rows:
+            return None
+
+        history = [
+            {
+                'method': method,
+                'args_count': args_count,
+                'kwargs_count': kwargs_count,
+                'result_type': result_type,
+                'context': json.loads(context) if context else None,
+                'timestamp': timestamp
+            }
+            for method, args_count, kwargs_count, result_type, context, timestamp in reversed(rows)
+        ]
+        return {"history": history, "profile": {}}
+
+    def get_progress(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a learner's stored progress summary
+
+        Returns:
+            Progress dictionary, or None if nothing is stored for the learner
+        """
+        row = self._reader().execute(
+            "SELECT s.total_calls, s.skill_level, s.mastered_concepts, s.skill_trajectory,"
+            " s.updated_at, group_concat(m.method, char(31))"
+            " FROM learner_summary s LEFT JOIN method_counts m ON m.session_id = s.session_id"
+            " WHERE s.session_id = ? GROUP BY s.session_id",
+            (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        total_calls, skill_level, mastered, trajectory, updated_at, methods = row
+        return {
+            "session_id": session_id,
+            "total_calls": total_calls,
+            "method_diversity": sorted(methods.split("\x1f")) if methods else [],
+            "mastered_concepts": json.loads(mastered) if mastered else [],
+            "current_skill_level": skill_level or "beginner",
+            "skill_trajectory": json.loads(trajectory) if trajectory else [],
+            "updated_at": updated_at
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get writer statistics
+
+        Returns:
+            Dictionary with queue depth and write counters
+        """
+        return {
+            "path": self.path,
+            "pending": self._queue.qsize(),
+            "records_written": self.records_written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors
+        }
+
+
+def _open_default_store() -> Optional[ProgressStore]:
+    """Open the store named by CUBIT_PROGRESS_DB, if set"""
+    path = os.environ.get("CUBIT_PROGRESS_DB")
+    return ProgressStore(path) if path else None
+
+
+# Global progress store; None unless CUBIT_PROGRESS_DB is set
+progress_store = _open_default_store()
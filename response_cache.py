@@ -0,0 +1,85 @@
+"""
+Pre-encoded JSON responses with strong ETags and conditional GET support
+"""
+
+import json
+import hashlib
+from typing import Any
+from fastapi import Request
+from fastapi.responses import Response
+
+
+class JSONPayload:
+    """
+    A JSON document serialised once, together with its strong ETag
+    """
+
+    __slots__ = ("data", "body", "etag")
+
+    def __init__(self, data: Any):
+        """
+        Serialise data
+
+        Args:
+            data: JSON-compatible value
+        """
+        self.data = data
+        self.body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+
+
+class ConditionalRequestStats:
+    """Counts of conditional GETs answered with 304 (hits) versus full bodies (misses)"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self):
+        """
+        Get hit/miss counts and the hit ratio
+
+        Returns:
+            Dictionary with hits, misses and hit_ratio
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None
+        }
+
+
+# Global statistics for cached_json_response
+response_cache_stats = ConditionalRequestStats()
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def cached_json_response(request: Request, payload: JSONPayload,
+                         cache_control: str = "public, max-age=60") -> Response:
+    """
+    Serve a pre-encoded payload, answering 304 when the client's copy is current
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        payload: Pre-encoded response body
+        cache_control: Cache-Control header value
+
+    Returns:
+        200 response with the body, or an empty 304 response
+    """
+    headers = {"ETag": payload.etag, "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, payload.etag):
+        response_cache_stats.hits += 1
+        return Response(status_code=304, headers=headers)
+    response_cache_stats.misses += 1
+    return Response(content=payload.body, media_type="application/json", headers=headers)
@@ -0,0 +1,268 @@
+"""
+Server-side learner sessions for the pedagogical layer
+
+Each session keeps one PedagogicalAPI, so skill inference, progress and
+suggestions see the learner's whole call history instead of a single call.
+Sessions live in a bounded LRU with a time-to-live, and can optionally be
+written behind to a persister and reloaded from it after eviction.
+"""
+
+import os
+import time
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Protocol
+from progress_store import progress_store
+
+
+class SessionPersister(Protocol):
+    """Storage used to save session snapshots and reload evicted sessions"""
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return a snapshot ({"history": [...], "profile": {...}}) or None"""
+
+    def save(self, session_id: str, snapshot: Dict[str, Any]) -> None:
+        """Store a snapshot of a session"""
+
+
+class LearnerSession:
+    """
+    One learner's pedagogical state
+
+    The pedagogy object is shared by all of the learner's requests; hold
+    lock while using it, since requests run on the execution pool threads.
+    """
+
+    __slots__ = ("session_id", "pedagogy", "lock", "created_at", "last_access", "requests", "dirty")
+
+    def __init__(self, session_id: str, pedagogy: Any):
+        self.session_id = session_id
+        self.pedagogy = pedagogy
+        self.lock = threading.Lock()
+        self.created_at = time.time()
+        self.last_access = time.monotonic()
+        self.requests = 0
+        self.dirty = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the state a persister needs to restore this session"""
+        progress = self.pedagogy.get_learning_progress()
+        return {
+            "history": self.pedagogy.export_history(),
+            "profile": dict(self.pedagogy._user_profile),
+            "summary": {
+                "skill_level": self.pedagogy.get_skill_level(),
+                "mastered_concepts": progress.get("mastered_concepts", []),
+                "skill_trajectory": progress.get("skill_trajectory", [])
+            }
+        }
+
+    def restore(self, snapshot: Dict[str, Any]):
+        """Load state saved by snapshot()"""
+        self.pedagogy.import_history(list(snapshot.get("history", [])))
+        self.pedagogy._user_profile.update(snapshot.get("profile", {}))
+
+
+class SessionStore:
+    """
+    Bounded LRU + TTL store of learner sessions with O(1) lookups
+
+    The OrderedDict is kept in least-recently-used order, so expired sessions
+    are always at the front and eviction never scans the whole store.
+    """
+
+    def __init__(self, factory: Callable[[str], Any], max_sessions: int = 2000,
+                 ttl_seconds: float = 3600.0, persister: Optional[SessionPersister] = None,
+                 flush_interval: float = 5.0):
+        """
+        Initialize the store
+
+        Args:
+            factory: Creates the pedagogy object for a new session, given its id
+            max_sessions: Maximum number of sessions kept in memory
+            ttl_seconds: Idle time after which a session is dropped
+            persister: Optional storage for write-behind snapshots
+            flush_interval: Seconds between write-behind flushes
+        """
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.persister = persister
+        self.flush_interval = flush_interval
+        self._sessions: "OrderedDict[str, LearnerSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_thread: Optional[threading.Thread] = None
+        self.created = 0
+        self.restored = 0
+        self.evicted = 0
+        self.expired = 0
+
+    def _evict(self, now: float) -> List[LearnerSession]:
+        """Drop expired and over-capacity sessions; call with _lock held"""
+        dropped = []
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_access > self.ttl_seconds:
+                self.expired += 1
+            elif len(self._sessions) > self.max_sessions:
+                self.evicted += 1
+            else:
+                break
+            self._sessions.popitem(last=False)
+            dropped.append(oldest)
+        return dropped
+
+    def _save(self, sessions: List[LearnerSession]):
+        """Write dirty sessions to the persister, outside the store lock"""
+        if self.persister is None:
+            return
+        for session in sessions:
+            if not session.dirty:
+                continue
+            with session.lock:
+                session.dirty = False
+                snapshot = session.snapshot()
+            self.persister.save(session.session_id, snapshot)
+
+    def get(self, session_id: str) -> Optional[LearnerSession]:
+        """
+        Get an in-memory session without creating it
+
+        Returns:
+            The session, or None if unknown or expired
+        """
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or now - session.last_access > self.ttl_seconds:
+                return None
+            self._sessions.move_to_end(session_id)
+            session.last_access = now
+            return session
+
+    def get_or_create(self, session_id: str) -> LearnerSession:
+        """
+        Get a session, creating it (or reloading it from the persister) on a miss
+
+        Args:
+            session_id: Client-supplied session identifier
+
+        Returns:
+            The learner's session
+        """
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None and now - session.last_access <= self.ttl_seconds:
+                self._sessions.move_to_end(session_id)
+                session.last_access = now
+                return session
+            if session is not None:
+                # Expired: take it out here so its history is written before
+                # the persister is asked for the replacement's snapshot
+                del self._sessions[session_id]
+                self.expired += 1
+        if session is not None:
+            self._save([session])
+
+        # Build outside the lock: creating the pedagogy object is not free
+        session = LearnerSession(session_id, self.factory(session_id))
+        if self.persister is not None:
+            snapshot = self.persister.load(session_id)
+            if snapshot:
+                session.restore(snapshot)
+                self.restored += 1
+
+        with self._lock:
+            # Another request may have created the same session meanwhile
+            existing = self._sessions.get(session_id)
+            if existing is not None and now - existing.last_access <= self.ttl_seconds:
+                self._sessions.move_to_end(session_id)
+                existing.last_access = now
+                return existing
+            dropped = []
+            if existing is not None:
+                # Expired since it was created meanwhile; don't overwrite it unsaved
+                self.expired += 1
+                dropped.append(existing)
+            self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            self.created += 1
+            dropped += self._evict(now)
+
+        self._save(dropped)
+        return session
+
+    def mark_dirty(self, session: LearnerSession):
+        """
+        Note that a session changed and should be written behind
+
+        Args:
+            session: Session updated by a request
+        """
+        session.requests += 1
+        if self.persister is None:
+            return
+        session.dirty = True
+        if self._flush_thread is None:
+            with self._lock:
+                if self._flush_thread is None:
+                    self._flush_thread = threading.Thread(
+                        target=self._flush_loop, name="session-flush", daemon=True
+                    )
+                    self._flush_thread.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                # Persistence is best effort; sessions stay in memory
+                pass
+
+    def flush(self):
+        """Write all dirty sessions to the persister and drop expired ones"""
+        with self._lock:
+            dropped = self._evict(time.monotonic())
+            sessions = list(self._sessions.values())
+        self._save(dropped + sessions)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get session store statistics
+
+        Returns:
+            Dictionary with active session count, limits and counters
+        """
+        return {
+            "active": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "created": self.created,
+            "restored": self.restored,
+            "evicted": self.evicted,
+            "expired": self.expired,
+            "persistent": self.persister is not None
+        }
+
+
+def _create_pedagogy(session_id: str):
+    """Pedagogy object for a new session; the interpreter is attached per request"""
+    from pedagogical.api import PedagogicalAPI
+    pedagogy = PedagogicalAPI(None, structured_insights=True)
+    if progress_store is not None:
+        pedagogy.on_record = functools.partial(progress_store.record, session_id)
+    return pedagogy
+
+
+# Global learner session store used by the API, persisted to the progress
+# store (CUBIT_PROGRESS_DB) when one is configured
+session_store = SessionStore(
+    _create_pedagogy,
+    max_sessions=int(os.environ.get("CUBIT_SESSION_MAX", 2000)),
+    ttl_seconds=float(os.environ.get("CUBIT_SESSION_TTL", 3600)),
+    persister=progress_store,
+    flush_interval=1.0
+)
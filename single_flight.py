@@ -0,0 +1,82 @@
+"""
+Single-flight coalescing of identical in-flight requests
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Flight:
+    """One in-flight execution and the number of callers awaiting it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Share one execution between concurrent callers that use the same key.
+
+    The first caller for a key starts the work as its own task; it and the
+    callers arriving while it is still in flight all await that task.
+    A caller that is cancelled (e.g. its client disconnected) only stops
+    waiting; the work is cancelled once nobody is waiting for it anymore.
+    Nothing is cached once the work finishes.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, _Flight] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run work() unless an identical call is already in flight
+
+        Args:
+            key: Hashable identity of the call
+            work: Zero-argument coroutine function performing the call
+
+        Returns:
+            The result of the shared execution
+        """
+        loop = asyncio.get_running_loop()
+        flight = self._in_flight.get(key)
+        if flight is not None and flight.task.get_loop() is loop:
+            self.coalesced += 1
+        else:
+            flight = _Flight(asyncio.ensure_future(work()))
+            self._in_flight[key] = flight
+            self.executions += 1
+            flight.task.add_done_callback(lambda task: self._finished(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Last waiter gone: later callers start a fresh execution
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+
+    def _finished(self, key: Hashable, flight: _Flight):
+        self._forget(key, flight)
+        # Mark the exception as retrieved when nobody else was waiting
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get coalescing counters"""
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight)
+        }
@@ -0,0 +1,73 @@
+"""
+Tests for the batch execution endpoint /execute/batch
+"""
+
+import json
+
+from fastapi.testclient import TestClient
+from api import app
+
+client = TestClient(app)
+
+
+def run_batch(items):
+    response = client.post("/execute/batch", json={"items": items})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_results_and_summary():
+    """Every item gets one result line, followed by one summary line"""
+    lines = run_batch([
+        {"id": "a", "code": "print 1 + 1", "expected_output": "2"},
+        {"id": "b", "code": "print 1 + 1", "expected_output": "3"},
+        {"id": "c", "code": "print missing"},
+    ])
+    
+    results = {r["id"]: r for r in lines[:-1]}
+    summary = lines[-1]
+    
+    assert len(results) == 3
+    assert all(r["type"] == "result" for r in results.values())
+    assert results["a"]["passed"] is True
+    assert results["b"]["passed"] is False
+    assert results["a"]["output"] == "2\n"
+    assert "passed" not in results["c"]
+    assert "Undefined variable" in results["c"]["error"]
+    
+    assert summary["type"] == "summary"
+    assert summary["total"] == 3
+    assert summary["passed"] == 1
+    assert summary["failed"] == 1
+    assert summary["errors"] == 1
+    assert summary["unique_programs"] == 2
+    assert summary["total_duration_ms"] >= 0
+
+
+def test_batch_parse_error_per_item():
+    """A program that fails to parse only fails its own item"""
+    lines = run_batch([
+        {"code": "print ("},
+        {"code": "let x = 3\nprint x", "expected_output": "3\n"},
+    ])
+    
+    by_index = {r["index"]: r for r in lines if r["type"] == "result"}
+    assert by_index[0]["error"] is not None
+    assert by_index[1]["passed"] is True
+
+
+def test_batch_many_items():
+    """Large batches complete over a single connection"""
+    items = [{"id": str(i), "code": f"print {i}", "expected_output": str(i)} for i in range(200)]
+    lines = run_batch(items)
+    
+    assert lines[-1]["total"] == 200
+    assert lines[-1]["passed"] == 200
+    assert sorted(r["index"] for r in lines[:-1]) == list(range(200))
+
+
+def test_batch_requires_items():
+    """Missing items is a validation error"""
+    response = client.post("/execute/batch", json={})
+    assert response.status_code == 422
@@ -0,0 +1,54 @@
+"""
+Tests for batch skill inference over feature matrices
+"""
+
+import random
+from itertools import product
+import pytest
+
+from pedagogical import skill_inference
+from pedagogical.skill_inference import SkillFeatures, SkillInferenceEngine, SkillStatistics
+
+
+def _history_features(count=300, seed=5):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        names = [f"method_{i}" for i in range(rng.randint(1, 40))] + ["cache_get", "optimize"]
+        methods = [rng.choice(names) for _ in range(rng.randint(0, 150))]
+        rows.append(SkillStatistics.from_methods(methods, capacity=100).features())
+    return rows
+
+
+def _boundary_features():
+    # Values either side of every threshold the indicators use, including
+    # exact ratio boundaries (e.g. max_count == total * 0.5)
+    return [
+        SkillFeatures(total, unique, max_count, trigrams, changes, advanced)
+        for total, unique, max_count in product(
+            (0, 1, 3, 5, 9, 10, 20, 49, 50, 99, 100), (0, 3, 4, 5, 6, 8, 14, 15, 24, 25, 40), (0, 3, 5, 10, 30)
+        )
+        for trigrams, changes, advanced in ((0, 0, 0), (3, 1, 1), (2, 4, 0))
+    ]
+
+
+@pytest.mark.parametrize("rows", [_history_features(), _boundary_features()], ids=["histories", "boundaries"])
+def test_batch_matches_scalar_inference(rows, monkeypatch):
+    engine = SkillInferenceEngine()
+    expected = [engine.infer_from_statistics(row, {}) for row in rows]
+
+    if skill_inference.np is not None:
+        assert engine.infer_levels(rows) == expected
+        assert engine.infer_levels([list(row) for row in rows]) == expected
+    monkeypatch.setattr(skill_inference, "np", None)
+    assert engine.infer_levels(rows) == expected
+
+
+def test_features_snapshot_statistics():
+    stats = SkillStatistics.from_methods(['run', 'parse', 'run', 'cache_get'])
+    assert stats.features() == SkillFeatures(
+        total=4, unique_methods=3, max_count=2, distinct_trigrams=2, recent_changes=3, recent_advanced=1
+    )
+    engine = SkillInferenceEngine()
+    assert engine.infer_levels([stats.features()]) == [engine.infer_from_statistics(stats, {})]
+    assert engine.infer_levels([]) == []
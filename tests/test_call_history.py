@@ -0,0 +1,69 @@
+"""
+Tests for the ring-buffer call history
+"""
+
+import pytest
+
+from pedagogical.api import PedagogicalAPI
+from pedagogical.call_history import CallHistory, CallRecord
+
+
+def test_ring_buffer_keeps_newest_records_in_order():
+    history = CallHistory(3)
+    evicted = [history.append(CallRecord(f"m{i}")) for i in range(5)]
+
+    assert [e.method if e else None for e in evicted] == [None, None, None, "m0", "m1"]
+    assert len(history) == 3
+    assert [record.method for record in history] == ["m2", "m3", "m4"]
+    assert [record.method for record in history.records()] == ["m2", "m3", "m4"]
+    assert history[0].method == "m2" and history[-1].method == "m4"
+    assert [record.method for record in history[-2:]] == ["m3", "m4"]
+    with pytest.raises(IndexError):
+        history[3]
+
+    history.clear()
+    assert len(history) == 0 and list(history) == []
+
+
+def test_record_reads_like_a_dict_and_round_trips():
+    record = CallRecord("run", 1, 2, "str", {"file": "x.py"}, 0.0)
+
+    assert record["method"] == "run"
+    assert record.get("kwargs_count") == 2
+    assert record.get("missing", "default") == "default"
+    with pytest.raises(KeyError):
+        record["missing"]
+    assert isinstance(record["timestamp"], str)
+
+    data = record.to_dict()
+    assert set(data) == set(CallRecord.FIELDS)
+    again = CallRecord.from_dict(data)
+    assert again.to_dict() == data
+
+
+def test_method_names_are_interned():
+    first = CallRecord("".join(["ru", "n"]))
+    second = CallRecord("".join(["r", "un"]))
+    assert first.method is second.method
+
+
+def test_pedagogical_history_is_capped_without_copying():
+    class Target:
+        def run(self):
+            return None
+
+    ped = PedagogicalAPI(Target(), max_history=5, default_verbosity='minimal')
+    ped.insight_delivery.deliver = lambda *args, **kwargs: None
+    buffer = ped._call_history._records
+
+    for _ in range(12):
+        ped.call('run')
+
+    assert len(ped._call_history) == 5
+    assert ped._call_history._records is buffer
+    exported = ped.export_history()
+    assert len(exported) == 5 and all(call['method'] == 'run' for call in exported)
+
+    ped.import_history(exported + [{'method': 'walk'}])
+    assert [call['method'] for call in ped.export_history()][-1] == 'walk'
+    assert len(ped.export_history()) == 5
@@ -0,0 +1,125 @@
+"""
+Tests for response compression
+"""
+
+import json
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from api import app
+from compression import CompressionMiddleware, CompressionStats, negotiate_encoding
+
+client = TestClient(app)
+
+LARGE_OUTPUT_CODE = "let i = 0\nwhile i < 500 {\nprint \"row \" + str(i)\ni = i + 1\n}"
+
+
+def test_negotiate_encoding():
+    """q-values are honoured and server preference breaks ties"""
+    assert negotiate_encoding("gzip, deflate", ["gzip"]) == "gzip"
+    assert negotiate_encoding("br;q=0.5, gzip", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("gzip, br", ["br", "gzip"]) == "br"
+    assert negotiate_encoding("gzip;q=0", ["gzip"]) is None
+    assert negotiate_encoding("*", ["gzip"]) == "gzip"
+    assert negotiate_encoding("identity", ["gzip"]) is None
+
+
+def test_large_execute_output_is_compressed():
+    """Responses above the threshold are gzipped and still decode"""
+    response = client.post(
+        "/execute",
+        json={"code": LARGE_OUTPUT_CODE, "teaching_enabled": False},
+        headers={"Accept-Encoding": "gzip"}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert int(response.headers["content-length"]) < len(response.content) / 3
+    assert response.json()["output"].startswith("row 0\nrow 1\n")
+
+
+def test_small_response_not_compressed():
+    """Responses below the threshold are sent as-is"""
+    response = client.post(
+        "/execute",
+        json={"code": "print 1", "teaching_enabled": False},
+        headers={"Accept-Encoding": "gzip"}
+    )
+    
+    assert "content-encoding" not in response.headers
+
+
+def test_no_accept_encoding_not_compressed():
+    """Clients that don't accept gzip get the identity encoding"""
+    response = client.post(
+        "/execute",
+        json={"code": LARGE_OUTPUT_CODE, "teaching_enabled": False},
+        headers={"Accept-Encoding": "identity"}
+    )
+    
+    assert "content-encoding" not in response.headers
+    assert response.json()["output"].startswith("row 0\n")
+
+
+def test_event_stream_not_compressed():
+    """Server-Sent Events are never buffered or compressed"""
+    response = client.post(
+        "/execute/stream",
+        json={"code": LARGE_OUTPUT_CODE, "teaching_enabled": False},
+        headers={"Accept-Encoding": "gzip"}
+    )
+    
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_etag_is_weak_and_revalidates():
+    """Compressed cached responses carry a weak ETag that still yields 304"""
+    first = client.get("/curriculum", headers={"Accept-Encoding": "gzip"})
+    etag = first.headers["etag"]
+    
+    assert first.headers["content-encoding"] == "gzip"
+    assert etag.startswith("W/")
+    second = client.get("/curriculum", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert second.status_code == 304
+
+
+def test_streamed_body_compressed_incrementally():
+    """Streamed responses are compressed chunk by chunk into one valid gzip stream"""
+    stats = CompressionStats()
+    streaming_app = FastAPI()
+    streaming_app.add_middleware(CompressionMiddleware, minimum_size=1024, stats=stats)
+    
+    @streaming_app.get("/lines")
+    async def lines():
+        return StreamingResponse(
+            (json.dumps({"n": n}) + "\n" for n in range(1000)),
+            media_type="application/x-ndjson"
+        )
+    
+    @streaming_app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+    
+    local_client = TestClient(streaming_app)
+    response = local_client.get("/lines", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert len(response.text.splitlines()) == 1000
+    
+    local_client.get("/small", headers={"Accept-Encoding": "gzip"})
+    result = stats.get_stats()
+    assert result["compressed_responses"] == 1
+    assert result["skipped_below_threshold"] == 1
+    assert result["bytes_saved"] > 0
+    assert result["by_encoding"] == {"gzip": 1}
+
+
+def test_compression_stats_in_status():
+    """Compression counters are reported by the status endpoint"""
+    stats = client.get("/api/modules/status").json()["compression"]
+    
+    assert {"bytes_in", "bytes_out", "bytes_saved", "cpu_ms"} <= set(stats)
@@ -0,0 +1,128 @@
+"""
+Tests for loading the concept graph from curriculum data and snapshots
+"""
+
+import os
+import json
+import time
+import pytest
+
+from course_store import ConceptGraphSync, CourseContentStore, _course_directory
+from pedagogical.api import PedagogicalAPI
+from pedagogical.concept_mapper import ConceptDependencyMapper, ConceptGraphError, ConceptIndex
+
+
+CONCEPTS = [
+    {"name": "variables", "difficulty": "beginner", "description": "Naming values"},
+    {"name": "functions", "prerequisites": ["variables"], "difficulty": "beginner"},
+    {"name": "classes", "prerequisites": ["functions"], "category": "oop"},
+]
+
+
+def test_curriculum_concepts_match_the_built_in_graph():
+    with open(_course_directory() / "curriculum.json", encoding="utf-8") as f:
+        concepts = json.load(f)["concepts"]
+    built_in = ConceptDependencyMapper()
+    loaded = ConceptDependencyMapper(concepts)
+
+    assert loaded.concept_graph == built_in.concept_graph
+    assert list(loaded.concept_graph) == list(built_in.concept_graph)
+    assert loaded.concept_metadata == built_in.concept_metadata
+    assert loaded.suggest_next_concepts(['functions']) == built_in.suggest_next_concepts(['functions'])
+
+
+@pytest.mark.parametrize("concepts, message", [
+    ([{"name": "a"}, {"name": "a"}], "defined twice"),
+    ([{"name": "a", "prerequisites": ["missing"]}], "undefined concept"),
+    ([{"prerequisites": []}], "without a name"),
+    ([{"name": "a", "prerequisites": "b"}], "list of names"),
+    ([{"name": "a", "prerequisites": ["b"]}, {"name": "b", "prerequisites": ["a"]}], "cycle"),
+])
+def test_invalid_definitions_are_rejected_and_keep_the_current_graph(concepts, message):
+    mapper = ConceptDependencyMapper(CONCEPTS)
+    version = mapper.version
+    with pytest.raises(ConceptGraphError, match=message):
+        mapper.load_concepts(concepts)
+    assert mapper.version == version
+    assert mapper.get_prerequisites('classes') == ['variables', 'functions']
+
+
+def test_snapshot_round_trip(tmp_path):
+    mapper = ConceptDependencyMapper(CONCEPTS)
+    path = str(tmp_path / "concepts.bin")
+    mapper.save_snapshot(path)
+
+    restored = ConceptDependencyMapper()
+    version = restored.load_file(path)
+    assert version == restored.version == 2
+    assert restored.index.order == mapper.index.order
+    assert restored.concept_graph == mapper.concept_graph
+    assert restored.concept_metadata == mapper.concept_metadata
+
+    with pytest.raises(ConceptGraphError):
+        ConceptIndex.from_snapshot(b"CUBITCG1not zlib")
+    with pytest.raises(ConceptGraphError, match="before its prerequisite"):
+        ConceptIndex({'b': ['a']}, {}, order=['b', 'a'])
+
+
+def test_load_file_accepts_lists_and_curriculum_documents(tmp_path):
+    mapper = ConceptDependencyMapper()
+    as_list = tmp_path / "concepts.json"
+    as_list.write_text(json.dumps(CONCEPTS))
+    document = tmp_path / "curriculum.json"
+    document.write_text(json.dumps({"modules": [], "concepts": CONCEPTS[:2]}))
+
+    mapper.load_file(str(as_list))
+    assert 'classes' in mapper.concept_graph
+    mapper.load_file(str(document))
+    assert 'classes' not in mapper.concept_graph
+
+
+def test_sync_reloads_changed_curriculum(tmp_path):
+    path = tmp_path / "curriculum.json"
+    path.write_text(json.dumps({"modules": [], "concepts": CONCEPTS[:2]}))
+    store = CourseContentStore(tmp_path, names=["curriculum"], check_interval=0)
+    mapper = ConceptDependencyMapper()
+    sync = ConceptGraphSync(store, mapper)
+
+    sync.sync(wait=True)
+    assert set(mapper.concept_graph) == {'functions'}
+    version = mapper.version
+
+    sync.sync(wait=True)
+    assert mapper.version == version
+
+    path.write_text(json.dumps({"modules": [], "concepts": CONCEPTS}))
+    os.utime(path, ns=(1, 1))
+    sync.sync(wait=True)
+    assert set(mapper.concept_graph) == {'functions', 'classes'}
+
+    path.write_text(json.dumps({"modules": [], "concepts": [{"name": "x", "prerequisites": ["y"]}]}))
+    os.utime(path, ns=(2, 2))
+    sync.sync(wait=True)
+    assert 'undefined concept' in sync.get_stats()["error"]
+    assert set(mapper.concept_graph) == {'functions', 'classes'}
+
+
+
+def test_reads_of_the_mapper_pick_up_curriculum_edits(tmp_path):
+    path = tmp_path / "curriculum.json"
+    path.write_text(json.dumps({"modules": [], "concepts": CONCEPTS[:2]}))
+    store = CourseContentStore(tmp_path, names=["curriculum"], check_interval=0)
+    mapper = ConceptDependencyMapper()
+    sync = ConceptGraphSync(store, mapper)
+    sync.sync(wait=True)
+    mapper.on_access = sync.sync
+    ped = PedagogicalAPI(None, share_components=False)
+    ped.concept_mapper = mapper
+    ped.suggest_next_concepts()
+
+    path.write_text(json.dumps({"modules": [], "concepts": CONCEPTS}))
+    os.utime(path, ns=(1, 1))
+    # No /concepts request: the suggestion read itself starts the reload
+    for _ in range(200):
+        if sync.loads == 2:
+            break
+        ped.suggest_next_concepts()
+        time.sleep(0.01)
+    assert set(mapper.concept_graph) == {'functions', 'classes'}
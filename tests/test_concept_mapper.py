@@ -0,0 +1,72 @@
+"""
+Tests for the concept mapper's precomputed indexes
+"""
+
+import random
+import pytest
+
+from pedagogical.concept_mapper import ConceptDependencyMapper, ConceptGraphError, ConceptIndex
+
+
+def _random_dag(seed, size=60):
+    rng = random.Random(seed)
+    names = [f"c{i}" for i in range(size)]
+    graph = {}
+    for i, name in enumerate(names):
+        if i and rng.random() < 0.8:
+            graph[name] = set(rng.sample(names[:i], rng.randint(1, min(3, i))))
+    metadata = {name: {'difficulty': rng.choice(['beginner', 'intermediate', 'advanced'])} for name in names}
+    return graph, metadata
+
+
+def _naive_closure(graph, concept):
+    found, stack = set(), [concept]
+    while stack:
+        for prereq in graph.get(stack.pop(), ()):
+            if prereq not in found:
+                found.add(prereq)
+                stack.append(prereq)
+    return found
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_indexes_match_naive_graph_queries(seed):
+    graph, metadata = _random_dag(seed)
+    index = ConceptIndex(graph, metadata)
+
+    position = {concept: i for i, concept in enumerate(index.order)}
+    for concept, prereqs in graph.items():
+        for prereq in prereqs:
+            assert position[prereq] < position[concept]
+
+    for concept in metadata:
+        expected_closure = _naive_closure(graph, concept)
+        assert set(index.concepts_in(index.closures[concept])) == expected_closure
+        assert index.dependents[concept] == {c for c, p in graph.items() if concept in p}
+        if concept in graph:
+            assert set(index.siblings[frozenset(graph[concept])]) == {
+                c for c, p in graph.items() if p == graph[concept]
+            }
+
+
+def test_prerequisites_come_in_learning_order():
+    mapper = ConceptDependencyMapper()
+    assert mapper.get_prerequisites('polymorphism') == ['variables', 'functions', 'classes', 'inheritance']
+    assert mapper.get_prerequisites('dictionary_comprehensions') == ['loops', 'list_comprehensions']
+    assert mapper.get_prerequisites('unknown') == []
+
+    path = mapper.get_learning_path('classes')
+    assert [step['concept'] for step in path] == ['variables', 'functions', 'classes']
+    assert set(path[1]['next_concepts']) == {'classes', 'decorators', 'generators'}
+
+
+def test_related_concepts_use_siblings_and_both_directions():
+    mapper = ConceptDependencyMapper()
+    related = set(mapper.find_related_concepts('decorators'))
+    assert related == {'functions', 'classes', 'generators'}
+    assert set(mapper.find_related_concepts('variables')) == {'functions'}
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ConceptGraphError, match="cycle"):
+        ConceptIndex({'a': {'b'}, 'b': {'c'}, 'c': {'a'}, 'd': {'a'}}, {})
@@ -0,0 +1,72 @@
+"""
+Tests for bitset next-concept suggestions and the batch API
+"""
+
+import random
+import pytest
+
+from pedagogical import concept_mapper
+from pedagogical.concept_mapper import ConceptDependencyMapper
+
+
+def _synthetic_mapper(count=300, seed=3):
+    rng = random.Random(seed)
+    concepts = []
+    for i in range(count):
+        entry = {"name": f"c{i}"}
+        if i and rng.random() < 0.85:
+            entry["prerequisites"] = [f"c{p}" for p in rng.sample(range(i), min(i, rng.randint(1, 3)))]
+        concepts.append(entry)
+    return ConceptDependencyMapper(concepts)
+
+
+def _naive(mapper, mastered):
+    mastered = set(mastered)
+    return [c for c, prereqs in mapper.concept_graph.items() if c not in mastered and prereqs <= mastered]
+
+
+def _learners(mapper, count, seed=4):
+    rng = random.Random(seed)
+    names = mapper.index.order
+    learners = []
+    for _ in range(count):
+        known = rng.sample(names, rng.randint(0, len(names)))
+        learners.append(known + ["not_a_concept"])
+    # Classrooms repeat mastered sets
+    return learners + learners[:count // 4]
+
+
+def test_bitset_suggestions_match_subset_checks():
+    mapper = _synthetic_mapper()
+    for mastered in _learners(mapper, 40):
+        assert mapper.suggest_next_concepts(mastered) == _naive(mapper, mastered)
+
+    built_in = ConceptDependencyMapper()
+    assert built_in.suggest_next_concepts(['variables', 'functions', 'loops']) == [
+        'classes', 'decorators', 'generators', 'list_comprehensions'
+    ]
+
+
+def test_batch_matches_scalar_path(monkeypatch):
+    monkeypatch.setattr(concept_mapper, "np", None)
+    mapper = _synthetic_mapper()
+    learners = _learners(mapper, 100)
+
+    batch = mapper.suggest_next_concepts_batch(learners)
+    assert batch == [mapper.suggest_next_concepts(mastered) for mastered in learners]
+    assert mapper.suggest_next_concepts_batch([]) == []
+
+    # Results for learners sharing a mastered set are independent lists
+    batch[0].append("tampered")
+    assert "tampered" not in mapper.suggest_next_concepts_batch(learners)[0]
+
+
+def test_numpy_batch_matches_scalar_path(monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(concept_mapper, "_NUMPY_BLOCK_CELLS", 5000)
+    mapper = _synthetic_mapper()
+    learners = _learners(mapper, 3 * concept_mapper.NUMPY_BATCH_MIN)
+
+    assert mapper.suggest_next_concepts_batch(learners) == [
+        mapper.suggest_next_concepts(mastered) for mastered in learners
+    ]
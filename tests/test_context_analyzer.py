@@ -0,0 +1,77 @@
+"""
+Tests for lazy calling-context capture
+"""
+
+import inspect
+
+from pedagogical import context_analyzer
+from pedagogical.api import PedagogicalAPI
+from pedagogical.context_analyzer import ContextAnalyzer, LazyContext
+
+
+def _capture(method):
+    """Stand-in for PedagogicalAPI.call; the context describes two frames up"""
+    return method(inspect.currentframe())
+
+
+def _wrapper(method):
+    return _capture(method)
+
+
+def _caller(analyzer, method):
+    answer = 42
+    return _wrapper(method)
+
+
+def test_lazy_context_matches_eager_analysis():
+    """Every key of the lazy context equals the eager analysis"""
+    analyzer = ContextAnalyzer()
+    lazy = _caller(analyzer, analyzer.analyze)
+    eager = _caller(analyzer, analyzer.analyze_now)
+    
+    assert isinstance(lazy, LazyContext)
+    for key in ('file', 'function', 'local_variables', 'module', 'code_snippet'):
+        assert lazy[key] == eager[key], key
+    assert lazy['function'] == '_caller'
+    assert lazy['local_variables']['answer'] == 'int'
+    assert '>>> ' in lazy['code_snippet']
+    assert set(lazy) == set(eager)
+
+
+def test_nothing_computed_until_read(monkeypatch):
+    """Capturing does not touch source lines; reading the snippet does, once"""
+    reads = []
+    original = context_analyzer.linecache.getlines
+    monkeypatch.setattr(context_analyzer.linecache, "getlines", lambda name: reads.append(name) or original(name))
+    
+    analyzer = ContextAnalyzer()
+    context = _caller(analyzer, analyzer.analyze)
+    assert reads == []
+    
+    context['code_snippet']
+    context['code_snippet']
+    assert len(reads) == 1
+
+
+def test_release_drops_frame():
+    """After release, frame-dependent keys fall back to unknown values"""
+    analyzer = ContextAnalyzer()
+    context = _caller(analyzer, analyzer.analyze)
+    context.release()
+    
+    assert context['local_variables'] == {}
+    assert context['module'] == 'unknown'
+    assert context['function'] == '_caller'
+
+
+def test_pedagogical_call_releases_context():
+    """Recorded contexts don't keep caller frames alive"""
+    class Calculator:
+        def add(self, a, b):
+            return a + b
+    
+    api = PedagogicalAPI(Calculator(), default_verbosity='minimal')
+    assert api.call('add', 1, 2) == 3
+    
+    context = api.export_history()[-1]['context']
+    assert context._frame is None
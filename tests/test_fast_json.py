@@ -0,0 +1,77 @@
+"""
+Tests for the fast JSON response path
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+import api
+from fast_json import dumps, iter_json_object
+
+client = TestClient(api.app)
+
+
+def test_dumps_matches_stdlib():
+    """Encoded output decodes to the same value as the standard encoder"""
+    value = {"output": "héllo\n\"quoted\"\t", "result": [1, 2.5, True, None], "nested": {"a": "b"}}
+    assert json.loads(dumps(value)) == value
+
+
+def test_dumps_large_integers():
+    """Integers beyond 64 bits still encode"""
+    assert json.loads(dumps({"result": 2 ** 100})) == {"result": 2 ** 100}
+
+
+def test_iter_json_object_streams_large_field():
+    """Chunked encoding yields the same document as a single dumps call"""
+    data = {"output": "line \"x\" \\ é\n" * 5000, "result": 3, "error": None}
+    chunks = list(iter_json_object(data, "output", chunk_chars=1000))
+    
+    assert len(chunks) > 3
+    assert b"".join(chunks) == dumps(data)
+
+
+@pytest.fixture
+def fast_json(monkeypatch):
+    monkeypatch.setattr(api, "FAST_JSON_RESPONSES", True)
+
+
+def test_execute_fast_path_same_payload(fast_json):
+    """The fast path returns the same fields as the validated path"""
+    body = {"code": "let x = 4\nprint x * 2", "teaching_enabled": False}
+    fast = client.post("/execute", json=body)
+    
+    assert fast.status_code == 200
+    assert fast.json() == {
+        "output": "8\n",
+        "result": 8,
+        "error": None,
+        "teaching_moment": None,
+        "skill_level": None,
+        "progress": None,
+        "suggestions": None,
+        "shapes": None
+    }
+
+
+def test_execute_fast_path_streams_large_output(fast_json, monkeypatch):
+    """Outputs above the threshold are streamed and still decode correctly"""
+    monkeypatch.setattr(api, "STREAM_OUTPUT_MIN_CHARS", 100)
+    code = "let i = 0\nwhile i < 50 {\nprint \"row\"\ni = i + 1\n}"
+    response = client.post("/execute", json={"code": code, "teaching_enabled": False})
+    
+    assert response.status_code == 200
+    assert response.json()["output"] == "row\n" * 50
+
+
+def test_games_and_debug_fast_path(fast_json):
+    """Games and debug responses work through the fast path"""
+    games = client.post(
+        "/games/execute",
+        json={"game": "AnimatedArt", "code": "draw_circle(1, 2, 3)", "teaching_enabled": False}
+    )
+    assert games.json()["shapes"][0]["type"] == "circle"
+    
+    debug = client.post("/api/execute/debug", json={"code": "print 1", "teaching_enabled": False})
+    assert debug.json()["final_result"]["output"] == "1\n"
@@ -2,9 +2,12 @@
 Tests for the games API endpoints
 """
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from api import app
+from course_store import CourseContentStore
 
 client = TestClient(app)
 
@@ -28,6 +31,47 @@ def test_get_games_endpoint():
     assert "instructions" in game
 
 
+def test_get_games_etag_and_not_modified():
+    """GET /games carries a strong ETag and answers 304 when unchanged"""
+    response = client.get("/games")
+    etag = response.headers["etag"]
+    assert etag.startswith('"')
+    assert "max-age" in response.headers["cache-control"]
+    
+    cached = client.get("/games", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+def test_get_challenges_and_curriculum():
+    """Challenges and curriculum course files are served too"""
+    challenges = client.get("/challenges")
+    assert challenges.status_code == 200
+    assert len(challenges.json()["challenges"]) > 0
+    
+    curriculum = client.get("/curriculum")
+    assert curriculum.status_code == 200
+    assert len(curriculum.json()["modules"]) > 0
+
+
+def test_course_store_reloads_changed_file(tmp_path):
+    """A modified course file is picked up and gets a new ETag"""
+    path = tmp_path / "games.json"
+    path.write_text(json.dumps({"games": [{"title": "One"}]}))
+    store = CourseContentStore(tmp_path, names=["games"], check_interval=0)
+    first = store.get("games")
+    assert first.data["games"][0]["title"] == "One"
+    
+    path.write_text(json.dumps({"games": [{"title": "Two"}, {"title": "Three"}]}))
+    second = store.get("games")
+    assert second.data["games"][0]["title"] == "Two"
+    assert second.etag != first.etag
+    
+    # A broken edit keeps the last good version
+    path.write_text("{not json")
+    assert store.get("games") is second
+
+
 def test_execute_game_code_simple():
     """Test POST /games/execute with simple draw commands"""
     response = client.post(
@@ -0,0 +1,72 @@
+"""
+Tests for structured, lazily rendered insights
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import app
+from pedagogical.api import PedagogicalAPI
+from pedagogical.insight_delivery import InsightDelivery
+
+client = TestClient(app)
+
+MOMENT = {
+    'level': 'beginner',
+    'focus': 'basic_usage',
+    'explanation': "The run method executes a program. " * 5,
+    'why_it_exists': "Programs need an entry point.",
+    'pitfalls': ["Forgetting to print results"],
+    'related_concepts': [],
+}
+
+
+class Target:
+    def run(self):
+        return 1
+
+
+@pytest.mark.parametrize("verbosity", ['minimal', 'normal', 'detailed'])
+def test_echo_prints_the_rendered_insight(verbosity, capsys):
+    insight = InsightDelivery(verbosity).deliver(MOMENT, None)
+
+    assert capsys.readouterr().out == insight.render() == str(insight)
+    assert insight.verbosity == verbosity
+
+
+def test_structured_delivery_does_not_render(capsys):
+    insight = InsightDelivery('normal', echo=False).deliver(MOMENT, None)
+
+    assert capsys.readouterr().out == ""
+    assert insight._text is None
+    assert insight.to_dict() == {
+        'level': 'beginner',
+        'focus': 'basic_usage',
+        'verbosity': 'normal',
+        'sections': [
+            {'key': 'explanation', 'title': 'Explanation', 'text': MOMENT['explanation']},
+            {'key': 'why_it_exists', 'title': 'Why This Matters', 'text': MOMENT['why_it_exists']},
+            {'key': 'pitfalls', 'title': '⚠️  Common Pitfalls', 'items': MOMENT['pitfalls']},
+        ]
+    }
+    assert "LEARNING MOMENT [BEGINNER]" in insight.render()
+    assert "  • Forgetting to print results" in insight.render()
+
+
+def test_pedagogical_api_keeps_the_last_insight(capsys):
+    ped = PedagogicalAPI(Target(), structured_insights=True)
+    assert ped.last_insight is None
+    ped.call('run')
+
+    assert capsys.readouterr().out == ""
+    assert ped.last_insight.level == ped.get_skill_level()
+
+
+def test_execute_returns_insights_apart_from_program_output():
+    response = client.post("/execute", json={"code": "print \"hello\"", "teaching_enabled": True})
+    data = response.json()
+
+    assert data["output"] == "hello\n"
+    insight = data["teaching_moment"]["insight"]
+    assert insight["verbosity"] == "normal"
+    assert any(section["key"] == "explanation" for section in insight["sections"])
@@ -0,0 +1,80 @@
+"""
+Tests for the Prometheus /metrics endpoint
+"""
+
+import re
+
+from fastapi.testclient import TestClient
+import api
+from api import app
+
+client = TestClient(app)
+
+
+def _samples(text):
+    """Parse exposition text into {series: value}"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            series, value = line.rsplit(" ", 1)
+            samples[series] = float(value)
+    return samples
+
+
+def test_metrics_exposition_format():
+    """Every family has HELP and TYPE lines and well-formed samples"""
+    response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for family in (
+        "cubit_module_requests_total", "cubit_module_errors_total",
+        "cubit_module_request_duration_seconds", "cubit_execution_pool_queue_depth",
+        "cubit_cache_hit_ratio", "cubit_interpreter_steps_total", "process_resident_memory_bytes"
+    ):
+        assert f"# TYPE {family} " in response.text
+    for line in response.text.splitlines():
+        if not line.startswith("#"):
+            assert re.match(r'^[a-z_]+(\{[^}]*\})? [-+0-9.eInfNa]+$', line), line
+
+
+def test_metrics_track_activity():
+    """Executions show up in module, histogram and interpreter counters"""
+    before = _samples(client.get("/metrics").text)
+    client.post("/api/execute/debug", json={"code": "let x = 1\nprint x", "teaching_enabled": False})
+    after = _samples(client.get("/metrics").text)
+    
+    series = 'cubit_module_requests_total{module="lexer"}'
+    assert after[series] == before[series] + 1
+    assert after["cubit_interpreter_steps_total"] >= before["cubit_interpreter_steps_total"] + 2
+    assert after['cubit_module_request_duration_seconds_bucket{module="lexer",le="+Inf"}'] == \
+        after['cubit_module_request_duration_seconds_count{module="lexer"}']
+    assert after["process_resident_memory_bytes"] > 0
+
+
+def test_scrape_publishes_once(monkeypatch):
+    """One scrape merges the thread shards once, not once per module and family"""
+    publishes = []
+    original = api.metrics_tracker.publish
+    
+    def counting_publish():
+        publishes.append(1)
+        original()
+    
+    monkeypatch.setattr(api.metrics_tracker, "publish", counting_publish)
+    assert client.get("/metrics").status_code == 200
+    assert len(publishes) == 1
+    
+    publishes.clear()
+    assert client.get("/api/modules/status").status_code == 200
+    assert len(publishes) == 1
+
+
+def test_etag_hits_counted():
+    """304 answers count as cache hits"""
+    etag = client.get("/concepts").headers["etag"]
+    before = _samples(client.get("/metrics").text)['cubit_cache_hits_total{cache="etag"}']
+    client.get("/concepts", headers={"If-None-Match": etag})
+    after = _samples(client.get("/metrics").text)['cubit_cache_hits_total{cache="etag"}']
+    
+    assert after == before + 1
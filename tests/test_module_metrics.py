@@ -0,0 +1,164 @@
+"""
+Tests for module metrics
+"""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import module_metrics
+from module_metrics import ModuleMetrics, bucket_index, bucket_upper_bound
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_private_metrics():
+    """Requests, errors and averages are tracked per module"""
+    metrics = ModuleMetrics()
+    metrics.record_request("lexer", 2.0, True)
+    metrics.record_request("lexer", 4.0, False)
+    
+    result = metrics.get_metrics("lexer")
+    assert result["total_requests"] == 2
+    assert result["avg_response_time_ms"] == 3.0
+    assert result["error_rate"] == 0.5
+    assert result["last_request_time"] is not None
+    assert metrics.get_metrics("parser")["total_requests"] == 0
+
+
+def test_concurrent_recording_is_exact():
+    """Threads recording through one handle lose no updates"""
+    metrics = ModuleMetrics()
+    handle = metrics.handle("interpreter")
+    
+    def work():
+        for _ in range(5000):
+            handle.record(2_000_000, success=True)
+        handle.record(1_000, success=False)
+    
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    requests, errors, duration_ns = metrics.get_totals("interpreter")
+    assert requests == 8 * 5001
+    assert errors == 8
+    assert duration_ns == 8 * (5000 * 2_000_000 + 1_000)
+    assert metrics.get_histogram("interpreter")[bucket_index(2000)] == 8 * 5000
+    assert metrics.get_metrics("interpreter")["last_request_time"] is not None
+
+
+def test_histogram_buckets_cover_values():
+    """Every latency falls into a bucket whose bounds contain it"""
+    for value in (0, 1, 3, 4, 5, 7, 8, 100, 1000, 12345, 10 ** 6, 10 ** 8):
+        index = bucket_index(value)
+        assert value <= bucket_upper_bound(index)
+        assert index == 0 or value > bucket_upper_bound(index - 1)
+
+
+def test_latency_percentiles():
+    """Percentiles come from the histogram and are capped by the max"""
+    metrics = ModuleMetrics()
+    for _ in range(90):
+        metrics.record_request("parser", 1.0, True)
+    for _ in range(10):
+        metrics.record_request("parser", 200.0, True)
+    
+    latency = metrics.get_metrics("parser")["latency_ms"]
+    assert set(latency) == {"1m", "5m", "1h", "all"}
+    summary = latency["1m"]
+    assert summary["count"] == 100
+    assert 1.0 <= summary["p50"] <= 1.2
+    assert 200.0 <= summary["p99"] <= 240.0
+    assert summary["max"] == 200.0
+    assert metrics.get_metrics("lexer")["latency_ms"]["all"]["p50"] is None
+
+
+def test_latency_windows_slide(monkeypatch):
+    """Old periods drop out of the short windows but stay in the long ones"""
+    metrics = ModuleMetrics()
+    now = [1_000_000 * 10 ** 9]
+    monkeypatch.setattr(module_metrics.time, "time_ns", lambda: now[0])
+    
+    metrics.record_request("lexer", 5.0, True)
+    metrics.publish()
+    now[0] += 120 * 10 ** 9
+    metrics.record_request("lexer", 5.0, True)
+    
+    latency = metrics.get_latency("lexer")
+    assert latency["1m"]["count"] == 1
+    assert latency["5m"]["count"] == 2
+    assert latency["all"]["count"] == 2
+    
+    now[0] += 2 * 3600 * 10 ** 9
+    latency = metrics.get_latency("lexer")
+    assert latency["1h"]["count"] == 0
+    assert latency["all"]["count"] == 2
+
+
+def test_publish_tolerates_torn_shard_reads():
+    """Snapshots taken in the middle of a lock-free record() publish cleanly"""
+    metrics = ModuleMetrics()
+    handle = metrics.handle("lexer")
+    handle.record(2_000_000)
+    metrics.publish()
+    counters = metrics._shards[0].modules[handle.index]
+    
+    # record() stopped after the bucket: nothing to publish yet
+    counters[module_metrics._SHARD_BUCKETS + bucket_index(3000)] += 1
+    assert metrics.get_totals("lexer")[0] == 1
+    counters[module_metrics._SHARD_REQUESTS] += 1
+    assert metrics.get_totals("lexer")[0] == 2
+    assert sum(metrics.get_histogram("lexer")) == 2
+    
+    # A request count with no bucket change leaves the histograms alone
+    counters[module_metrics._SHARD_REQUESTS] += 1
+    assert metrics.get_totals("lexer")[0] == 3
+    latency = metrics.get_latency("lexer")["all"]
+    assert (latency["count"], latency["max"]) == (2, 2.0)
+
+
+def test_publisher_survives_errors(monkeypatch):
+    """An exception in a background publish is counted, not fatal"""
+    metrics = ModuleMetrics(publish_interval=0.001)
+    calls = []
+    
+    def failing_publish():
+        calls.append(1)
+        raise RuntimeError("boom")
+    
+    monkeypatch.setattr(metrics, "publish", failing_publish)
+    metrics.handle("lexer").record(1000)
+    for _ in range(500):
+        if len(calls) >= 3:
+            break
+        time.sleep(0.01)
+    assert metrics.publish_errors >= 2
+    assert metrics._publisher.is_alive()
+
+
+def test_metrics_aggregate_across_processes(tmp_path):
+    """Workers sharing a metrics file are summed by any reader"""
+    path = tmp_path / "metrics.bin"
+    script = (
+        "import sys; from module_metrics import ModuleMetrics\n"
+        "m = ModuleMetrics(sys.argv[1])\n"
+        "for _ in range(5): m.record_request('interpreter', 1.0, True)\n"
+        "m.record_request('games-executor', 1.0, False)\n"
+    )
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", script, str(path)], cwd=REPO_ROOT, check=True)
+    
+    metrics = ModuleMetrics(str(path))
+    metrics.record_request("interpreter", 1.0, True)
+    
+    assert metrics.get_metrics("interpreter")["total_requests"] == 11
+    games = metrics.get_metrics("games-executor")
+    assert games["total_requests"] == 2
+    assert games["error_rate"] == 1.0
+    assert metrics.get_latency("interpreter")["all"]["count"] == 11
+    assert metrics.get_worker_count() == 1
@@ -189,6 +189,24 @@ def test_progress_endpoint_structure():
     assert isinstance(data["skill_trajectory"], list)
 
 
+def test_static_responses_are_cached():
+    """/ and /concepts are pre-encoded and support conditional GET"""
+    for path in ["/", "/concepts"]:
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        
+        again = client.get(path)
+        assert again.headers["etag"] == etag
+        assert again.content == response.content
+        
+        not_modified = client.get(path, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+    
+    concepts = client.get("/concepts").json()
+    assert "functions" in concepts["graph"]["decorators"]["prerequisites"]
+
+
 def test_execute_teaching_moment():
     """Test that /execute now includes teaching_moment field"""
     response = client.post(
@@ -235,5 +253,118 @@ def test_step_timestamps_and_durations():
         assert step["duration_ms"] >= 0
 
 
+def test_execute_debug_ast_dump_and_node_timings():
+    """Parser step carries a full AST dump annotated with per-node timing"""
+    response = client.post(
+        "/api/execute/debug",
+        json={
+            "code": "let x = 2\nprint x * 3",
+            "teaching_enabled": False
+        }
+    )
+    
+    data = response.json()
+    parser_step, interpreter_step = data["steps"][1], data["steps"][2]
+    
+    ast = parser_step["output"]["ast"]
+    assert ast["type"] == "BlockNode"
+    assert [s["type"] for s in ast["statements"]] == ["AssignmentNode", "PrintNode"]
+    assert ast["statements"][1]["expression"]["operator"] == "*"
+    assert ast["calls"] == 1
+    assert ast["time_ms"] >= 0
+    
+    timings = interpreter_step["output"]["node_timings"]
+    assert timings["BinaryOpNode"]["calls"] == 1
+    assert interpreter_step["output"]["variables"] == {"x": 2}
+    assert data["final_result"]["output"] == "6\n"
+
+
+def test_execute_debug_error_attributed_to_phase():
+    """Errors are reported on the step of the phase that raised them"""
+    response = client.post(
+        "/api/execute/debug",
+        json={"code": "print missing", "teaching_enabled": False}
+    )
+    
+    steps = response.json()["steps"]
+    assert [s["module"] for s in steps] == ["lexer", "parser", "interpreter"]
+    assert steps[-1]["status"] == "error"
+    assert "ast" in steps[1]["output"]
+
+
+def test_execute_debug_compact_tokens():
+    """Tokens use the compact [type_id, line, column, value_index] encoding"""
+    response = client.post(
+        "/api/execute/debug",
+        json={"code": "let x = 1", "teaching_enabled": False}
+    )
+    
+    tokens = response.json()["steps"][0]["output"]["tokens"]
+    assert tokens["encoding"] == ["type_id", "line", "column", "value_index"]
+    assert tokens["total"] == 5
+    assert tokens["next_cursor"] is None
+    
+    type_id, line, column, value_index = tokens["items"][0]
+    assert tokens["types"][type_id] == "LET"
+    assert (line, column) == (1, 1)
+    assert tokens["values"][value_index] == "let"
+    
+    # EOF has no value
+    assert tokens["items"][-1][3] == -1
+
+
+def test_execute_debug_token_pagination():
+    """Large token lists are paged and fetched by cursor"""
+    code = "\n".join(f"let x{i} = {i}" for i in range(300))
+    response = client.post(
+        "/api/execute/debug",
+        json={"code": code, "teaching_enabled": False}
+    )
+    
+    first = response.json()["steps"][0]["output"]["tokens"]
+    assert first["total"] == 1500
+    assert len(first["items"]) == 500
+    assert first["debug_id"] is not None
+    
+    items = list(first["items"])
+    cursor = first["next_cursor"]
+    while cursor is not None:
+        page = client.get(
+            f"/api/execute/debug/{first['debug_id']}/tokens",
+            params={"cursor": cursor, "limit": 400}
+        ).json()
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+    
+    assert len(items) == 1500
+
+
+def test_debug_tokens_unknown_id():
+    """Unknown debug ids return 404"""
+    response = client.get("/api/execute/debug/does-not-exist/tokens")
+    assert response.status_code == 404
+
+
+def test_execute_debug_response_size_is_bounded():
+    """Large programs get capped, flagged step payloads instead of a huge response"""
+    code = "\n".join(f"let x{i} = {i}\nprint x{i}" for i in range(15000))
+    response = client.post(
+        "/api/execute/debug",
+        json={"code": code, "teaching_enabled": False}
+    )
+    
+    assert len(response.content) < 1_000_000
+    data = response.json()
+    statements = data["steps"][1]["output"]["ast"]["statements"]
+    assert statements[-1] == {"truncated": True, "omitted": 30000 - len(statements) + 1}
+    
+    output = data["steps"][2]["output"]
+    assert output["stdout_truncated"] and output["variables_truncated"]
+    assert not output["node_timings_truncated"]
+    assert 0 < len(output["variables"]) < 15000
+    assert data["final_result"]["output_truncated"]
+    assert len(data["final_result"]["output"]) == len(output["stdout"])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""
+Tests for memoised pedagogical summaries keyed by history version
+"""
+
+from collections import Counter
+
+from pedagogical.api import PedagogicalAPI
+
+
+class Target:
+    def run(self):
+        return None
+
+
+def _counting(ped):
+    """Count calls into the components that derive summaries from history"""
+    calls = Counter()
+
+    def wrap(component, name):
+        original = getattr(component, name)
+
+        def counted(*args, **kwargs):
+            calls[name] += 1
+            return original(*args, **kwargs)
+        setattr(component, name, counted)
+
+    wrap(ped.skill_inference, 'infer_from_statistics')
+    wrap(ped.skill_inference, 'get_skill_progression')
+    wrap(ped.learning_engine, 'get_progress')
+    wrap(ped.concept_mapper, 'suggest_next_concepts')
+    return calls
+
+
+def _reads(ped):
+    return (
+        ped.get_skill_level(),
+        ped.get_skill_level(),
+        ped.get_learning_progress(),
+        ped.suggest_next_concepts()[:5],
+        ped.get_skill_trajectory(),
+    )
+
+
+def test_repeated_reads_are_computed_once_per_history_version():
+    ped = PedagogicalAPI(Target(), default_verbosity='minimal', share_components=False)
+    ped.insight_delivery.deliver = lambda *args, **kwargs: None
+    ped.call('run')
+    calls = _counting(ped)
+
+    first = _reads(ped)
+    second = _reads(ped)
+
+    assert first == second
+    # The skill level was already computed (and memoised) inside call()
+    assert calls == Counter({
+        'get_progress': 1,
+        'suggest_next_concepts': 1, 'get_skill_progression': 1
+    })
+
+
+def test_history_changes_invalidate_memoised_values():
+    ped = PedagogicalAPI(Target(), default_verbosity='minimal')
+    ped.insight_delivery.deliver = lambda *args, **kwargs: None
+    ped.call('run')
+    version = ped.history_version
+    assert ped.get_learning_progress()['total_calls'] == 1
+
+    ped.call('run')
+    assert ped.history_version > version
+    assert ped.get_learning_progress()['total_calls'] == 2
+
+    ped.import_history([{'method': 'run'}] * 5)
+    assert ped.get_learning_progress()['total_calls'] == 5
+
+    ped.reset_history()
+    assert ped.get_learning_progress()['total_calls'] == 0
+
+
+def test_callers_cannot_mutate_memoised_values():
+    ped = PedagogicalAPI(Target(), default_verbosity='minimal')
+    ped.get_learning_progress()['total_calls'] = 99
+    mastered = list(ped.get_learning_progress()['mastered_concepts'])
+    ped.get_learning_progress()['mastered_concepts'].append('tampered')
+    suggestions = ped.suggest_next_concepts()
+    ped.suggest_next_concepts().append('tampered')
+
+    assert ped.get_learning_progress()['total_calls'] == 0
+    assert ped.get_learning_progress()['mastered_concepts'] == mastered
+    assert ped.suggest_next_concepts() == suggestions == ped.concept_mapper.suggest_next_concepts(mastered)
+
+    for _ in range(10):
+        ped.call('run')
+    ped.get_skill_trajectory()[0]['skill_level'] = 'tampered'
+    assert ped.get_skill_trajectory()[0]['skill_level'] != 'tampered'
@@ -0,0 +1,123 @@
+"""
+Tests for the SQLite learner progress store
+"""
+
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+import api
+import session_store as session_module
+from interpreter import Interpreter
+from pedagogical.api import PedagogicalAPI
+from progress_store import ProgressStore
+from session_store import SessionStore
+
+
+def _record(method="run"):
+    return {
+        'method': method,
+        'args_count': 1,
+        'kwargs_count': 0,
+        'result_type': 'int',
+        'context': {'function': 'test', 'local_variables': {}},
+        'timestamp': '2026-01-01T00:00:00'
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProgressStore(str(tmp_path / "progress.db"), keep_records=5)
+
+
+def test_database_uses_wal(store):
+    """The database runs in WAL mode"""
+    connection = sqlite3.connect(store.path)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_records_batched_and_counted(store):
+    """Queued records are committed together and summarised per method"""
+    for method in ("run", "run", "set_verbosity"):
+        store.record("learner", _record(method))
+    store.save("learner", {"summary": {"skill_level": "intermediate", "mastered_concepts": ["run"]}})
+    assert store.flush()
+    
+    progress = store.get_progress("learner")
+    assert progress["total_calls"] == 3
+    assert progress["method_diversity"] == ["run", "set_verbosity"]
+    assert progress["current_skill_level"] == "intermediate"
+    assert progress["mastered_concepts"] == ["run"]
+    assert store.get_stats()["batches"] <= 2
+    assert store.get_progress("someone-else") is None
+
+
+def test_load_returns_recent_history_in_order(store):
+    """History is rebuilt oldest first, pruned to keep_records"""
+    for index in range(8):
+        store.record("learner", _record(f"m{index}"))
+    store.flush()
+    
+    history = store.load("learner")["history"]
+    assert [call["method"] for call in history] == ["m3", "m4", "m5", "m6", "m7"]
+    assert history[0]["context"] == {"function": "test"}
+    assert store.load("unknown") is None
+
+
+def test_session_hydrated_after_restart(tmp_path):
+    """A new session store (e.g. after a restart) reloads the learner's history"""
+    path = str(tmp_path / "progress.db")
+    
+    def factory(store):
+        def create(session_id):
+            pedagogy = PedagogicalAPI(None)
+            pedagogy.on_record = lambda record: store.record(session_id, record)
+            return pedagogy
+        return create
+    
+    first = ProgressStore(path)
+    sessions = SessionStore(factory(first), persister=first)
+    pedagogy = sessions.get_or_create("learner").pedagogy
+    pedagogy.wrapped_api = Interpreter()
+    pedagogy.call('run', 'let x = 1')
+    pedagogy.call('run', 'let y = 2')
+    first.flush()
+    
+    second = ProgressStore(path)
+    restarted = SessionStore(factory(second), persister=second)
+    restored = restarted.get_or_create("learner").pedagogy
+    history = restored.export_history()
+    assert [call["method"] for call in history] == ["run", "run"]
+    # Only the call site of the released context is kept
+    assert set(history[0]["context"]) == {"file", "function", "line_number"}
+
+
+def test_progress_endpoint_prefers_live_session(store, monkeypatch):
+    """/progress answers from the live session and falls back to the store"""
+    sessions = SessionStore(session_module._create_pedagogy, persister=store, flush_interval=60)
+    monkeypatch.setattr(session_module, "progress_store", store)
+    monkeypatch.setattr(api, "progress_store", store)
+    monkeypatch.setattr(api, "session_store", sessions)
+    client = TestClient(api.app)
+    
+    client.post("/execute", json={"code": "print 1", "session_id": "stored-learner"})
+    sessions.flush()
+    store.flush()
+    # The store's batched writer has not caught up with this one yet
+    held = []
+    monkeypatch.setattr(store, "_enqueue", held.append)
+    client.post("/execute", json={"code": "print 2", "session_id": "stored-learner"})
+    assert store.get_progress("stored-learner")["total_calls"] == 1
+    
+    progress = client.get("/progress", params={"session_id": "stored-learner"}).json()
+    assert progress["total_calls"] == 2
+    
+    # Once the session is gone from memory the store answers
+    del store._enqueue
+    for item in held:
+        store._enqueue(item)
+    sessions.ttl_seconds = -1
+    store.flush()
+    progress = client.get("/progress", params={"session_id": "stored-learner"}).json()
+    assert progress["total_calls"] == 2
+    assert progress["current_skill_level"] == "beginner"
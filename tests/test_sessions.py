@@ -0,0 +1,150 @@
+"""
+Tests for learner sessions
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+from api import app
+from pedagogical.api import PedagogicalAPI
+from pedagogical.skill_inference import SkillInferenceEngine
+from session_store import SessionStore
+
+client = TestClient(app)
+
+
+class FakePedagogy:
+    """Minimal stand-in for PedagogicalAPI history handling"""
+    
+    def __init__(self):
+        self._call_history = []
+        self._user_profile = {}
+    
+    def export_history(self):
+        return list(self._call_history)
+    
+    def import_history(self, history):
+        self._call_history = history
+    
+    def get_learning_progress(self):
+        return {"mastered_concepts": [], "skill_trajectory": []}
+    
+    def get_skill_level(self):
+        return "beginner"
+
+
+class MemoryPersister:
+    def __init__(self):
+        self.saved = {}
+    
+    def load(self, session_id):
+        return self.saved.get(session_id)
+    
+    def save(self, session_id, snapshot):
+        self.saved[session_id] = snapshot
+
+
+def test_lru_eviction():
+    """The least recently used session is dropped when the store is full"""
+    store = SessionStore(lambda session_id: FakePedagogy(), max_sessions=2)
+    first = store.get_or_create("a")
+    store.get_or_create("b")
+    store.get("a")
+    store.get_or_create("c")
+    
+    assert store.get("a") is first
+    assert store.get("b") is None
+    assert store.get_stats()["evicted"] == 1
+
+
+def test_ttl_expiry():
+    """Idle sessions expire"""
+    store = SessionStore(lambda session_id: FakePedagogy(), ttl_seconds=0.05)
+    first = store.get_or_create("a")
+    time.sleep(0.1)
+    
+    assert store.get("a") is None
+    assert store.get_or_create("a") is not first
+
+
+def test_write_behind_and_restore():
+    """Dirty sessions are saved on flush and restored after eviction"""
+    persister = MemoryPersister()
+    store = SessionStore(lambda session_id: FakePedagogy(), max_sessions=1, persister=persister, flush_interval=60)
+    session = store.get_or_create("a")
+    session.pedagogy._call_history.append({"method": "run"})
+    store.mark_dirty(session)
+    store.flush()
+    
+    assert persister.saved["a"]["history"] == [{"method": "run"}]
+    
+    store.get_or_create("b")
+    restored = store.get_or_create("a")
+    assert restored is not session
+    assert restored.pedagogy._call_history == [{"method": "run"}]
+    assert store.get_stats()["restored"] == 1
+
+
+def test_expired_dirty_session_is_saved_before_reload():
+    """An expired session's unsaved history is written before it is replaced"""
+    persister = MemoryPersister()
+    store = SessionStore(lambda session_id: FakePedagogy(), ttl_seconds=0.05, persister=persister, flush_interval=60)
+    session = store.get_or_create("a")
+    session.pedagogy._call_history.append({"method": "run"})
+    store.mark_dirty(session)
+    time.sleep(0.1)
+    
+    restored = store.get_or_create("a")
+    assert restored is not session
+    assert persister.saved["a"]["history"] == [{"method": "run"}]
+    assert restored.pedagogy._call_history == [{"method": "run"}]
+    assert store.get_stats()["expired"] == 1
+
+
+def test_session_history_accumulates_across_requests():
+    """Executions with the same session id build one learner history"""
+    for code in ("print 1", "let x = 2\nprint x"):
+        response = client.post("/execute", json={"code": code, "session_id": "learner-1"})
+        assert response.status_code == 200
+    
+    progress = client.get("/progress", params={"session_id": "learner-1"}).json()
+    assert progress["session_id"] == "learner-1"
+    assert progress["total_calls"] == 2
+    assert progress["method_diversity"] == ["run"]
+
+
+def test_progress_reads_session_summaries_without_rescanning(monkeypatch):
+    """/progress uses the session's memoised summaries, not a copy of its history"""
+    client.post("/execute", json={"code": "print 1", "session_id": "learner-3"})
+    
+    def rescan(*args):
+        raise AssertionError("history rescanned")
+    monkeypatch.setattr(PedagogicalAPI, "export_history", rescan)
+    monkeypatch.setattr(SkillInferenceEngine, "infer_level", rescan)
+    
+    progress = client.get("/progress", params={"session_id": "learner-3"}).json()
+    assert progress["total_calls"] == 1
+    assert progress["method_diversity"] == ["run"]
+    assert progress["current_skill_level"] == "beginner"
+
+
+def test_session_header():
+    """The X-Session-Id header works like the session_id field"""
+    client.post("/execute", json={"code": "print 1"}, headers={"X-Session-Id": "learner-2"})
+    progress = client.get("/progress", headers={"X-Session-Id": "learner-2"}).json()
+    
+    assert progress["total_calls"] == 1
+
+
+def test_invalid_session_id():
+    """Malformed session ids are rejected"""
+    assert client.post("/execute", json={"code": "print 1", "session_id": "bad id!"}).status_code == 422
+    assert client.post("/execute", json={"code": "print 1"}, headers={"X-Session-Id": "x" * 200}).status_code == 400
+
+
+def test_progress_without_session_unchanged():
+    """Unknown sessions get the generic progress structure"""
+    data = client.get("/progress", params={"session_id": "never-seen"}).json()
+    
+    assert data["total_calls"] == 0
+    assert "session_info" in data
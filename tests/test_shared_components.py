@@ -0,0 +1,43 @@
+"""
+Tests for pedagogical components shared between PedagogicalAPI instances
+"""
+
+import pytest
+
+from pedagogical.api import PedagogicalAPI, shared_components
+
+
+class Target:
+    def run(self):
+        return None
+
+
+def test_instances_share_stateless_components_only():
+    first = PedagogicalAPI(Target(), default_verbosity='minimal')
+    second = PedagogicalAPI(Target(), default_verbosity='detailed')
+    shared = shared_components()
+
+    assert first.concept_mapper is second.concept_mapper is shared.concept_mapper
+    assert first.learning_engine is second.learning_engine is shared.learning_engine
+    assert first.skill_inference is second.skill_inference is shared.skill_inference
+    assert first.context_analyzer is second.context_analyzer is shared.context_analyzer
+
+    # Per-learner state stays separate
+    assert first.insight_delivery is not second.insight_delivery
+    assert first.insight_delivery.verbosity == 'minimal'
+    first.insight_delivery.deliver = lambda *args, **kwargs: None
+    first.call('run')
+    assert len(first.export_history()) == 1
+    assert second.export_history() == []
+
+
+def test_private_components_on_request():
+    ped = PedagogicalAPI(Target(), share_components=False)
+    assert ped.concept_mapper is not shared_components().concept_mapper
+    assert ped.get_concept_difficulty('variables') == 'beginner'
+
+
+def test_shared_concept_graph_is_immutable():
+    graph = shared_components().concept_mapper.concept_graph
+    with pytest.raises(AttributeError):
+        graph['functions'].add('classes')
@@ -0,0 +1,133 @@
+"""
+Tests for single-flight coalescing of identical executions
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from api import app
+from interpreter import is_deterministic
+from single_flight import SingleFlight
+
+client = TestClient(app)
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    """Callers with the same key await the first caller's execution"""
+    flights = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"output": "42"}
+
+    async def main():
+        return await asyncio.gather(*(flights.do("same", work) for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flights.get_stats() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_different_keys_run_separately():
+    """Distinct keys never share a result"""
+    flights = SingleFlight()
+
+    async def main():
+        return await asyncio.gather(
+            flights.do("a", lambda: asyncio.sleep(0.01, result="a")),
+            flights.do("b", lambda: asyncio.sleep(0.01, result="b")),
+        )
+
+    assert asyncio.run(main()) == ["a", "b"]
+    assert flights.get_stats()["coalesced"] == 0
+
+
+def test_errors_fan_out_to_waiters():
+    """A failing execution raises in every coalesced caller"""
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(
+            *(flights.do("k", work) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flights.get_stats()["in_flight"] == 0
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    """A disconnecting first caller leaves the shared execution running for the others"""
+    flights = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "done"
+    assert len(calls) == 1
+    assert flights.get_stats() == {"executions": 1, "coalesced": 1, "in_flight": 0}
+
+
+def test_work_is_cancelled_when_every_caller_is():
+    """Once no caller is waiting the execution is cancelled and the key freed"""
+    flights = SingleFlight()
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def main():
+        callers = [asyncio.ensure_future(flights.do("k", work)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        assert flights.get_stats()["in_flight"] == 0
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert cancelled == [1]
+
+
+def test_is_deterministic():
+    """Programs using random or input built-ins are not coalesced"""
+    assert is_deterministic("let x = 5\nprint x")
+    assert not is_deterministic("print randint(1, 6)")
+    assert not is_deterministic("let name = input(\"? \")")
+
+
+def test_modules_status_exposes_coalescing():
+    """Coalescing counters appear in /api/modules/status"""
+    client.post("/execute", json={"code": "print 1", "teaching_enabled": False})
+
+    data = client.get("/api/modules/status").json()
+    assert "coalescing" in data
+    assert data["coalescing"]["executions"] >= 1
+    assert "coalesced" in data["coalescing"]
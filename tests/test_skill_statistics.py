@@ -0,0 +1,96 @@
+"""
+Tests for incremental skill-inference statistics
+"""
+
+import random
+from collections import Counter
+import pytest
+
+from pedagogical.api import PedagogicalAPI
+from pedagogical.skill_inference import SkillInferenceEngine, SkillStatistics
+
+
+def reference_level(methods):
+    """The original full-rescan scoring, kept here as the oracle"""
+    if not methods:
+        return 'beginner'
+    n = len(methods)
+    unique = len(set(methods))
+    top = Counter(methods).most_common(1)[0][1]
+    last10, last20, last30 = methods[-10:], methods[-20:], methods[-30:]
+    basic = n >= 3 and any(last10[i] != last10[i + 1] for i in range(len(last10) - 1))
+    complex_ = n >= 5 and len({tuple(last20[i:i + 3]) for i in range(len(last20) - 2)}) >= 3
+    expert = n >= 10 and any(
+        any(adv in m.lower() for adv in ('optimize', 'cache', 'async', 'parallel', 'batch'))
+        for m in last30
+    )
+    optimal = n >= 10 and 0.4 <= unique / n <= 0.8
+
+    scores = {
+        'beginner': (2.0 if n < 10 else 0) + (1.5 if unique < 5 else 0)
+        + (1.0 if top > n * 0.5 else 0) + (1.0 if not complex_ else 0),
+        'intermediate': (2.0 if 10 <= n < 50 else 0) + (1.5 if 5 <= unique < 15 else 0)
+        + (1.0 if basic else 0) + (1.0 if 0.3 <= unique / n <= 0.7 else 0),
+        'advanced': (2.0 if n >= 50 else 0) + (1.5 if unique >= 15 else 0)
+        + (1.5 if complex_ else 0) + (1.0 if top < n * 0.3 else 0),
+        'expert': (2.0 if n >= 100 else 0) + (2.0 if unique >= 25 else 0)
+        + (2.0 if expert else 0) + (1.0 if optimal else 0),
+    }
+    return max(scores, key=scores.get)
+
+
+def _method_pool(rng, size):
+    names = [f"method_{i}" for i in range(size)] + ["batch_run", "cache_get", "optimize"]
+    return lambda: rng.choice(names)
+
+
+@pytest.mark.parametrize("capacity", [1, 3, 7, 12, 25, 64])
+def test_incremental_statistics_match_rescan(capacity):
+    rng = random.Random(capacity)
+    engine = SkillInferenceEngine()
+    for pool_size in (2, 8, 40):
+        pick = _method_pool(rng, pool_size)
+        stats = SkillStatistics(capacity)
+        history = []
+        for _ in range(300):
+            method = pick()
+            history.append(method)
+            stats.record(method)
+            if len(history) > capacity:
+                stats.forget(history.pop(0))
+            assert stats.total == len(history)
+            assert stats.max_count == Counter(history).most_common(1)[0][1]
+            assert engine.infer_from_statistics(stats, {}) == reference_level(history)
+
+
+def test_infer_level_matches_reference_for_histories():
+    engine = SkillInferenceEngine()
+    rng = random.Random(7)
+    for length in (0, 1, 4, 9, 10, 49, 50, 120):
+        pick = _method_pool(rng, 30)
+        methods = [pick() for _ in range(length)]
+        history = [{'method': m} for m in methods]
+        assert engine.infer_level(history, {}) == reference_level(methods)
+
+
+def test_pedagogical_api_keeps_statistics_in_step():
+    class Target:
+        def run(self):
+            return 1
+
+        def cache_lookup(self):
+            return 2
+
+    ped = PedagogicalAPI(Target(), max_history=15, default_verbosity='minimal')
+    ped.insight_delivery.deliver = lambda *args, **kwargs: None
+    for i in range(40):
+        ped.call('run' if i % 3 else 'cache_lookup')
+        methods = [call['method'] for call in ped.export_history()]
+        assert ped.get_skill_level() == reference_level(methods)
+
+    ped.import_history([{'method': 'run'}] * 30)
+    assert ped._skill_stats.total == 15
+    assert ped.get_skill_level() == reference_level(['run'] * 15)
+
+    ped.reset_history()
+    assert ped.get_skill_level() == 'beginner'
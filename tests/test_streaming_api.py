@@ -0,0 +1,106 @@
+"""
+Tests for the streaming execution endpoint /execute/stream
+"""
+
+import json
+import time
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from api import app
+from output_capture import EventStream, OutputStreamClosed
+
+client = TestClient(app)
+
+
+def parse_events(text):
+    """Split a Server-Sent Events body into (event, data) pairs"""
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_output_and_summary():
+    """Output arrives as output events followed by one summary"""
+    response = client.post(
+        "/execute/stream",
+        json={"code": "print 1\nprint 2", "teaching_enabled": False}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    
+    events = parse_events(response.text)
+    assert events[-1][0] == "summary"
+    
+    output = "".join(data["text"] for kind, data in events if kind == "output")
+    assert output == "1\n2\n"
+    
+    summary = events[-1][1]
+    assert summary["error"] is None
+    assert summary["result"] == 2
+    assert summary["output_chars"] == len(output)
+    assert summary["duration_ms"] >= 0
+
+
+def test_stream_debug_steps():
+    """Debug mode adds one step event per executed statement"""
+    response = client.post(
+        "/execute/stream",
+        json={"code": "let x = 1\nprint x", "teaching_enabled": False, "debug": True}
+    )
+    
+    events = parse_events(response.text)
+    steps = [data for kind, data in events if kind == "step"]
+    assert [s["node"] for s in steps] == ["AssignmentNode", "PrintNode"]
+    assert events[-1][1]["steps"] == 2
+
+
+def test_stream_error_in_summary():
+    """Runtime errors are reported in the summary event"""
+    response = client.post(
+        "/execute/stream",
+        json={"code": "print missing", "teaching_enabled": False}
+    )
+    
+    events = parse_events(response.text)
+    assert events[-1][0] == "summary"
+    assert "Undefined variable" in events[-1][1]["error"]
+
+
+def test_stream_with_teaching():
+    """Teaching data is included in the summary when enabled"""
+    response = client.post(
+        "/execute/stream",
+        json={"code": "let x = 2", "teaching_enabled": True}
+    )
+    
+    summary = parse_events(response.text)[-1][1]
+    assert "skill_level" in summary
+    assert "suggestions" in summary
+
+
+def test_stalled_consumer_releases_the_producer():
+    """A client that stops reading stops the run instead of holding its thread"""
+    async def scenario():
+        stream = EventStream(asyncio.get_running_loop(), max_pending=1, max_stall=0.2)
+        
+        def produce():
+            stream.put("output", "1\n")
+            started = time.monotonic()
+            with pytest.raises(OutputStreamClosed):
+                stream.put("output", "2\n")
+            return time.monotonic() - started
+        
+        stalled_for = await asyncio.to_thread(produce)
+        assert 0.2 <= stalled_for < 2
+        assert await stream.get() == ("output", "1\n")
+        with pytest.raises(asyncio.QueueEmpty):
+            stream.get_nowait()
+        with pytest.raises(OutputStreamClosed):
+            await asyncio.wait_for(stream.get(), 1)
+    
+    asyncio.run(scenario())